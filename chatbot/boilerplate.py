@@ -0,0 +1,140 @@
+import hashlib, os, re, sqlite3, threading
+from dotenv import load_dotenv
+from config import data_path
+
+load_dotenv()
+
+BOILERPLATE_DB = os.getenv("BOILERPLATE_DB", "boilerplate.db")
+# A block seen on at least this many distinct pages of a site is treated as boilerplate
+BOILERPLATE_MIN_PAGES = int(os.getenv("BOILERPLATE_MIN_PAGES", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+##############################################[BOILERPLATE FILTER]###########################################################
+
+
+def block_key(block: str) -> str:
+    """
+    Hash of a text block after normalising case, whitespace and numbers, so teasers that
+    only differ by a date or count still match.
+    """
+    normalised = _DIGITS.sub("0", _WHITESPACE.sub(" ", block).strip().lower())
+    return hashlib.blake2b(normalised.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class BoilerplateFilter:
+    """
+    Drops text blocks that repeat across many pages of the same site.
+
+    Every page passed through the filter is counted once (by URL) in a persisted frequency
+    table of block hashes, per language. A block that has appeared on BOILERPLATE_MIN_PAGES
+    or more distinct pages is considered boilerplate (newsletter prompts, "BOOM is..." bios,
+    related-story teasers) and removed before the text is chunked.
+    """
+
+    def __init__(self, db_path: str = None, min_pages: int = BOILERPLATE_MIN_PAGES):
+        self.db_path = db_path or data_path(BOILERPLATE_DB)
+        self.min_pages = min_pages
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS block_frequency ("
+                "lang TEXT, block_hash TEXT, pages INTEGER DEFAULT 0, sample TEXT, "
+                "PRIMARY KEY (lang, block_hash))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS counted_pages (url TEXT PRIMARY KEY, lang TEXT)")
+
+    def observe(self, url: str, blocks: list, lang: str):
+        """
+        Count the distinct blocks of a page. Pages already counted are ignored.
+        """
+        keys = {}
+        for block in blocks:
+            keys.setdefault(block_key(block), block[:200])
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO counted_pages (url, lang) VALUES (?, ?)", (url, lang)
+            ).rowcount
+            if not inserted:
+                return
+            self._conn.executemany(
+                "INSERT INTO block_frequency (lang, block_hash, pages, sample) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(lang, block_hash) DO UPDATE SET pages = pages + 1",
+                [(lang, key, sample) for key, sample in keys.items()]
+            )
+
+    def boilerplate_keys(self, keys: list, lang: str) -> set:
+        """
+        Return the subset of block hashes that count as boilerplate for a language.
+        """
+        found = set()
+        keys = list(set(keys))
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT block_hash FROM block_frequency WHERE lang = ? AND pages >= ? AND block_hash IN ({placeholders})",
+                    [lang, self.min_pages, *batch]
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def filter_pages(self, pages: list, lang: str) -> list:
+        """
+        Learn from a batch of pages, then strip boilerplate blocks from each of them.
+
+        The whole batch is counted before filtering, so blocks shared by the pages of one
+        feed page are caught even when the frequency table is still empty.
+
+        Args:
+            pages (list): (url, blocks) pairs, where blocks is the list of text blocks of the page.
+            lang (str): Language code of the site the pages belong to.
+
+        Returns:
+            list: (url, blocks) pairs with boilerplate blocks removed.
+        """
+        for url, blocks in pages:
+            self.observe(url, blocks, lang)
+
+        keyed = [(url, [(block_key(block), block) for block in blocks]) for url, blocks in pages]
+        boilerplate = self.boilerplate_keys([key for _, blocks in keyed for key, _ in blocks], lang)
+
+        cleaned, dropped = [], 0
+        for url, blocks in keyed:
+            kept = [block for key, block in blocks if key not in boilerplate]
+            dropped += len(blocks) - len(kept)
+            cleaned.append((url, kept))
+        if dropped:
+            print(f"Dropped {dropped} boilerplate blocks from {len(pages)} pages ({lang})")
+        return cleaned
+
+    def top_blocks(self, lang: str, limit: int = 20) -> list:
+        """
+        Most repeated blocks for a language, for checking what the filter removes.
+
+        Returns:
+            list: (pages, sample text) tuples.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT pages, sample FROM block_frequency WHERE lang = ? ORDER BY pages DESC LIMIT ?",
+                (lang, limit)
+            ).fetchall()
+
+
+_filter = None
+_filter_lock = threading.Lock()
+
+
+def get_boilerplate_filter() -> BoilerplateFilter:
+    """
+    Return the process-wide boilerplate filter.
+    """
+    global _filter
+    with _filter_lock:
+        if _filter is None:
+            _filter = BoilerplateFilter()
+        return _filter
@@ -4,7 +4,6 @@ from chatbot.utils import fetch_page_text, verify_sources, get_most_suitable_sou
 import datetime
 from typing import Literal
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_pinecone import PineconeVectorStore
 from langchain.chains.retrieval_qa.base import RetrievalQA
 from langchain_core.tools import StructuredTool
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -12,19 +11,32 @@ from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-import pinecone
-from langchain_openai import OpenAIEmbeddings
 import re
 from langgraph.prebuilt import ToolNode
 from chatbot.utils import fetch_latest_article_urls, get_current_date, fetch_custom_range_articles_urls
+from chatbot.catalog import get_article_catalog, article_type_from_url
+from chatbot.date_parser import parse_date_range, clamp_range
+from chatbot.tag_index import get_tag_index
+from chatbot.sites import get_site
+from chatbot.vector_store import get_vector_store, select_diverse, similarity_search_with_vectors, RETRIEVAL_OVERFETCH, MAX_CHUNKS_PER_SOURCE
+from chatbot.lexical_index import hybrid_search
+from chatbot.index_layout import partitions_for_query, combine_filters, MULTILINGUAL_RETRIEVAL
+from chatbot.claims import collapse_translations
+from concurrent.futures import ThreadPoolExecutor
+from chatbot.reranker import rerank
 from langchain_openai import ChatOpenAI
-import calendar
-from datetime import datetime, date, timedelta
-from deep_translator import GoogleTranslator
-from langdetect import detect
+from datetime import datetime
+from chatbot.translation import get_translation_service
+from chatbot.language_id import detect_language, site_language
 # Load environment variables
 load_dotenv()
 
+# Articles with a stored summary that a custom date range answer is built from
+CUSTOM_DATE_SUMMARY_ARTICLES = int(os.getenv("CUSTOM_DATE_SUMMARY_ARTICLES", "5"))
+
+# Searches of the partitions (indexes or namespaces) a query spans
+_partition_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="partition-search")
+
 # Define RAGQuery schema
 class RAGQuery(BaseModel):
     query: str = Field(..., description="The query to retrieve relevant content for")
@@ -38,23 +50,7 @@ class Chatbot:
         self.llm =ChatOpenAI(model_name="gpt-4", temperature=0)
         self.memory = MemorySaver()
 
-        # Initialize Pinecone indices
-        self.latest_index = PineconeVectorStore(
-            index_name=os.getenv("PINECONE_LATEST_INDEX_NAME"),
-            embedding=OpenAIEmbeddings(model="text-embedding-3-small")
-        )
-        self.old_index = PineconeVectorStore(
-            index_name=os.getenv("PINECONE_OLD_INDEX_NAME"),
-            embedding=OpenAIEmbeddings(model="text-embedding-3-small")
-        )
-        self.hindi_index = PineconeVectorStore(
-            index_name=os.getenv("PINECONE_HINDI_INDEX_NAME"),
-            embedding=OpenAIEmbeddings(model="text-embedding-3-small")
-        )
-        self.bangla_index = PineconeVectorStore(
-            index_name=os.getenv("PINECONE_BANGLA_INDEX_NAME"),
-            embedding=OpenAIEmbeddings(model="text-embedding-3-small")
-        )
+        # Vector indices are opened per query from the index layout (see INDEX_LAYOUT and VECTOR_BACKEND)
         current_date = datetime.now().strftime("%B %d, %Y")
         # Set default language code
         self.language_code = "en"  
@@ -115,45 +111,41 @@ class Chatbot:
         # External API for latest articles
         # self.latest_articles_api = fetch_latest_article_urls()
 
-    def detect_and_set_language(self, original_query):
-        """Detect language and update self.language_code."""
-        print("detect_and_set_language invoked")  # Simple log to track invocations
+    def detect_and_set_language(self, original_query, detected_lang=None):
+        """
+        Detect language and update self.language_code (en, hi or bn, English otherwise).
 
-        # try:
-        print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$4")
-        detected_lang = detect(original_query)  # Detects language
-        print("DETECTED LANGUAGE IS",detected_lang)
-        print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$4")
+        Args:
+            original_query (str): User query.
+            detected_lang (str, optional): Language already identified upstream; skips detection.
 
-        # except Exception as e:
-        #     print("Error during language detection:", e)
-        #     detected_lang = "en"
+        Returns:
+            str: The detected language code, which may be outside the supported site languages.
+        """
+        print("detect_and_set_language invoked")  # Simple log to track invocations
 
-        if detected_lang == "hi":
-            self.language_code = "hi"  # Hindi
-        elif detected_lang == "bn":
-            self.language_code = "bn"  # Bangla
-        else:
-            self.language_code = "en"  # Default to English
+        detected_lang = detected_lang or detect_language(original_query)
+        print("DETECTED LANGUAGE IS",detected_lang)
+        self.language_code = site_language(lang=detected_lang)
+        return detected_lang
 
 
 
-    def enhance_query(self, original_query: str) -> dict:
+    def enhance_query(self, original_query: str, detected_lang: str = None) -> dict:
         """
         Enhanced query processing optimized for mediator tool selection.
         Analyzes query patterns to maximize correct tool selection.
+
+        `detected_lang` is the query's language when the caller already identified it.
         """
         print("enhance_query invoked")  # Simple log to track invocations
 
-        self.detect_and_set_language(original_query)
-
-            # Step 1: Detect if the query is in English
-        detected_lang = detect(original_query)
-        print("DETECTED LANGUAGE",detected_lang)
-        if detected_lang != "en" and detected_lang != "hi" and detected_lang != "bn" :
-            # Translate the query to English
-            translator = GoogleTranslator(source="auto", target="en")
-            original_query = translator.translate(original_query)
+        # Step 1: Identify the language once; the result decides both the answer language and translation
+        detected_lang = self.detect_and_set_language(original_query, detected_lang)
+        # Multilingual embeddings match queries in any language, so the translation hop is skipped
+        if not MULTILINGUAL_RETRIEVAL and detected_lang != "en" and detected_lang != "hi" and detected_lang != "bn" :
+            # Translate the query to English; cached, and untranslated if the service is slow
+            original_query = get_translation_service().translate(original_query, target="en")
         else:
             original_query = original_query
 
@@ -330,8 +322,15 @@ class Chatbot:
             print("TAG_URL", tag_url)
             article_type = mediation_result["article_type"]
 
-            # Extract real articles from BoomLive.in
-            articles = extract_articles(tag_url)  # Returns a list of (title, url, summary)
+            # Articles come from the local tag index; the site search is scraped until the index has
+            # articles, and when the index has none for the tag (a tag too new or too rare for the catalog)
+            articles = []
+            tag_index = get_tag_index()
+            if tag_index.is_ready(self.language_code):
+                articles = tag_index.search(mediation_result.get("tag") or tag_url.split("search=", 1)[-1],
+                                            self.language_code, article_type)
+            if not articles:
+                articles = extract_articles(tag_url)  # Returns a list of (title, url, summary)
 
             # Format articles correctly (if available)
             if articles:
@@ -484,7 +483,7 @@ class Chatbot:
 
             # Retrieve data using RAG
             index_to_use = "both"
-            rag_result = self.retrieve_data(enhanced_query, index_to_use, article_type)
+            rag_result = self.retrieve_data(enhanced_query, index_to_use, article_type, custom_date_range)
             result_text = rag_result['result']
             sources = rag_result['sources']
             print("((((((((((((((((((((((((((((((((((((((((((((((((((sources))))))))))))))))))))))))))))))))))))))))))))))))))")
@@ -851,9 +850,10 @@ class Chatbot:
 #         }
 
 
-    def mediator(self, query: str) -> dict:
+    def mediator(self, query: str, detected_lang: str = None) -> dict:
         """
         Enhanced mediator that handles fact-check queries and invalid/random queries.
+        `detected_lang` is passed on to enhance_query when the caller already knows the query's language.
         """
         print("mediator invoked")  # Simple log to track invocations
 
@@ -870,7 +870,7 @@ class Chatbot:
             "tag_url": None
         }
         
-        enhanced_data = self.enhance_query(query)
+        enhanced_data = self.enhance_query(query, detected_lang)
         
         print(enhanced_data)
         enhanced_query = enhanced_data["enhanced_query"]
@@ -970,13 +970,16 @@ class Chatbot:
                 if decision_results.get('is_tag_query') == 'yes' and decision_results.get('tag'):
                     tag = decision_results['tag'].replace(' ', '%20')
                     result["tag"] = tag
-        elif decision_results.get('is_tag_query') == 'yes' and decision_results.get('tag') and self.language_code == 'en':
+        elif decision_results.get('is_tag_query') == 'yes' and decision_results.get('tag') and \
+                (self.language_code == 'en' or get_tag_index().is_ready(self.language_code)):
+            # Hindi and Bengali tag queries are answered from the tag index only, never by scraping the site search
             tag = decision_results['tag'].replace(' ', '%20')
             result.update({
                 "use_tag": True,
                 "index_to_use": "both",
                 "article_type": decision_results.get('content_type', 'all'),
-                "tag_url": f"https://www.boomlive.in/search?search={tag}"
+                "tag": decision_results['tag'],
+                "tag_url": f"{get_site(self.language_code)['base_url']}/search?search={tag}"
             })
         elif decision_results.get('custom_date_range') == 'yes' or custom_date_match:
             result.update({
@@ -1020,106 +1023,38 @@ class Chatbot:
 
 
 
-    def retrieve_custom_date_articles(self, query: str, article_type: str) -> dict:
+    def extract_date_range_with_llm(self, query: str):
         """
-        Retrieve articles based on custom date range specified in the query.
-        """
-        print(f"We are getting article type as {article_type}")
-          # Get the current date
-        current_date = datetime.now().strftime("%B %d, %Y")  # Format the current date as YYYY-MM-DD
-        # date_prompt = (
-        #     f"Analyze the following query and extract the date range (if any):\n"
-        #     f"Query: {query}\n"
-        #     f"The current date is {current_date}. Use this as the reference for relative terms like 'today' or 'last week'.\n"
-        #     f"If terms like 'last year' or 'this year' are mentioned, just return 'last year' or 'this year' without specifying a date range.\n"
-        #     f"Otherwise, provide the result in the format 'from YYYY-MM-DD to YYYY-MM-DD' or a description like 'last week', etc. And note range shouldn't exceed 1 month so adjust range which suits user requirements better but just provide 1 month range"
-            
-        # )
-
+        Ask the LLM for the date range of a query the local parser could not read.
 
+        Returns:
+            tuple: (start_date, end_date), or None if the answer has no usable range.
+        """
+        current_date = datetime.now().strftime("%B %d, %Y")
         date_prompt = (
             f"Analyze the following query and extract the date range (if any):\n"
             f"Query: {query}\n"
             f"The current date is {current_date}. Use this as the reference for relative terms like 'today' or 'last week'.\n"
             f"If terms like 'last year' or 'this year' are mentioned, just return 'last year' or 'this year' without specifying exact dates.\n"
             f"Otherwise, provide the result strictly in the format 'from YYYY-MM-DD to YYYY-MM-DD'.\n"
-            f"Ensure that the date range does not exceed one month. If the query requests a longer period, adjust it to the most relevant 1-month range.\n"
         )
-
-
-        # Get the date range from the query
         date_response = self.llm.invoke([self.system_message, HumanMessage(content=date_prompt)])
-        date_range = date_response.content.strip()
-        print(date_range)
+        print(date_response.content.strip())
+        return parse_date_range(date_response.content.strip())
 
-        # Initialize variables
+    def retrieve_custom_date_articles(self, query: str, article_type: str) -> dict:
+        """
+        Retrieve articles based on custom date range specified in the query.
+        """
+        print(f"We are getting article type as {article_type}")
         sources = []
-        start_date, end_date = None, None
-        today = date.today()
-
-        # Handle explicitly provided custom date ranges
-        custom_range_pattern = re.compile(r"from\s+(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})", re.IGNORECASE)
-        match = custom_range_pattern.search(date_range)
-        if match:
-            try:
-                start_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
-                end_date = datetime.strptime(match.group(2), "%Y-%m-%d").date()
-            except ValueError:
-                pass  # Handle invalid date formats gracefully
-
-        # Handle "last year" case
-        elif "last year" in date_range.lower():
-            last_year = today.year - 1
-            start_date = date(last_year, 12, 1)  # ✅ Correct
-            end_date = date(last_year, 12, 31)  # ✅ Correct
-  # End of December last year
-
-        # Handle "this year" case
-        elif "this year" in date_range.lower():
-            current_year = today.year
-            last_month = today.month - 1 if today.month > 1 else 12
-            year_of_last_month = current_year if last_month != 12 else current_year - 1
-            start_date = date(year_of_last_month, last_month, 1)  # Start of the last month
-            end_date = date(year_of_last_month, last_month, calendar.monthrange(year_of_last_month, last_month)[1])  # End of the last month
-
-        # Handle month-year patterns if no custom range is found
-        if not start_date or not end_date:
-            month_year_pattern = re.compile(r'(\b[A-Za-z]+\s+\d{4})\s*(to\s*(\b[A-Za-z]+\s+\d{4}))?', re.IGNORECASE)
-            match = month_year_pattern.search(query)
-            if match:
-                try:
-                    from_month_year = match.group(1)
-                    to_month_year = match.group(3) if match.group(3) else from_month_year
-                    from_date = datetime.strptime(from_month_year, "%b %Y")
-                    to_date = datetime.strptime(to_month_year, "%b %Y")
-                    start_date = date(from_date.year, from_date.month, 1)
-                    end_date = date(to_date.year, to_date.month, calendar.monthrange(to_date.year, to_date.month)[1])
-                except ValueError:
-                    pass
-
-        # Handle relative terms (today, yesterday, this week, etc.)
-        if not start_date or not end_date:
-            if "today" in date_range.lower():
-                start_date = end_date = today
-            elif "yesterday" in date_range.lower():
-                start_date = end_date = today - timedelta(days=1)
-            elif "this week" in date_range.lower():
-                start_date = today - timedelta(days=today.weekday())
-                end_date = start_date + timedelta(days=6)
-            elif "last week" in date_range.lower():
-                start_date = today - timedelta(days=today.weekday() + 7)
-                end_date = start_date + timedelta(days=6)
-            elif "this month" in date_range.lower():
-                start_date = date(today.year, today.month, 1)
-                end_date = date(today.year, today.month, calendar.monthrange(today.year, today.month)[1])
-            elif "last month" in date_range.lower():
-                first_day_this_month = date(today.year, today.month, 1)
-                last_day_last_month = first_day_this_month - timedelta(days=1)
-                start_date = date(last_day_last_month.year, last_day_last_month.month, 1)
-                end_date = last_day_last_month
-            elif "last year" in date_range.lower():
-                start_date = date(today.year - 1, 12, 1)
-                end_date = date(today.year - 1, 12, 31)
+        date_range_dates = parse_date_range(query)
+        if date_range_dates is None:
+            # Only queries the local parser can't read cost a model call
+            date_range_dates = self.extract_date_range_with_llm(query)
+        start_date, end_date = clamp_range(*date_range_dates) if date_range_dates else (None, None)
+        date_range = f"from {start_date} to {end_date}" if start_date else "no date range found"
+        print(date_range)
 
         # Fetch sources if valid dates are found
         if start_date and end_date:
@@ -1139,7 +1074,7 @@ class Chatbot:
         else:
             for source in sources:
 
-                if f"https://www.boomlive.in/{article_type}" in source:
+                if article_type_from_url(source) == article_type.strip("/").split("/", 1)[0]:
                     print("^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^")
                     print(source, "article_type",article_type)
                     print("^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^")
@@ -1155,6 +1090,34 @@ class Chatbot:
         #     f"Provide article url for each article below their summary: {filtered_sources}"
         # )
         print("FILTERED SOURCES: ",filtered_sources)
+        # Summaries written at ingestion let the answer cover more articles in one small call
+        stored = get_article_catalog().summaries(filtered_sources)
+        summarized_sources = [source for source in filtered_sources if source in stored][:CUSTOM_DATE_SUMMARY_ARTICLES]
+        if summarized_sources:
+            article_notes = "\n\n".join(
+                f"Title: {stored[source]['title']}\n"
+                f"Published: {stored[source]['published']}\n"
+                f"Summary: {stored[source]['summary']}\n"
+                f"Key claims: {'; '.join(stored[source]['key_claims'])}\n"
+                f"URL: {source}"
+                for source in summarized_sources
+            )
+            summary_prompt = (
+                f"Answer the following question using only the article summaries below: {query}.\n\n"
+                f"{article_notes}\n\n"
+                f"Focus on providing concise and relevant details without additional disclaimers or unrelated remarks.\n\n"
+                f"For each article, list the original article URL explicitly under its summary.\n"
+                f"Format: \n**Article Title:**\nYour summary here\n\n[Read more](Original article URL here)\n"
+                f"Add a partion line after Read More like a hr tag of size required ______________________________________________________\n"
+                f"Prevent adding emojis in response"
+                f"For more details, Visit [BOOM's Fact Check](https://www.boomlive.in/fact-check) 🕵️‍♂️✨."
+            )
+            summary_response = self.llm.invoke([self.system_message, HumanMessage(content=summary_prompt)])
+            return {
+                "result": summary_response.content.strip(),
+                "sources": []
+            }
+
         summary_prompt = (
             f"Summarize the information based on the following question: {query}.\n"
             f"Use these sources to craft the response: {filtered_sources[:3]}\n"
@@ -1262,7 +1225,94 @@ class Chatbot:
 
 
 
-    def retrieve_data(self, query: str, index_to_use: str, article_type: str) -> dict:
+    def build_metadata_filter(self, query: str, article_type: str, custom_date_range: bool = False):
+        """
+        Vector index filter for a query: the requested article type (fact checks include fast
+        checks) and, when the query asks for a range of dates, the published date range.
+
+        A date in a claim ("is this 2019 video real?", "आज") describes the claim, not the
+        articles to search, so only a range phrase ("last week", "from January to March")
+        filters by date unless the mediator flagged the query as a custom date range.
+
+        Returns:
+            dict: Pinecone metadata filter, or None when nothing needs filtering.
+        """
+        conditions = []
+        if article_type and "all" not in article_type:
+            if "fact-check" in article_type:
+                conditions.append({"article_type": {"$in": ["fact-check", "fast-check"]}})
+            else:
+                conditions.append({"article_type": {"$eq": article_type.strip("/").split("/", 1)[0]}})
+        date_range_dates = parse_date_range(query, ranges_only=not custom_date_range)
+        if date_range_dates:
+            start_date, end_date = date_range_dates
+            conditions.append({"published": {"$gte": int(start_date.strftime("%Y%m%d")),
+                                             "$lte": int(end_date.strftime("%Y%m%d"))}})
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+    def search_index(self, vector_store, query: str, metadata_filter: dict = None, k: int = 5) -> list:
+        """
+        Top-k chunks of an index that match `metadata_filter`, from the vector index fused with
+        the index's BM25 index. Exact names and phrases that dense search misses still rank,
+        and the BM25 results alone are used when the vector search is too slow.
+
+        RETRIEVAL_OVERFETCH times k candidates are fetched and narrowed down by MMR to chunks
+        of different articles (at most MAX_CHUNKS_PER_SOURCE each), so the context is not
+        filled with overlapping chunks of one article.
+        """
+        vectors = {}
+        candidates = hybrid_search(
+            lambda query, k, metadata_filter: self.vector_search(vector_store, query, metadata_filter, k, vectors),
+            getattr(vector_store, "partition", None), query, k * RETRIEVAL_OVERFETCH, metadata_filter
+        )
+        return select_diverse(query, candidates, k, vectors=dict(vectors))
+
+    def cap_chunks_per_source(self, docs: list, max_per_source: int = MAX_CHUNKS_PER_SOURCE) -> list:
+        """
+        Drop repeated chunks and keep at most `max_per_source` chunks per article, in order.
+        """
+        kept, seen, per_source = [], set(), {}
+        for doc in docs:
+            source = doc.metadata.get("source")
+            key = (source, doc.page_content)
+            if key in seen or per_source.get(source, 0) >= max_per_source:
+                continue
+            seen.add(key)
+            per_source[source] = per_source.get(source, 0) + 1
+            kept.append(doc)
+        return kept
+
+    def vector_search(self, vector_store, query: str, metadata_filter: dict = None, k: int = 5,
+                      vectors: dict = None) -> list:
+        """
+        Top-k chunks of a vector index that match `metadata_filter`.
+
+        Chunks ingested before article metadata was recorded can't match a filter, so when the
+        filtered search comes back short it is topped up with unfiltered results that lack the
+        filtered fields.
+
+        The vectors stored for the chunks are added to `vectors`, keyed by (source, page_content),
+        when it is given.
+        """
+        def search(search_filter=None):
+            matches = similarity_search_with_vectors(vector_store, query, k=k, filter=search_filter)
+            if vectors is not None:
+                vectors.update(((doc.metadata.get("source"), doc.page_content), stored) for doc, stored in matches)
+            return [doc for doc, _ in matches]
+
+        if not metadata_filter:
+            return search()
+        docs = search(metadata_filter)
+        if len(docs) < k:
+            conditions = metadata_filter.get("$and", [metadata_filter])
+            fields = {field for condition in conditions for field in condition}
+            legacy = [doc for doc in search() if not fields & doc.metadata.keys()]
+            docs.extend(legacy[:k - len(docs)])
+        return docs
+
+    def retrieve_data(self, query: str, index_to_use: str, article_type: str, custom_date_range: bool = False) -> dict:
         """
         Enhanced retrieve_data with better context utilization
         """
@@ -1272,10 +1322,6 @@ class Chatbot:
         print(self.language_code)
         print("@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@")
 
-        if self.language_code=='hi':
-            index_to_use='hindi-boom-articles'
-        elif self.language_code=='bn':
-            index_to_use='bangla-boom-articles'
         print(f"Retrieve data called with query: {query} and index: {index_to_use} with article_type: {article_type}")
         
         current_date = get_current_date()
@@ -1293,53 +1339,35 @@ class Chatbot:
         print("index_to_use",index_to_use)
         if index_to_use is not None:
             index_to_use = index_to_use.split(".")[-1].strip()  # This removes any extra text like "3." and keeps only "latest"
-
-        if index_to_use in ["latest"] or index_to_use is None:
-            print(f"inside:  if index_to_use in  latest")
-            latest_retriever = self.latest_index.as_retriever(search_kwargs={"k": 5})
-            latest_docs = latest_retriever.get_relevant_documents(enhanced_query)
-            print(f"Latest documents retrieved: {len(latest_docs)}")  # Debugging line
-            all_docs.extend(latest_docs)
-            latest_sources = [doc.metadata.get("source", "Unknown") for doc in latest_docs]
-            all_sources.extend(latest_sources)
-
-        if index_to_use in ["both", "latest"]:
-            print(f"inseide:  if index_to_use in :both", "latest")
-            latest_retriever = self.latest_index.as_retriever(search_kwargs={"k": 5})
-            latest_docs = latest_retriever.get_relevant_documents(enhanced_query)
-            print(f"Latest documents retrieved: {len(latest_docs)}")  # Debugging line
-            all_docs.extend(latest_docs)
-            latest_sources = [doc.metadata.get("source", "Unknown") for doc in latest_docs]
-            all_sources.extend(latest_sources)
-
-        if index_to_use in ["both", "old"]:
-            print(f"inseide:  if index_to_use in :both, old")
-
-            old_retriever = self.old_index.as_retriever(search_kwargs={"k": 5})
-            old_docs = old_retriever.get_relevant_documents(enhanced_query)
-            print(f"Old documents retrieved: {len(old_docs)}")  # Debugging line
-            all_docs.extend(old_docs)
-            old_sources = [doc.metadata.get("source", "Unknown") for doc in old_docs]
-            all_sources.extend(old_sources)
-
-        if index_to_use=="hindi-boom-articles":
-            print("USING HINDI PINECONE INDEX")
-            hindi_retriever=self.hindi_index.as_retriever(search_kwargs={"k": 5})
-            hindi_docs = hindi_retriever.get_relevant_documents(enhanced_query)
-            print(f"HINDI article documents retrieved: {len(hindi_docs)}")  # Debugging line
-            all_docs.extend(hindi_docs)
-            hindi_sources = [doc.metadata.get("source", "Unknown") for doc in hindi_docs]
-            all_sources.extend(hindi_sources)
-
-
-        if index_to_use=="bangla-boom-articles":
-            print("USING BANGLA PINECONE INDEX")
-            bangla_retriever=self.bangla_index.as_retriever(search_kwargs={"k": 5})
-            bangla_docs = bangla_retriever.get_relevant_documents(enhanced_query)
-            print(f"bangla article documents retrieved: {len(bangla_docs)}")  # Debugging line
-            all_docs.extend(bangla_docs)
-            bangla_sources = [doc.metadata.get("source", "Unknown") for doc in bangla_docs]
-            all_sources.extend(bangla_sources)
+        # Article type and dates are filtered inside the index, so all k results are eligible
+        metadata_filter = self.build_metadata_filter(query, article_type, custom_date_range)
+        print("metadata_filter", metadata_filter)
+
+        # "both" searches every tier; the language picks the index (or namespace), and with
+        # MULTILINGUAL_RETRIEVAL the other languages' partitions are searched as well
+        tier = {"both": "all", "old": "old"}.get(index_to_use, "latest")
+        partitions = partitions_for_query(self.language_code, tier)
+
+        def search_partition(partition):
+            vector_store = get_vector_store(partition.index_name, namespace=partition.namespace)
+            docs = self.search_index(vector_store, enhanced_query,
+                                     combine_filters(metadata_filter, partition.metadata_filter))
+            print(f"Documents retrieved from {vector_store.partition}: {len(docs)}")  # Debugging line
+            return docs
+
+        # Partitions are searched concurrently, so extra languages don't add round trips
+        for docs in _partition_executor.map(search_partition, partitions):
+            all_docs.extend(docs)
+            all_sources.extend(doc.metadata.get("source", "Unknown") for doc in docs)
+
+        if len(partitions) > 1:
+            # An English fact check and its Hindi translation are one result, shown in the user's language
+            all_docs = collapse_translations(all_docs, self.language_code)
+        # Chunks of one article can come back from several partitions
+        all_docs = self.cap_chunks_per_source(all_docs)
+        # Optional cross-encoder pass; it also decides the order sources are shown in
+        all_docs = rerank(query, all_docs)
+        all_sources = list(dict.fromkeys(doc.metadata.get("source", "Unknown") for doc in all_docs))
 
         if all_docs:
             print("the code is going in all_docs")
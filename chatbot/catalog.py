@@ -0,0 +1,488 @@
+import datetime, json, os, re, sqlite3, threading, time
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+from config import data_path
+from chatbot.sites import SUPPORTED_LANGUAGES
+
+load_dotenv()
+
+ARTICLE_CATALOG_DB = os.getenv("ARTICLE_CATALOG_DB", "article_catalog.db")
+CATALOG_POLLER_ENABLED = os.getenv("CATALOG_POLLER_ENABLED", "true").lower() == "true"
+CATALOG_POLL_INTERVAL = float(os.getenv("CATALOG_POLL_INTERVAL", "300"))
+# Days kept in the catalog, backfilled newest first when the poller starts
+CATALOG_BACKFILL_DAYS = int(os.getenv("CATALOG_BACKFILL_DAYS", "200"))
+# The most recent days still receive new articles, so they are re-synced on every poll
+CATALOG_RESYNC_DAYS = int(os.getenv("CATALOG_RESYNC_DAYS", "2"))
+CATALOG_PAGE_SIZE = 20
+
+_TRAILING_ID = re.compile(r"-(\d+)/?$")
+
+##############################################[ARTICLE CATALOG]###########################################################
+
+
+def article_type_from_url(url: str) -> str:
+    """
+    Article type of a BOOM URL, i.e. its first path segment ("fact-check", "decode", ...).
+    """
+    path = urlparse(url).path.strip("/")
+    return path.split("/", 1)[0] if path else ""
+
+
+def article_id_from_item(news_item: dict) -> str:
+    """
+    Article id of a news feed item: the feed's own id when present, else the number at the end of the URL.
+    """
+    for key in ("newsId", "news_id", "id"):
+        if news_item.get(key):
+            return str(news_item[key])
+    match = _TRAILING_ID.search(news_item.get("url") or "")
+    return match.group(1) if match else None
+
+
+def tags_from_item(news_item: dict) -> list:
+    """
+    Tag names of a news feed item. The feed sends them as a list of names, a list of
+    {"name": ...} dicts or a comma-separated string depending on the site.
+    """
+    tags = news_item.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    names = []
+    for tag in tags:
+        name = tag.get("name") or tag.get("title") if isinstance(tag, dict) else tag
+        if isinstance(name, str) and name.strip():
+            names.append(name.strip())
+    return names
+
+
+def _day_range(from_date: str, to_date: str) -> list:
+    start = datetime.datetime.strptime(from_date, "%Y-%m-%d").date()
+    end = datetime.datetime.strptime(to_date, "%Y-%m-%d").date()
+    return [(start + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+
+class ArticleCatalog:
+    """
+    Local SQLite copy of the BOOM news feed: one row per article with its language, type,
+    exact published day, title, description and tags.
+
+    The feed is synced one day at a time (fromDate = toDate), which is what gives every row
+    an exact published date. `sync_log` records which days are complete, so readers can tell
+    whether the catalog covers a range or they need to fall back to the live API.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or data_path(ARTICLE_CATALOG_DB)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "url TEXT PRIMARY KEY, article_id TEXT, lang TEXT, type TEXT, published TEXT, "
+                "title TEXT, description TEXT, updated_at TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_lang_type_date ON articles (lang, type, published)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_lang_date ON articles (lang, published)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_log (lang TEXT, day TEXT, synced_at REAL, PRIMARY KEY (lang, day))"
+            )
+            # Per-article summaries written at ingestion time (added after the first release of the table)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+            for column in ("summary TEXT", "key_claims TEXT", "summarized_at TEXT", "tags TEXT", "claim_id TEXT"):
+                if column.split()[0] not in columns:
+                    self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column}")
+
+    ##########[WRITES]##########
+
+    def upsert_items(self, news_items: list, lang: str, day: str) -> int:
+        """
+        Store feed items published on `day`.
+
+        Returns:
+            int: Number of items stored.
+        """
+        now = datetime.datetime.now().isoformat()
+        rows = [
+            (item["url"], article_id_from_item(item), lang, article_type_from_url(item["url"]), day,
+             item.get("heading"), item.get("description"), json.dumps(tags_from_item(item), ensure_ascii=False), now)
+            for item in news_items if item.get("url")
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles (url, article_id, lang, type, published, title, description, tags, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "article_id = excluded.article_id, lang = excluded.lang, type = excluded.type, "
+                "published = excluded.published, title = excluded.title, description = excluded.description, "
+                "tags = excluded.tags, updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def mark_synced(self, lang: str, day: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_log (lang, day, synced_at) VALUES (?, ?, ?)", (lang, day, time.time())
+            )
+
+    def sync_day(self, lang: str, day: str) -> int:
+        """
+        Pull every feed item published on `day` and mark the day as synced.
+
+        Returns:
+            int: Number of articles stored for the day.
+
+        Raises:
+            requests.exceptions.RequestException: If the feed cannot be read; the day stays unsynced.
+        """
+        from chatbot.news_client import get_news_client
+
+        client = get_news_client()
+        stored, start_index = 0, 0
+        while True:
+            news = client.fetch_news(lang, start_index, CATALOG_PAGE_SIZE, day, day, use_cache=False)
+            if not news:
+                break
+            stored += self.upsert_items(news, lang, day)
+            if len(news) < CATALOG_PAGE_SIZE:
+                break
+            start_index += CATALOG_PAGE_SIZE
+        self.mark_synced(lang, day)
+        return stored
+
+    def feed_windows(self, lang: str, from_date: str, to_date: str) -> list:
+        """
+        Date windows for a job that pages the feed over a range (ingestion). Runs of days the
+        catalog covers are fetched as one window; days it doesn't are fetched one at a time, so
+        the job can store the pages it fetches with their exact day instead of the catalog
+        pulling the same pages again.
+
+        Returns:
+            list: (from_date, to_date, day) tuples in date order; `day` is set for a single
+                uncovered day whose pages should be stored with `upsert_items` and, once every
+                page is read, marked with `mark_synced`.
+        """
+        windows = []
+        for day in _day_range(from_date, to_date):
+            if not self.covers(lang, day, day):
+                windows.append((day, day, day))
+            elif windows and windows[-1][2] is None:
+                windows[-1] = (windows[-1][0], day, None)
+            else:
+                windows.append((day, day, None))
+        return windows
+
+    def set_summary(self, url: str, lang: str, title: str, summary: str, key_claims: list):
+        """
+        Store the ingestion-time summary of an article, adding the article if the feed sync
+        has not seen it yet.
+        """
+        now = datetime.datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO articles (url, lang, type, title, summary, key_claims, summarized_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "title = COALESCE(articles.title, excluded.title), summary = excluded.summary, "
+                "key_claims = excluded.key_claims, summarized_at = excluded.summarized_at",
+                (url, lang, article_type_from_url(url), title, summary, json.dumps(key_claims, ensure_ascii=False), now, now)
+            )
+
+    def set_claim_id(self, url: str, lang: str, claim_id: str):
+        """
+        Store the claim id shared by an article and its translations on the other language sites.
+        """
+        now = datetime.datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO articles (url, lang, type, claim_id, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET claim_id = excluded.claim_id",
+                (url, lang, article_type_from_url(url), claim_id, now)
+            )
+
+    ##########[READS]##########
+
+    def claim_ids(self, urls: list) -> dict:
+        """
+        Claim ids of a list of URLs.
+
+        Returns:
+            dict: url -> claim id, for the URLs that have one.
+        """
+        found = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT url, claim_id FROM articles WHERE claim_id IS NOT NULL AND url IN ({placeholders})", batch
+                ).fetchall())
+        return found
+
+    def articles_without_claim_id(self, lang: str) -> list:
+        """
+        Summarized articles of a language that have no claim id yet, oldest first.
+
+        Returns:
+            list: Dicts with url, published, title, summary and key_claims.
+        """
+        columns = ("url", "published", "title", "summary", "key_claims")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM articles WHERE lang = ? AND summary IS NOT NULL "
+                f"AND claim_id IS NULL ORDER BY published", (lang,)
+            ).fetchall()
+        articles = [dict(zip(columns, row)) for row in rows]
+        for article in articles:
+            article["key_claims"] = json.loads(article["key_claims"]) if article["key_claims"] else []
+        return articles
+
+    def summaries(self, urls: list) -> dict:
+        """
+        Stored summaries for a list of URLs.
+
+        Returns:
+            dict: url -> {"title", "summary", "key_claims", "published"} for the URLs that have one.
+        """
+        found = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT url, title, summary, key_claims, published FROM articles "
+                    f"WHERE summary IS NOT NULL AND url IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for url, title, summary, key_claims, published in rows:
+                    found[url] = {
+                        "title": title,
+                        "summary": summary,
+                        "key_claims": json.loads(key_claims) if key_claims else [],
+                        "published": published,
+                    }
+        return found
+
+    def vector_metadata(self, urls: list, lang: str) -> dict:
+        """
+        Filterable metadata for the chunks of each article: source, article_type, language,
+        article_id, published (an int YYYYMMDD, so the vector index can range-filter it) and
+        claim_id.
+        Keys whose value is unknown are left out, since the index does not store nulls.
+
+        Returns:
+            dict: url -> metadata dict.
+        """
+        known = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                for url, article_id, published, claim_id in self._conn.execute(
+                    f"SELECT url, article_id, published, claim_id FROM articles WHERE url IN ({placeholders})", batch
+                ):
+                    known[url] = (article_id, published, claim_id)
+        metadata = {}
+        for url in urls:
+            article_id, published, claim_id = known.get(url, (None, None, None))
+            values = {
+                "source": url,
+                "article_type": article_type_from_url(url),
+                "language": lang,
+                "article_id": article_id or article_id_from_item({"url": url}),
+                "published": int(published.replace("-", "")) if published else None,
+                "claim_id": claim_id,
+            }
+            metadata[url] = {key: value for key, value in values.items() if value}
+        return metadata
+
+    def searchable_articles(self, lang: str) -> list:
+        """
+        Every article of a language with the fields the tag index is built from.
+
+        Returns:
+            list: Dicts with url, article_id, type, published, title, description, tags, summary and key_claims.
+        """
+        columns = ("url", "article_id", "type", "published", "title", "description", "tags", "summary", "key_claims")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM articles WHERE lang = ?", (lang,)
+            ).fetchall()
+        articles = []
+        for row in rows:
+            article = dict(zip(columns, row))
+            article["tags"] = json.loads(article["tags"]) if article["tags"] else []
+            article["key_claims"] = json.loads(article["key_claims"]) if article["key_claims"] else []
+            articles.append(article)
+        return articles
+
+    def last_modified(self, lang: str) -> str:
+        """
+        Time of the latest write for a language, used by readers that cache derived data.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(MAX(COALESCE(updated_at, '')), MAX(COALESCE(summarized_at, ''))) FROM articles WHERE lang = ?",
+                (lang,)
+            ).fetchone()
+        return row[0] or ""
+
+    def covers(self, lang: str, from_date: str, to_date: str) -> bool:
+        """
+        Whether every day of the range is synced. The most recent CATALOG_RESYNC_DAYS days only
+        count while their last sync is younger than two poll intervals.
+        """
+        days = _day_range(from_date, to_date)
+        if not days:
+            return False
+        recent_cutoff = (datetime.date.today() - datetime.timedelta(days=CATALOG_RESYNC_DAYS)).strftime("%Y-%m-%d")
+        fresh_after = time.time() - 2 * CATALOG_POLL_INTERVAL
+        with self._lock:
+            synced = dict(self._conn.execute(
+                "SELECT day, synced_at FROM sync_log WHERE lang = ? AND day BETWEEN ? AND ?", (lang, days[0], days[-1])
+            ).fetchall())
+        for day in days:
+            if day not in synced:
+                return False
+            if day >= recent_cutoff and synced[day] < fresh_after:
+                return False
+        return True
+
+    def articles(self, lang: str, from_date: str, to_date: str, article_type: str = None, limit: int = None) -> list:
+        """
+        Articles published in a date range, newest first.
+
+        Args:
+            lang (str): Language code.
+            from_date (str): Start date in 'YYYY-MM-DD' format.
+            to_date (str): End date in 'YYYY-MM-DD' format.
+            article_type (str, optional): First URL path segment, e.g. "fact-check". All types when omitted.
+            limit (int, optional): Maximum number of rows.
+
+        Returns:
+            list: Dicts with url, article_id, lang, type, published, title and description.
+        """
+        sql = "SELECT url, article_id, lang, type, published, title, description FROM articles WHERE lang = ?"
+        params = [lang]
+        if article_type:
+            sql += " AND type = ?"
+            params.append(article_type.strip("/").split("/", 1)[0])
+        sql += " AND published BETWEEN ? AND ? ORDER BY published DESC, CAST(article_id AS INTEGER) DESC"
+        params += [from_date, to_date]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        columns = ("url", "article_id", "lang", "type", "published", "title", "description")
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def urls_in_range(self, lang: str, from_date: str, to_date: str, article_type: str = None):
+        """
+        URLs published in a date range, or None when the catalog does not cover the whole range
+        (the caller should then ask the live API).
+        """
+        if not self.covers(lang, from_date, to_date):
+            return None
+        return [row["url"] for row in self.articles(lang, from_date, to_date, article_type)]
+
+
+##############################################[CATALOG POLLER]###########################################################
+
+
+class CatalogPoller:
+    """
+    Background thread that keeps the catalog fresh: it re-syncs the most recent days on
+    every poll and backfills up to CATALOG_BACKFILL_DAYS of history, newest day first. The
+    tag index is rebuilt from the catalog at startup and after each poll.
+    """
+
+    def __init__(self, catalog: ArticleCatalog, langs: list = None, interval: float = CATALOG_POLL_INTERVAL,
+                 backfill_days: int = CATALOG_BACKFILL_DAYS):
+        self.catalog = catalog
+        self.langs = langs or SUPPORTED_LANGUAGES
+        self.interval = interval
+        self.backfill_days = backfill_days
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        """
+        Re-sync the recent days, then backfill missing days until the next poll is due.
+        """
+        today = datetime.date.today()
+        recent = [(today - datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(CATALOG_RESYNC_DAYS + 1)]
+        for lang in self.langs:
+            for day in recent:
+                self._sync(lang, day)
+
+        deadline = time.monotonic() + self.interval
+        from_date = (today - datetime.timedelta(days=self.backfill_days)).strftime("%Y-%m-%d")
+        for lang in self.langs:
+            for day in reversed(_day_range(from_date, recent[-1])):
+                if self._stop.is_set() or time.monotonic() > deadline:
+                    return
+                if not self.catalog.covers(lang, day, day):
+                    self._sync(lang, day)
+
+    def _sync(self, lang: str, day: str):
+        try:
+            count = self.catalog.sync_day(lang, day)
+            print(f"Catalog synced {count} {lang} articles for {day}")
+        except Exception as e:
+            print(f"Catalog sync failed for {lang} {day}: {e}")
+
+    def _run(self):
+        from chatbot.tag_index import get_tag_index
+
+        # Indexes derived from the catalog are built here, never on a request
+        get_tag_index().refresh(self.langs)
+        while not self._stop.is_set():
+            self.poll_once()
+            get_tag_index().refresh(self.langs)
+            self._stop.wait(self.interval)
+
+
+_catalog = None
+_poller = None
+_catalog_lock = threading.Lock()
+
+
+def get_article_catalog() -> ArticleCatalog:
+    """
+    Return the process-wide article catalog.
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ArticleCatalog()
+        return _catalog
+
+
+def start_catalog_poller():
+    """
+    Start the background poller once per process, unless disabled with CATALOG_POLLER_ENABLED=false.
+    """
+    global _poller
+    if not CATALOG_POLLER_ENABLED:
+        print("Article catalog poller disabled")
+        return None
+    catalog = get_article_catalog()
+    with _catalog_lock:
+        if _poller is None:
+            _poller = CatalogPoller(catalog)
+        _poller.start()
+        return _poller
+
+
+def stop_catalog_poller():
+    if _poller is not None:
+        _poller.stop()
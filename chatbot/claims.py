@@ -0,0 +1,197 @@
+import argparse, datetime, hashlib, os, sys, threading
+from dotenv import load_dotenv
+from config import data_path
+from chatbot.catalog import get_article_catalog
+from chatbot.sites import SUPPORTED_LANGUAGES
+
+load_dotenv()
+
+CLAIM_IDS_ENABLED = os.getenv("CLAIM_IDS_ENABLED", "true").lower() == "true"
+# Cosine similarity above which two articles in different languages are taken to cover the same claim
+CLAIM_MATCH_THRESHOLD = float(os.getenv("CLAIM_MATCH_THRESHOLD", "0.85"))
+# Translations are published within a few days of the original
+CLAIM_MATCH_WINDOW_DAYS = int(os.getenv("CLAIM_MATCH_WINDOW_DAYS", "14"))
+CLAIM_INDEX_DIR = os.getenv("CLAIM_INDEX_DIR", "claims")
+# Characters of article text used when there is no summary to compare
+CLAIM_TEXT_MAX_CHARS = 1500
+
+##############################################[CLAIM IDS]###########################################################
+
+
+def new_claim_id(url: str) -> str:
+    """
+    Claim id for an article that is not a translation of a known one: a hash of its URL.
+    """
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def claim_text(title: str = None, summary: str = None, key_claims: list = None) -> str:
+    """
+    The text an article is matched on: its title, summary and key claims.
+    """
+    return "\n".join(part for part in [title, summary, *(key_claims or [])] if part)
+
+
+def _window_filter(lang: str, published: int) -> dict:
+    conditions = [{"language": {"$ne": lang}}]
+    if published:
+        day = datetime.datetime.strptime(str(published), "%Y%m%d").date()
+        window = datetime.timedelta(days=CLAIM_MATCH_WINDOW_DAYS)
+        conditions.append({"published": {"$gte": int((day - window).strftime("%Y%m%d")),
+                                         "$lte": int((day + window).strftime("%Y%m%d"))}})
+    return {"$and": conditions}
+
+
+class ClaimIndex:
+    """
+    Links an article to its translations on the other language sites.
+
+    Each article is stored once, as the embedding of its title, summary and key claims, in a
+    local vector index. The embedding model is multilingual, so a Hindi translation of an
+    English fact check lands next to the original. A new article takes the claim id of its
+    nearest article in another language published within CLAIM_MATCH_WINDOW_DAYS, if that
+    neighbour scores above CLAIM_MATCH_THRESHOLD, and gets a fresh id otherwise. The id is
+    stored in the article catalog and on every chunk of the article.
+    """
+
+    def __init__(self, directory: str = None, embedding=None):
+        from chatbot.vector_store import LocalVectorStore, get_embeddings
+
+        self.store = LocalVectorStore(CLAIM_INDEX_DIR, embedding or get_embeddings(),
+                                      directory=directory or data_path(CLAIM_INDEX_DIR))
+        self._lock = threading.Lock()
+
+    def assign(self, url: str, lang: str, text: str) -> str:
+        """
+        Find or create the claim id of an article and store it in the catalog.
+
+        Args:
+            url (str): Article URL.
+            lang (str): Language code of the article.
+            text (str): Text to match on, see `claim_text`.
+
+        Returns:
+            str: The claim id.
+        """
+        from langchain_core.documents import Document
+
+        catalog = get_article_catalog()
+        existing = catalog.claim_ids([url]).get(url)
+        if existing:
+            return existing
+        published = catalog.vector_metadata([url], lang)[url].get("published")
+        vector = self.store.embedding.embed_documents([text[:CLAIM_TEXT_MAX_CHARS]])[0]
+        # One writer at a time, so two translations ingested together can't both miss each other
+        with self._lock:
+            matches = self.store.similarity_search_by_vector_with_score(vector, k=1, filter=_window_filter(lang, published))
+            if matches and matches[0][1] >= CLAIM_MATCH_THRESHOLD:
+                claim_id = matches[0][0].metadata["claim_id"]
+                print(f"{url} covers the same claim as {matches[0][0].metadata['source']} ({matches[0][1]:.2f})")
+            else:
+                claim_id = new_claim_id(url)
+            metadata = {"source": url, "language": lang, "claim_id": claim_id}
+            if published:
+                metadata["published"] = published
+            self.store.add_embedded([Document(page_content=text[:CLAIM_TEXT_MAX_CHARS], metadata=metadata)], [vector])
+        catalog.set_claim_id(url, lang, claim_id)
+        return claim_id
+
+
+_claim_index = None
+_claim_index_lock = threading.Lock()
+
+
+def get_claim_index() -> ClaimIndex:
+    """
+    Return the process-wide claim index.
+    """
+    global _claim_index
+    with _claim_index_lock:
+        if _claim_index is None:
+            _claim_index = ClaimIndex()
+        return _claim_index
+
+
+def assign_claim_id(url: str, lang: str, text: str) -> str:
+    """
+    Ingestion hook: give an article its claim id. Failures are logged and never interrupt ingestion.
+
+    Returns:
+        str: The claim id, or None if none was assigned.
+    """
+    if not CLAIM_IDS_ENABLED or not text:
+        return None
+    try:
+        return get_claim_index().assign(url, lang, text)
+    except Exception as e:
+        print(f"Failed to assign a claim id to {url}: {e}")
+        return None
+
+
+##############################################[CROSS-LINGUAL RESULTS]###########################################################
+
+
+def collapse_translations(docs: list, lang: str) -> list:
+    """
+    Keep one article per claim among retrieved chunks: when an article and its translations
+    all match, the chunks of the translations in other languages are dropped in favour of
+    the article in `lang` (or the best-ranked one when there is none in `lang`). Chunks
+    ingested before claim ids existed get theirs from the catalog; chunks without any claim
+    id are kept as they are.
+
+    Args:
+        docs (list): Retrieved Documents, best first.
+        lang (str): The user's language code.
+
+    Returns:
+        list: The kept Documents, in their original order.
+    """
+    missing = [doc.metadata.get("source") for doc in docs if not doc.metadata.get("claim_id")]
+    known = get_article_catalog().claim_ids([url for url in dict.fromkeys(missing) if url]) if missing else {}
+
+    def claim_of(doc):
+        return doc.metadata.get("claim_id") or known.get(doc.metadata.get("source"))
+
+    # Chosen article per claim: the best-ranked one in the user's language, else the best-ranked one
+    chosen = {}
+    for doc in docs:
+        claim_id = claim_of(doc)
+        if claim_id is None:
+            continue
+        current = chosen.get(claim_id)
+        if current is None or (current[1] != lang and doc.metadata.get("language") == lang):
+            chosen[claim_id] = (doc.metadata.get("source"), doc.metadata.get("language"))
+    return [
+        doc for doc in docs
+        if claim_of(doc) is None or chosen[claim_of(doc)][0] == doc.metadata.get("source")
+    ]
+
+
+##############################################[BACKFILL]###########################################################
+
+
+def backfill(langs: list = None) -> int:
+    """
+    Assign claim ids to summarized articles that don't have one. English goes first, so
+    Hindi and Bengali translations attach to the English originals.
+
+    Returns:
+        int: Number of articles given a claim id.
+    """
+    total = 0
+    for lang in langs or SUPPORTED_LANGUAGES:
+        for article in get_article_catalog().articles_without_claim_id(lang):
+            text = claim_text(article["title"], article["summary"], article["key_claims"])
+            if assign_claim_id(article["url"], lang, text):
+                total += 1
+        print(f"Claim ids assigned for {lang}: {total} so far")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assign claim ids to already summarized articles.")
+    parser.add_argument("--lang", choices=SUPPORTED_LANGUAGES, action="append",
+                        help="Language to backfill (repeatable). All languages by default.")
+    args = parser.parse_args()
+    print(f"{backfill(args.lang)} articles given a claim id")
+    sys.exit(0)
@@ -0,0 +1,261 @@
+import calendar, re
+from datetime import date, timedelta
+
+# Longest range a custom date query is answered for; longer ranges keep their most recent part
+DATE_RANGE_MAX_DAYS = 31
+
+_BOUNDARY_BEFORE = r"(?<![\wऀ-৿])"
+_BOUNDARY_AFTER = r"(?![\wऀ-৿])"
+
+MONTH_NAMES = {
+    # English
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+    # Hindi
+    "जनवरी": 1, "फ़रवरी": 2, "फरवरी": 2, "मार्च": 3, "अप्रैल": 4, "अप्रेल": 4, "मई": 5, "जून": 6,
+    "जुलाई": 7, "अगस्त": 8, "सितंबर": 9, "सितम्बर": 9, "अक्टूबर": 10, "अक्तूबर": 10,
+    "नवंबर": 11, "नवम्बर": 11, "दिसंबर": 12, "दिसम्बर": 12,
+    # Bengali
+    "জানুয়ারি": 1, "জানুয়ারী": 1, "ফেব্রুয়ারি": 2, "ফেব্রুয়ারী": 2, "মার্চ": 3, "এপ্রিল": 4, "মে": 5,
+    "জুন": 6, "জুলাই": 7, "আগস্ট": 8, "অগাস্ট": 8, "সেপ্টেম্বর": 9, "অক্টোবর": 10, "নভেম্বর": 11,
+    "ডিসেম্বর": 12,
+}
+# English month names that are also common words only count with a day, a year or a preposition
+_AMBIGUOUS_MONTHS = {"may", "march", "mar", "jan", "dec", "sep", "oct", "aug", "jun", "jul", "apr", "nov", "feb"}
+_MONTH_PREPOSITIONS = {"in", "of", "during", "from", "since", "to", "till", "until", "between", "and", "last", "this"}
+
+_DIGITS = str.maketrans("०१२३४५६७८९০১২৩৪৫৬৭৮৯", "01234567890123456789")
+_MONTH = "(" + "|".join(sorted(map(re.escape, MONTH_NAMES), key=len, reverse=True)) + ")"
+_YEAR = r"((?:19|20)\d{2})"
+_ORDINAL = r"(?:st|nd|rd|th)?"
+_RANGE_JOINER = r"\s*(?:-|–|to|till|until|and|से|থেকে)\s*"
+
+##############################################[EXPLICIT DATES]###########################################################
+
+# (pattern, granularity) in priority order; each match is removed before the next pattern runs
+_MENTION_PATTERNS = [
+    (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), "iso"),
+    (re.compile(r"(?<!\d)(\d{1,2})[/.](\d{1,2})[/.](\d{4})"), "dmy"),
+    # "1 to 5 March", "March 1-5": one month for both days
+    (re.compile(_BOUNDARY_BEFORE + r"(\d{1,2})" + _ORDINAL + _RANGE_JOINER + r"(\d{1,2})" + _ORDINAL + r"\s+(?:of\s+)?"
+                + _MONTH + r"(?:,?\s+" + _YEAR + r")?" + _BOUNDARY_AFTER), "day_range_month"),
+    (re.compile(_BOUNDARY_BEFORE + _MONTH + r"\s+(\d{1,2})" + _ORDINAL + _RANGE_JOINER + r"(\d{1,2})" + _ORDINAL
+                + r"(?!\d)(?:,?\s+" + _YEAR + r")?" + _BOUNDARY_AFTER), "month_day_range"),
+    (re.compile(_BOUNDARY_BEFORE + r"(\d{1,2})" + _ORDINAL + r"\s+(?:of\s+)?" + _MONTH + r"(?:,?\s+" + _YEAR + r")?" + _BOUNDARY_AFTER), "day_month"),
+    (re.compile(_BOUNDARY_BEFORE + _MONTH + r"\s+(\d{1,2})" + _ORDINAL + r"(?!\d)(?:,?\s+" + _YEAR + r")?" + _BOUNDARY_AFTER), "month_day"),
+    (re.compile(_BOUNDARY_BEFORE + _MONTH + r"(?:,?\s+" + _YEAR + r")?" + _BOUNDARY_AFTER), "month"),
+    (re.compile(_BOUNDARY_BEFORE + _YEAR + _BOUNDARY_AFTER), "year"),
+]
+
+
+def _previous_word(text: str, position: int) -> str:
+    words = text[:position].split()
+    return words[-1] if words else ""
+
+
+def _find_mentions(text: str) -> list:
+    """
+    Find explicit date mentions in `text`.
+
+    Returns:
+        list: (position, year or None, month or None, day or None) tuples, in text order.
+    """
+    mentions = []
+    remaining = text
+    for pattern, kind in _MENTION_PATTERNS:
+        for match in pattern.finditer(remaining):
+            groups = match.groups()
+            if kind in ("day_range_month", "month_day_range"):
+                if kind == "day_range_month":
+                    first_day, last_day, month, year = groups
+                else:
+                    month, first_day, last_day, year = groups
+                year = int(year) if year else None
+                if not 1 <= int(first_day) <= 31 or not 1 <= int(last_day) <= 31:
+                    continue
+                mentions.append((match.start(), year, MONTH_NAMES[month], int(first_day)))
+                mentions.append((match.end(), year, MONTH_NAMES[month], int(last_day)))
+                remaining = remaining[:match.start()] + " " * (match.end() - match.start()) + remaining[match.end():]
+                continue
+            if kind == "iso":
+                mention = (int(groups[0]), int(groups[1]), int(groups[2]))
+            elif kind == "dmy":
+                mention = (int(groups[2]), int(groups[1]), int(groups[0]))
+            elif kind == "day_month":
+                mention = (int(groups[2]) if groups[2] else None, MONTH_NAMES[groups[1]], int(groups[0]))
+            elif kind == "month_day":
+                mention = (int(groups[2]) if groups[2] else None, MONTH_NAMES[groups[0]], int(groups[1]))
+            elif kind == "month":
+                if not groups[1] and groups[0] in _AMBIGUOUS_MONTHS \
+                        and _previous_word(remaining, match.start()) not in _MONTH_PREPOSITIONS:
+                    continue
+                mention = (int(groups[1]) if groups[1] else None, MONTH_NAMES[groups[0]], None)
+            else:
+                mention = (int(groups[0]), None, None)
+            month, day = mention[1], mention[2]
+            if month is not None and not 1 <= month <= 12 or day is not None and not 1 <= day <= 31:
+                continue
+            mentions.append((match.start(), *mention))
+            remaining = remaining[:match.start()] + " " * (match.end() - match.start()) + remaining[match.end():]
+    return sorted(mentions)
+
+
+def _resolve_year(month: int, day, today: date) -> int:
+    # A month (or day) without a year means its most recent occurrence
+    candidate = date(today.year, month, min(day or 1, calendar.monthrange(today.year, month)[1]))
+    return today.year if candidate <= today else today.year - 1
+
+
+def _span(year: int, month, day) -> tuple:
+    if month is None:
+        return date(year, 1, 1), date(year, 12, 31)
+    last_day = calendar.monthrange(year, month)[1]
+    if day is None:
+        return date(year, month, 1), date(year, month, last_day)
+    day = min(day, last_day)
+    return date(year, month, day), date(year, month, day)
+
+
+def _explicit_range(text: str, today: date, ranges_only: bool = False):
+    mentions = _find_mentions(text)
+    # A single mention ("a 2019 video", "15 August") names when something happened, not a range to search
+    if not mentions or ranges_only and len(mentions) < 2:
+        return None
+    first, last = mentions[0][1:], mentions[-1][1:]
+    last_year = last[0] if last[0] is not None else _resolve_year(last[1], last[2], today)
+    if first[0] is not None:
+        first_year = first[0]
+    elif len(mentions) > 1:
+        # "January to March 2024": the year of the end applies to the start as well
+        first_year = last_year if (first[1], first[2] or 1) <= (last[1] or 12, last[2] or 31) else last_year - 1
+    else:
+        first_year = _resolve_year(first[1], first[2], today)
+    try:
+        start, _ = _span(first_year, first[1], first[2])
+        _, end = _span(last_year, last[1], last[2])
+    except ValueError:
+        return None
+    if start > end:
+        start, end = end, start
+    return start, end
+
+
+##############################################[RELATIVE EXPRESSIONS]###########################################################
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _previous_month(today: date) -> tuple:
+    last_day = date(today.year, today.month, 1) - timedelta(days=1)
+    return date(last_day.year, last_day.month, 1), last_day
+
+
+_UNIT_DAYS = {
+    "day": 1, "days": 1, "दिन": 1, "दिनों": 1, "দিন": 1, "দিনে": 1, "দিনের": 1,
+    "week": 7, "weeks": 7, "हफ्ते": 7, "हफ़्ते": 7, "हफ्तों": 7, "सप्ताह": 7, "सप्ताहों": 7, "সপ্তাহ": 7, "সপ্তাহে": 7, "সপ্তাহের": 7,
+    "month": 30, "months": 30, "महीने": 30, "महीनों": 30, "माह": 30, "মাস": 30, "মাসে": 30, "মাসের": 30,
+}
+_LAST_N = re.compile(
+    _BOUNDARY_BEFORE + r"(?:last|past|previous|पिछले|गत|বিগত|গত|শেষ)\s+(\d{1,3})\s+("
+    + "|".join(sorted(map(re.escape, _UNIT_DAYS), key=len, reverse=True)) + ")" + _BOUNDARY_AFTER
+)
+
+# (phrases, function of today returning (start, end)) checked in order
+_DAY_EXPRESSIONS = [
+    (["today", "आज", "আজ", "আজকে", "আজকের"], lambda today: (today, today)),
+    (["yesterday", "बीते कल", "গতকাল", "গতকালের"], lambda today: (today - timedelta(days=1), today - timedelta(days=1))),
+]
+# Hindi "कल" is both yesterday and tomorrow; it only counts as yesterday with a past-tense verb in the same sentence
+_PAST_TENSE = ["था", "थी", "थे", "हुआ", "हुई", "हुए", "गया", "गई", "गयी", "गए", "किया", "आया", "आई", "आए", "बताया", "कहा"]
+_HINDI_YESTERDAY = re.compile(
+    _BOUNDARY_BEFORE + "कल" + _BOUNDARY_AFTER + r"(?=[^.?!।]*?" + _BOUNDARY_BEFORE
+    + "(?:" + "|".join(_PAST_TENSE) + ")" + _BOUNDARY_AFTER + ")"
+)
+# Phrases that contain a date word without meaning a date: "आज तक" is a news channel
+_NOT_DATES = re.compile(_BOUNDARY_BEFORE + r"आज\s+तक" + _BOUNDARY_AFTER)
+_PERIOD_EXPRESSIONS = [
+    (["last week", "past week", "previous week", "पिछले हफ्ते", "पिछले हफ़्ते", "पिछला हफ्ता", "पिछले सप्ताह", "गत सप्ताह",
+      "গত সপ্তাহ", "গত সপ্তাহে", "গত সপ্তাহের", "আগের সপ্তাহ"],
+     lambda today: (_week_start(today) - timedelta(days=7), _week_start(today) - timedelta(days=1))),
+    (["this week", "इस हफ्ते", "इस हफ़्ते", "इस सप्ताह", "এই সপ্তাহ", "এই সপ্তাহে", "এই সপ্তাহের", "চলতি সপ্তাহ"],
+     lambda today: (_week_start(today), today)),
+    (["last month", "past month", "previous month", "पिछले महीने", "पिछला महीना", "पिछले माह", "गत माह",
+      "গত মাস", "গত মাসে", "গত মাসের", "আগের মাস"], _previous_month),
+    (["this month", "इस महीने", "इस माह", "এই মাস", "এই মাসে", "এই মাসের", "চলতি মাস"],
+     lambda today: (date(today.year, today.month, 1), today)),
+    (["last year", "past year", "previous year", "पिछले साल", "पिछला साल", "पिछले वर्ष", "गत वर्ष",
+      "গত বছর", "গত বছরে", "গত বছরের", "আগের বছর"],
+     lambda today: (date(today.year - 1, 1, 1), date(today.year - 1, 12, 31))),
+    (["this year", "इस साल", "इस वर्ष", "এই বছর", "এই বছরে", "এই বছরের", "চলতি বছর"],
+     lambda today: (date(today.year, 1, 1), today)),
+]
+
+
+def _phrase_patterns(expressions: list) -> list:
+    return [
+        (re.compile(_BOUNDARY_BEFORE + "(?:" + "|".join(sorted(map(re.escape, phrases), key=len, reverse=True)) + ")" + _BOUNDARY_AFTER), resolve)
+        for phrases, resolve in expressions
+    ]
+
+
+_DAY_PATTERNS = _phrase_patterns(_DAY_EXPRESSIONS) + [(_HINDI_YESTERDAY, _DAY_EXPRESSIONS[1][1])]
+_PERIOD_PATTERNS = _phrase_patterns(_PERIOD_EXPRESSIONS)
+
+
+def _relative_range(text: str, today: date, ranges_only: bool = False):
+    match = _LAST_N.search(text)
+    if match:
+        days = int(match.group(1)) * _UNIT_DAYS[match.group(2)]
+        return today - timedelta(days=days), today
+    patterns = _PERIOD_PATTERNS if ranges_only else _DAY_PATTERNS + _PERIOD_PATTERNS
+    # The earliest expression in the text wins ("last week, not today" is about last week)
+    found = [(match.start(), resolve) for pattern, resolve in patterns for match in [pattern.search(text)] if match]
+    if found:
+        return min(found, key=lambda item: item[0])[1](today)
+    return None
+
+
+##############################################[DATE RANGE PARSER]###########################################################
+
+
+def parse_date_range(query: str, today: date = None, ranges_only: bool = False):
+    """
+    Extract the date range a query asks about, without calling a model.
+
+    Understands English, Hindi and Bengali month names, ISO and dd/mm/yyyy dates, explicit ranges
+    ("from 3 Jan to 10 Feb 2024", "जनवरी से मार्च 2024 तक"), year-only queries and relative
+    expressions ("last week", "पिछले महीने", "গত ৭ দিন"). Explicit dates take precedence over relative ones.
+
+    Args:
+        query (str): User query.
+        today (date, optional): Reference date for relative expressions. Defaults to today.
+        ranges_only (bool): Only recognise phrases that ask for a range of dates: two explicit
+            dates ("from January to March 2024"), "last N days" and calendar periods ("last
+            week"). A lone year or date, "today" and "yesterday" are ignored.
+
+    Returns:
+        tuple: (start_date, end_date) as `date` objects, or None if the query has no date expression.
+    """
+    today = today or date.today()
+    text = _NOT_DATES.sub(" ", query.lower().translate(_DIGITS))
+    result = _explicit_range(text, today, ranges_only) or _relative_range(text, today, ranges_only)
+    if result is None:
+        return None
+    start, end = result
+    # Nothing is published in the future
+    if start <= today < end:
+        end = today
+    return start, end
+
+
+def clamp_range(start: date, end: date, max_days: int = DATE_RANGE_MAX_DAYS) -> tuple:
+    """
+    Shorten a range to its most recent `max_days` days.
+    """
+    if (end - start).days >= max_days:
+        start = end - timedelta(days=max_days - 1)
+    return start, end
@@ -0,0 +1,215 @@
+import os, re, sys, time
+from bs4 import BeautifulSoup
+try:
+    import lxml.html
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+TEXT_TAGS = ("p", "h1", "h2", "h3")
+
+# Containers that hold the article body on BOOM pages, most specific first, as (tag, attrs).
+# The first one that matches is used; pages without any of them fall back to the whole document.
+ARTICLE_BODY_CONTAINERS = [
+    ("div", {"class": "story"}),
+    ("div", {"class": "details-story-wrapper"}),
+    ("div", {"class": "story-details"}),
+    ("*", {"itemprop": "articleBody"}),
+    ("article", {}),
+    ("main", {}),
+]
+
+# Below this much text the container is assumed to be the wrong one
+MIN_BODY_CHARS = 200
+
+_WHITESPACE = re.compile(r"\s+")
+
+##############################################[HTML EXTRACTION]###########################################################
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _container_xpath(tag: str, attrs: dict) -> str:
+    conditions = []
+    for name, value in attrs.items():
+        if name == "class":
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {value} ')")
+        else:
+            conditions.append(f"@{name}='{value}'")
+    return f"//{tag}" + "".join(f"[{condition}]" for condition in conditions)
+
+
+_CONTAINER_XPATHS = [_container_xpath(tag, attrs) for tag, attrs in ARTICLE_BODY_CONTAINERS]
+
+
+def _lxml_blocks(html, tags) -> list:
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    document = lxml.html.fromstring(html)
+    tag_xpath = "|".join(f".//{tag}" for tag in tags)
+
+    body = None
+    for xpath in _CONTAINER_XPATHS:
+        for candidate in document.xpath(xpath):
+            if len(candidate.text_content().strip()) >= MIN_BODY_CHARS:
+                body = candidate
+                break
+        if body is not None:
+            break
+
+    if body is None:
+        return [text for text in (_clean(el.text_content()) for el in document.xpath(tag_xpath)) if text]
+
+    blocks = []
+    # The headline usually sits in the page header, outside the body container
+    if "h1" in tags:
+        headlines = document.xpath("//h1")
+        if headlines and body not in headlines[0].iterancestors():
+            blocks.append(_clean(headlines[0].text_content()))
+    blocks.extend(_clean(el.text_content()) for el in body.xpath(tag_xpath))
+    return [block for block in blocks if block]
+
+
+def _soup_blocks(html, tags) -> list:
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    body = None
+    for tag, attrs in ARTICLE_BODY_CONTAINERS:
+        candidate = soup.find(True if tag == "*" else tag, attrs=attrs)
+        if candidate is not None and len(candidate.get_text(" ", strip=True)) >= MIN_BODY_CHARS:
+            body = candidate
+            break
+
+    if body is None:
+        return [text for text in (_clean(tag.get_text()) for tag in soup.find_all(list(tags))) if text]
+
+    blocks = []
+    if "h1" in tags:
+        headline = soup.find("h1")
+        if headline is not None and not any(parent is body for parent in headline.parents):
+            blocks.append(_clean(headline.get_text()))
+    blocks.extend(_clean(tag.get_text()) for tag in body.find_all(list(tags)))
+    return [block for block in blocks if block]
+
+
+def extract_article_blocks(html, tags=TEXT_TAGS) -> list:
+    """
+    Extract the text blocks (headline, paragraphs, sub-headings) of an article page.
+
+    Parses with lxml when it is installed and only reads inside the article body container,
+    so navigation, footer and related-story text is left out.
+
+    Args:
+        html (str | bytes): Page HTML.
+        tags (tuple): Tags whose text is extracted.
+
+    Returns:
+        list: Non-empty text blocks in document order.
+    """
+    if HTML_PARSER == "lxml":
+        try:
+            return _lxml_blocks(html, tags)
+        except (ValueError, lxml.etree.ParserError) as e:
+            print(f"lxml could not parse page, falling back to html.parser: {e}")
+    return _soup_blocks(html, tags)
+
+
+def extract_article_text(html, separator: str = " ", tags=TEXT_TAGS) -> str:
+    """
+    Extract the article text of a page as a single string.
+
+    Args:
+        html (str | bytes): Page HTML.
+        separator (str): String used to join the text blocks.
+        tags (tuple): Tags whose text is extracted.
+
+    Returns:
+        str: Article text.
+    """
+    return separator.join(extract_article_blocks(html, tags))
+
+
+def legacy_extract_text(html) -> str:
+    """
+    The extraction used before this module existed, kept for benchmarking.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    return ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
+
+
+##############################################[BENCHMARK]###########################################################
+
+
+def save_corpus(url_file: str, out_dir: str):
+    """
+    Download the pages listed in `url_file` (one URL per line) into `out_dir` as .html files.
+    """
+    import requests
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(url_file) as f:
+        urls = [line.strip() for line in f if line.strip()]
+    for i, url in enumerate(urls):
+        try:
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to fetch {url}: {e}")
+            continue
+        with open(os.path.join(out_dir, f"{i:05d}.html"), "wb") as out:
+            out.write(response.content)
+    print(f"Saved {len(os.listdir(out_dir))} pages to {out_dir}")
+
+
+def benchmark(corpus_dir: str):
+    """
+    Compare legacy and targeted extraction on a directory of saved .html pages.
+
+    Reports CPU time per page and extracted characters for both, and how much of the new
+    output also appears in the legacy output (a sanity check that the body was found).
+    """
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                pages.append(f.read())
+    if not pages:
+        print(f"No .html files found in {corpus_dir}")
+        return
+
+    start = time.process_time()
+    legacy = [legacy_extract_text(page) for page in pages]
+    legacy_time = time.process_time() - start
+
+    start = time.process_time()
+    targeted = [extract_article_blocks(page) for page in pages]
+    targeted_time = time.process_time() - start
+
+    legacy_chars = sum(len(text) for text in legacy)
+    targeted_chars = sum(len(" ".join(blocks)) for blocks in targeted)
+    legacy_normalised = [_clean(text) for text in legacy]
+    kept = sum(
+        sum(len(block) for block in blocks if block in text)
+        for blocks, text in zip(targeted, legacy_normalised)
+    )
+
+    print(f"Pages:                 {len(pages)} (parser: {HTML_PARSER})")
+    print(f"Legacy CPU/page:       {legacy_time / len(pages) * 1000:.2f} ms")
+    print(f"Targeted CPU/page:     {targeted_time / len(pages) * 1000:.2f} ms")
+    print(f"Speed-up:              {legacy_time / targeted_time if targeted_time else float('inf'):.2f}x")
+    print(f"Legacy chars/page:     {legacy_chars / len(pages):.0f}")
+    print(f"Targeted chars/page:   {targeted_chars / len(pages):.0f} ({targeted_chars / legacy_chars * 100 if legacy_chars else 0:.1f}% of legacy)")
+    print(f"Targeted text in legacy output: {kept / targeted_chars * 100 if targeted_chars else 0:.1f}%")
+
+
+if __name__ == "__main__":
+    # python -m chatbot.extraction save <urls.txt> <corpus_dir>
+    # python -m chatbot.extraction bench <corpus_dir>
+    if len(sys.argv) == 4 and sys.argv[1] == "save":
+        save_corpus(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 3 and sys.argv[1] == "bench":
+        benchmark(sys.argv[2])
+    else:
+        print("Usage: python -m chatbot.extraction save <urls.txt> <corpus_dir> | bench <corpus_dir>")
@@ -1,5 +1,11 @@
 from chatbot.utils import validate_date_range
-import requests, datetime, os, json
+from chatbot.sites import get_site, SUPPORTED_LANGUAGES
+from chatbot.index_layout import write_partition
+from chatbot.url_registry import get_url_registry
+from chatbot.ingestion import SiteRateLimiter, EmbeddingBatcher, run_limited, INGEST_MAX_WORKERS, INGEST_EMBED_BATCH_SIZE, INGEST_SITE_RPS
+from concurrent.futures import ThreadPoolExecutor
+import requests, datetime, os, json, asyncio
+import http_client
 ###############################################################################################################################################
 #########################################################################################################################################################
 ###############################################################################################################################################
@@ -58,25 +64,93 @@ async def store_multilingual_daily_articles(lang: str = None):
         print(f"Error in store_daily_articles: {str(e)}")
         return []
     
-async def store_multilingual_articles_custom_range(from_date: str = None, to_date: str = None, lang: str = None):
+async def store_all_languages_daily_articles(langs: list = None):
+    """
+    Fetch and store the last 15 days of articles for every language site in one run.
+
+    Returns:
+        dict: Article URLs processed, keyed by language code.
+    """
+    today = datetime.date.today()
+    from_date = (today - datetime.timedelta(days=15)).strftime('%Y-%m-%d')
+    to_date = today.strftime('%Y-%m-%d')
+    return await store_all_languages_articles_custom_range(from_date, to_date, langs)
+
+
+async def store_all_languages_articles_custom_range(from_date: str = None, to_date: str = None, langs: list = None,
+                                                    max_workers: int = INGEST_MAX_WORKERS,
+                                                    batch_size: int = INGEST_EMBED_BATCH_SIZE,
+                                                    sink=None, dry_run: bool = False, site_rps: float = INGEST_SITE_RPS):
+    """
+    Fetch and store articles for several language sites concurrently.
+
+    All sites share one worker pool and one embedding batcher, and each site gets its own
+    rate limiter, so the run takes as long as the slowest site rather than the sum of all.
+
+    Args:
+        from_date (str): Start date in 'YYYY-MM-DD' format. Defaults to 6 months ago.
+        to_date (str): End date in 'YYYY-MM-DD' format. Defaults to today.
+        langs (list): Language codes to ingest. Defaults to all supported sites.
+        max_workers (int): Size of the shared worker pool.
+        batch_size (int): Number of chunks embedded per embeddings call.
+        sink (callable, optional): Where embedded chunks are written, see EmbeddingBatcher.
+            Defaults to the Pinecone index of each site. With a custom sink URLs are not recorded
+            as ingested, since the chunks never reach Pinecone.
+        dry_run (bool): Fetch and chunk only; nothing is embedded, written or recorded.
+        site_rps (float): Maximum request rate per site.
+
+    Returns:
+        dict: Article URLs processed, keyed by language code. Failed sites map to an error string.
+    """
+    langs = langs or SUPPORTED_LANGUAGES
+    print(f"Storing articles for {langs} from {from_date} to {to_date} in one run...")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        batcher = EmbeddingBatcher(batch_size=batch_size, executor=executor, sink=sink,
+                                   dry_run=dry_run, record_urls=sink is None)
+        results = await asyncio.gather(
+            *[
+                store_multilingual_articles_custom_range(
+                    from_date, to_date, lang,
+                    executor=executor, rate_limiter=SiteRateLimiter(site_rps), batcher=batcher
+                )
+                for lang in langs
+            ],
+            return_exceptions=True
+        )
+        await batcher.flush()
+
+    stored = {}
+    for lang, result in zip(langs, results):
+        if isinstance(result, Exception):
+            print(f"Error storing {lang} articles: {result}")
+            stored[lang] = f"error: {result}"
+        else:
+            stored[lang] = result
+    print(f"Stored {batcher.total_chunks} chunks from {batcher.total_urls} new articles across {len(langs)} sites.")
+    return stored
+
+
+async def store_multilingual_articles_custom_range(from_date: str = None, to_date: str = None, lang: str = None,
+                                                   executor=None, rate_limiter=None, batcher=None):
     """
     Fetch and store articles based on a custom date range.
 
     Args:
         from_date (str): Start date in 'YYYY-MM-DD' format. Defaults to 6 months ago.
         to_date (str): End date in 'YYYY-MM-DD' format. Defaults to today.
+        lang (str): Language code - "en", "hi" or "bn".
+        executor (ThreadPoolExecutor, optional): Shared worker pool for blocking HTTP calls.
+        rate_limiter (SiteRateLimiter, optional): Rate limit for this site's requests.
+        batcher (EmbeddingBatcher, optional): Shared embedding batcher. When given, chunks are
+            queued on it instead of being stored page by page.
 
     Returns:
         list: List of all article URLs processed.
     """
-    s_id = ENGLISH_BOOMLIVE_API_KEY
-    api_url_origin = 'https://boomlive.in' 
-    if lang=='hi':
-        s_id = HINDI_BOOMLIVE_API_KEY
-        api_url_origin = 'https://hindi.boomlive.in'
-    elif lang=='bn':
-        s_id= BANGLA_BOOMLIVE_API_KEY
-        api_url_origin = 'http://bangla.boomlive.in'
+    site = get_site(lang)
+    s_id = site["s_id"]
+    api_url_origin = site["api_origin"]
     # Initialize variables
     article_urls = []
     start_index = 0
@@ -96,30 +170,46 @@ async def store_multilingual_articles_custom_range(from_date: str = None, to_dat
         return []
 
     print(f"Fetching data from {from_date} to {to_date}....")
-    index_name = "boom-latest-articles"
-
-    while True:
-        perpageurl = []
-        print("Now start index is ", start_index)
-
-        # Construct API URL with the custom range
-        api_url = f'{api_url_origin}/dev/h-api/news?startIndex={start_index}&count={count}&fromDate={from_date}&toDate={to_date}'
-        headers = {
-            "accept": "*/*",
-            "s-id": s_id
-        }
-        print(f"Current API URL: {api_url}")
-
-        response = requests.get(api_url, headers=headers)
+    # Chunk metadata takes the published date from the catalog, so days it doesn't cover yet are
+    # paged one at a time and stored in the catalog before their chunks are built
+    catalog = get_article_catalog()
+    windows = await asyncio.to_thread(catalog.feed_windows, lang, from_date, to_date)
+
+    for window_from, window_to, day in windows:
+        start_index = 0
+        while True:
+            perpageurl = []
+            print("Now start index is ", start_index)
+
+            # Construct API URL with the custom range
+            api_url = f'{api_url_origin}/dev/h-api/news?startIndex={start_index}&count={count}&fromDate={window_from}&toDate={window_to}'
+            headers = {
+                "accept": "*/*",
+                "s-id": s_id
+            }
+            print(f"Current API URL: {api_url}")
+
+            if executor is not None:
+                response = await run_limited(executor, rate_limiter, http_client.get, api_url, headers=headers)
+            else:
+                response = http_client.get(api_url, headers=headers)
+
+            if response.status_code != 200:
+                print(f"Failed to fetch articles. Status code: {response.status_code}")
+                break
 
-        if response.status_code == 200:
             data = response.json()
+            news = data.get("news") or []
+            if day:
+                await asyncio.to_thread(catalog.upsert_items, news, lang, day)
 
             # Break if no articles are found
-            if not data.get("news"):
+            if not news:
+                if day:
+                    await asyncio.to_thread(catalog.mark_synced, lang, day)
                 break
 
-            for news_item in data.get("news", []):
+            for news_item in news:
                 url_path = news_item.get("url")
                 if url_path:
                     article_urls.append(url_path)
@@ -129,14 +219,16 @@ async def store_multilingual_articles_custom_range(from_date: str = None, to_dat
             # # Filter and process URLs
             filtered_urls = await filter_urls_custom_range(json.dumps(perpageurl), lang)
             print("These are filtered urls",filtered_urls)
-            docsperindex = await fetch_docs_custom_range(filtered_urls)
+            docsperindex = await fetch_docs_custom_range(filtered_urls, executor=executor, rate_limiter=rate_limiter, lang=lang,
+                                                  summarize=not (batcher is not None and batcher.dry_run))
             print(f"Processed {len(filtered_urls)} articles and {len(docsperindex)} chunks to add to Pinecone.")
 
-            await store_docs_in_pinecone(docsperindex, filtered_urls, lang)
+            if batcher is not None:
+                partition = write_partition(lang)
+                await batcher.add(docsperindex, partition.index_name, filtered_urls, lang, namespace=partition.namespace)
+            else:
+                await store_docs_in_pinecone(docsperindex, filtered_urls, lang)
             start_index += count
-        else:
-            print(f"Failed to fetch articles. Status code: {response.status_code}")
-            break
 
     return article_urls
 
@@ -151,64 +243,97 @@ async def store_multilingual_articles_custom_range(from_date: str = None, to_dat
 
 ###########################################################[PROCESS ARTICLES]##############################################################################################
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from bs4 import BeautifulSoup
+from chatbot.extraction import extract_article_blocks
+from chatbot.boilerplate import get_boilerplate_filter
+from chatbot.summaries import summarize_and_store
+from chatbot.catalog import get_article_catalog
 from langchain.schema import Document
 from langchain_pinecone import Pinecone
 from langchain_openai import OpenAIEmbeddings
 
 
 async def filter_urls_custom_range(urls, lang):
+    """
+    Return the URLs from a page that have not been ingested yet.
+
+    Args:
+        urls (str): JSON-encoded list of article URLs.
+        lang (str): Language code of the site.
+
+    Returns:
+        list: URLs that still need to be ingested.
+    """
     print("THESE ARE URLS TO BE FILTERED", urls)
-    api_url = f"{FILTER_BOOMLIVE_ARTICLES}?urls={urls}&lang={lang}"
-    print(api_url)
-    headers = {
-        "accept": "*/*",
-        "Authorization": "adityaboom_requesting2024#",
-        "Content-Type": "application/json"
-    }
-    try:
-        response = requests.get(api_url, headers=headers, verify=False)
-        if response.status_code == 200:
-            response_data = response.json()
-            return response_data.get("urls", [])
-    except requests.RequestException as e:
-        print(f"Error filtering URLs: {e}")
-    return []
+    url_list = json.loads(urls) if isinstance(urls, str) else list(urls)
+    # Checked against the local registry; the remote table is only asked until the language is seeded
+    return await asyncio.to_thread(get_url_registry().filter_new, url_list, lang)
 
 
-async def fetch_docs_custom_range(urls):
-    data = []
+async def fetch_docs_custom_range(urls, executor=None, rate_limiter=None, lang: str = "en", summarize: bool = True):
+    """
+    Download article pages and split them into chunks ready for embedding.
+
+    Blocks that repeat across many pages of the site are dropped before chunking, and each
+    article's summary, title, key claims and claim id are stored in the article catalog
+    before its chunks are given their metadata.
+
+    Args:
+        urls (list): Article URLs to fetch.
+        executor (ThreadPoolExecutor, optional): When given, pages are fetched concurrently on it.
+        rate_limiter (SiteRateLimiter, optional): Rate limit applied to the page fetches.
+        lang (str): Language code of the site, used for the boilerplate frequency table.
+        summarize (bool): Whether to create per-article summaries (skipped on dry runs).
+
+    Returns:
+        list: Chunked Document objects.
+    """
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
 
-    for url in urls:
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+    if executor is not None:
+        fetched = await asyncio.gather(*[run_limited(executor, rate_limiter, fetch_article_blocks, url) for url in urls])
+    else:
+        fetched = [fetch_article_blocks(url) for url in urls]
+    pages = [(url, blocks) for url, blocks in zip(urls, fetched) if blocks is not None]
 
-            # Parse only HTML content
-            if 'text/html' not in response.headers.get('Content-Type', ''):
-                print(f"Skipped non-HTML content at {url}")
-                continue
+    pages = await asyncio.to_thread(get_boilerplate_filter().filter_pages, pages, lang)
+    texts = [(url, " ".join(blocks)) for url, blocks in pages if blocks]
 
-            # Extract text using BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
+    if summarize:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, summarize_and_store, url, text, lang)
+            for url, text in texts
+        ])
 
-            document = Document(page_content=text, metadata={"source": url})
-            data.append(document)
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to fetch {url}: {e}")
-            continue
+    metadata = get_article_catalog().vector_metadata([url for url, _ in texts], lang)
+    data = [Document(page_content=text, metadata=metadata[url]) for url, text in texts]
 
     docs = text_splitter.split_documents(data)
     return docs
 
 
+def fetch_article_blocks(url):
+    """
+    Fetch one article page and return its text blocks, or None if it can't be used.
+    """
+    try:
+        response = http_client.get(url, timeout=10)
+        response.raise_for_status()
+
+        # Parse only HTML content
+        if 'text/html' not in response.headers.get('Content-Type', ''):
+            print(f"Skipped non-HTML content at {url}")
+            return None
+
+        # Extract the article body text
+        return extract_article_blocks(response.content)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch {url}: {e}")
+        return None
+
+
 async def store_docs_in_pinecone(docs, urls, lang):
-    index_name = {
-        "hi": "hindi-boom-articles",
-        "bn": "bangla-boom-articles"
-    }.get(lang, "boom-latest-articles")
+    index_name, namespace, _ = write_partition(lang)
 
 
     print("store_docs_in_pinecone invoked")
@@ -216,7 +341,7 @@ async def store_docs_in_pinecone(docs, urls, lang):
     print("INDEX NAME", index_name)
     embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
     print(f"Storing {len(docs)} document chunks to Pinecone index '{index_name}'...")
-    pine_vs = Pinecone.from_documents(documents = docs, embedding = embeddings, index_name=index_name)
+    pine_vs = Pinecone.from_documents(documents = docs, embedding = embeddings, index_name=index_name, namespace=namespace)
     print(f"Added {len(docs)} Articles chunks in the pinecone")
     await add_urls_to_database(json.dumps(urls), lang)
     print(f"Successfully stored documents. Associated URLs: {urls}")
@@ -225,87 +350,42 @@ async def store_docs_in_pinecone(docs, urls, lang):
 
 async def add_urls_to_database(urls, lang):
     """
-    Adds new URLs to the database by sending them to an external API endpoint.
+    Records newly ingested URLs in the local registry and queues them for the external table.
+
+    The remote write happens in batched POSTs on a background thread, so ingestion does not
+    wait on it.
 
     Args:
-        urls (list): List of new URLs to be added to the database.
+        urls (str): JSON-encoded list of new URLs to be added to the database.
+        lang (str): Language code of the site.
 
     Returns:
         str: A message indicating the result of the request.
     """
     print("add_urls_to_database invoked")
-    api_url = f"{STORE_BOOMLIVE__ARTICLES}?urls={urls}&lang={lang}"
-    headers = {
-        "accept": "*/*",
-        "Authorization": "adityaboom_requesting2024#",
-        "Content-Type": "application/json"
-    }
-    print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$")
-
-    print(api_url)    
-
-    print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$")
-
+    url_list = json.loads(urls) if isinstance(urls, str) else list(urls)
+    if not url_list:
+        return "There are no urls to add"
     try:
-        # Send the POST request with the URLs in the payload
-        response = requests.get(api_url, headers=headers, verify=False)
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            response_data = response.json()
-            # You can log or process the response data as required
-            # noofurls = len(urls)
-            # print(urls, noofurls)
-            print(f"Successfully added {len(urls)}URLs to the database." )
-            return f"Successfully added URLs to the database."
-        else:
-            if(len(urls) == 0):
-                return f"There are no urls to add"
-            return f"There are no urls to add"
-    except requests.RequestException as e:
+        get_url_registry().mark_ingested(url_list, lang)
+        print(f"Successfully added {len(url_list)} URLs to the database.")
+        return "Successfully added URLs to the database."
+    except Exception as e:
         return f"An error occurred while adding URLs: {e}"
-    
+
+
 async def add_multilingual_urls_to_database(urls, lang):
     """
-    Adds new URLs to the database by sending them to an external API endpoint.
+    Adds new URLs to the database. Kept for callers of the older name.
 
     Args:
-        urls (list): List of new URLs to be added to the database.
+        urls (str): JSON-encoded list of new URLs to be added to the database.
+        lang (str): Language code of the site.
 
     Returns:
         str: A message indicating the result of the request.
     """
-    print("add_urls_to_database invoked")
-    api_url = f"{STORE_BOOMLIVE__ARTICLES}?urls={urls}&lang={lang}"
-    headers = {
-        "accept": "*/*",
-        "Authorization": "adityaboom_requesting2024#",
-        "Content-Type": "application/json"
-    }
-    print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$")
-
-    print(api_url)    
-
-    print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$")
-
-    try:
-        # Send the POST request with the URLs in the payload
-        response = requests.get(api_url, headers=headers, verify=False)
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            response_data = response.json()
-            # You can log or process the response data as required
-            # noofurls = len(urls)
-            # print(urls, noofurls)
-            print(f"Successfully added {len(urls)}URLs to the database." )
-            return f"Successfully added URLs to the database."
-        else:
-            if(len(urls) == 0):
-                return f"There are no urls to add"
-            return f"There are no urls to add"
-    except requests.RequestException as e:
-        return f"An error occurred while adding URLs: {e}"
+    return await add_urls_to_database(urls, lang)
     
 
 #########################################################################################################################################################
\ No newline at end of file
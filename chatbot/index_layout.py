@@ -0,0 +1,232 @@
+import argparse, datetime, os, sys
+from collections import namedtuple
+from dotenv import load_dotenv
+from chatbot.sites import SUPPORTED_LANGUAGES, get_site
+
+load_dotenv()
+
+# "separate": the original one-index-per-language/tier setup. "namespaced": one physical
+# index (VECTOR_INDEX_NAME) with a namespace per language and the tier as a metadata filter.
+INDEX_LAYOUT = os.getenv("INDEX_LAYOUT", "separate").lower()
+VECTOR_INDEX_NAME = os.getenv("VECTOR_INDEX_NAME", "boom-articles")
+# Articles published within this many days are the "latest" tier
+LATEST_TIER_DAYS = int(os.getenv("LATEST_TIER_DAYS", "180"))
+# Languages split into latest and old tiers. The others had a single index in the separate
+# layout, so every tier searches all of their articles.
+ARCHIVE_LANGUAGES = [lang.strip() for lang in os.getenv("ARCHIVE_LANGUAGES", "en").split(",") if lang.strip()]
+# Search the other languages' partitions as well; every index holds vectors from the same
+# multilingual embedding model, so a Hindi query is matched against English chunks directly
+MULTILINGUAL_RETRIEVAL = os.getenv("MULTILINGUAL_RETRIEVAL", "false").lower() == "true"
+CROSS_LINGUAL_LANGUAGES = [
+    lang.strip() for lang in os.getenv("CROSS_LINGUAL_LANGUAGES", ",".join(SUPPORTED_LANGUAGES)).split(",") if lang.strip()
+]
+
+TIERS = ("latest", "old", "all")
+
+Partition = namedtuple("Partition", ["index_name", "namespace", "metadata_filter"])
+
+##############################################[INDEX LAYOUT]###########################################################
+
+
+def _separate_indexes(lang: str) -> dict:
+    """
+    Tier -> index name in the separate layout. Only English has an archive ("old") index.
+    """
+    if lang == "en":
+        return {
+            "latest": os.getenv("PINECONE_LATEST_INDEX_NAME") or get_site("en")["index_name"],
+            "old": os.getenv("PINECONE_OLD_INDEX_NAME"),
+        }
+    env_name = {"hi": "PINECONE_HINDI_INDEX_NAME", "bn": "PINECONE_BANGLA_INDEX_NAME"}.get(lang)
+    index_name = (os.getenv(env_name) if env_name else None) or get_site(lang)["index_name"]
+    return {"latest": index_name, "old": index_name}
+
+
+def tier_filter(tier: str) -> dict:
+    """
+    Metadata filter selecting a time tier inside a namespaced index, or None for "all".
+    Chunks without a published date belong to the old tier: they were ingested before the
+    date was recorded.
+    """
+    cutoff = int((datetime.date.today() - datetime.timedelta(days=LATEST_TIER_DAYS)).strftime("%Y%m%d"))
+    if tier == "latest":
+        return {"published": {"$gte": cutoff}}
+    if tier == "old":
+        return {"$or": [{"published": {"$lt": cutoff}}, {"published": {"$exists": False}}]}
+    return None
+
+
+def partitions_for_query(lang: str = "en", tier: str = "all", cross_lingual: bool = None) -> list:
+    """
+    The partitions a query in `lang` over `tier` has to search.
+
+    In the namespaced layout this is one partition per language, with the tier expressed as
+    a filter for ARCHIVE_LANGUAGES. In the separate layout English "all" still needs both
+    the latest and the old index.
+
+    Args:
+        lang (str): Language code.
+        tier (str): "latest", "old" or "all".
+        cross_lingual (bool, optional): Also search the CROSS_LINGUAL_LANGUAGES partitions.
+            Defaults to MULTILINGUAL_RETRIEVAL.
+
+    Returns:
+        list: Partition(index_name, namespace, metadata_filter) tuples, the query language's first.
+    """
+    tier = tier if tier in TIERS else "all"
+    if MULTILINGUAL_RETRIEVAL if cross_lingual is None else cross_lingual:
+        langs = [lang] + [other for other in CROSS_LINGUAL_LANGUAGES if other != lang and other in SUPPORTED_LANGUAGES]
+        partitions = {}
+        for other in langs:
+            for partition in partitions_for_query(other, tier, cross_lingual=False):
+                partitions.setdefault((partition.index_name, partition.namespace), partition)
+        return list(partitions.values())
+    if INDEX_LAYOUT == "namespaced":
+        return [Partition(VECTOR_INDEX_NAME, lang, tier_filter(tier if lang in ARCHIVE_LANGUAGES else "all"))]
+    indexes = _separate_indexes(lang)
+    names = [indexes["latest"], indexes["old"]] if tier == "all" else [indexes[tier]]
+    return [Partition(name, None, None) for name in dict.fromkeys(names) if name]
+
+
+def write_partition(lang: str = "en") -> Partition:
+    """
+    Where newly ingested articles of a language are written: the language's namespace, or
+    the site's own index in the separate layout.
+    """
+    if INDEX_LAYOUT == "namespaced":
+        return Partition(VECTOR_INDEX_NAME, lang, None)
+    return Partition(get_site(lang)["index_name"], None, None)
+
+
+def physical_indexes() -> list:
+    """
+    Every index name the current layout reads from or writes to.
+    """
+    if INDEX_LAYOUT == "namespaced":
+        return [VECTOR_INDEX_NAME]
+    names = [name for lang in SUPPORTED_LANGUAGES
+             for name in [write_partition(lang).index_name, *_separate_indexes(lang).values()] if name]
+    return list(dict.fromkeys(names))
+
+
+def validate_partition(index_name: str, namespace: str = None):
+    """
+    Check that an index name and namespace given by an API caller belong to the current layout.
+
+    Raises:
+        ValueError: If `index_name` is not one of `physical_indexes()` or `namespace` is not a
+            supported language.
+    """
+    if index_name not in physical_indexes():
+        raise ValueError(f"Unknown index '{index_name}'; expected one of {', '.join(physical_indexes())}")
+    if namespace is not None and namespace not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Unknown namespace '{namespace}'; expected one of {', '.join(SUPPORTED_LANGUAGES)}")
+
+
+def resolve_write_partition(lang: str, index_name: str = None) -> Partition:
+    """
+    Write target for an API caller that may name an index.
+
+    Raises:
+        ValueError: If `lang` is not supported or `index_name` is not part of the current layout.
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Unsupported language '{lang}'; expected one of {', '.join(SUPPORTED_LANGUAGES)}")
+    partition = write_partition(lang)
+    if index_name and index_name != partition.index_name:
+        if index_name not in physical_indexes():
+            raise ValueError(f"Unknown index '{index_name}'; expected one of {', '.join(physical_indexes())}")
+        return Partition(index_name, partition.namespace, None)
+    return partition
+
+
+def combine_filters(*filters) -> dict:
+    """
+    AND together metadata filters, skipping empty ones.
+    """
+    conditions = []
+    for metadata_filter in filters:
+        if metadata_filter:
+            conditions += metadata_filter["$and"] if list(metadata_filter) == ["$and"] else [metadata_filter]
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+##############################################[MIGRATION]###########################################################
+
+
+def migrate_index(source_index: str, lang: str, batch_size: int = 100, dry_run: bool = False) -> int:
+    """
+    Copy every vector of a separate-layout index into the language's namespace of
+    VECTOR_INDEX_NAME, adding the article metadata (type, language, id, published date) that
+    chunks ingested before it was recorded lack. Vector ids are kept, so re-running is safe.
+
+    Returns:
+        int: Number of vectors copied (or that would be copied with `dry_run`).
+    """
+    from pinecone import Pinecone as PineconeClient
+    from chatbot.catalog import get_article_catalog
+    from chatbot.lexical_index import get_lexical_index
+    from chatbot.vector_store import partition_name
+    from langchain_core.documents import Document
+
+    client = PineconeClient(api_key=os.getenv("PINECONE_API_KEY"))
+    source = client.Index(source_index)
+    target = client.Index(VECTOR_INDEX_NAME)
+    catalog = get_article_catalog()
+    copied = 0
+    for ids in source.list(limit=batch_size):
+        vectors = source.fetch(ids=list(ids)).vectors
+        urls = list({(vector.metadata or {}).get("source") for vector in vectors.values()} - {None})
+        article_metadata = catalog.vector_metadata(urls, lang)
+        records, docs = [], []
+        for vector_id, vector in vectors.items():
+            metadata = dict(vector.metadata or {})
+            # Values recorded at ingestion win over what the catalog knows now
+            metadata = {**article_metadata.get(metadata.get("source"), {"language": lang}), **metadata}
+            records.append({"id": vector_id, "values": list(vector.values), "metadata": metadata})
+            docs.append(Document(page_content=metadata.get("text", ""),
+                                 metadata={k: v for k, v in metadata.items() if k != "text"}))
+        if not dry_run and records:
+            target.upsert(vectors=records, namespace=lang)
+            get_lexical_index(partition_name(VECTOR_INDEX_NAME, lang)).add_documents(docs)
+        copied += len(records)
+        print(f"{'[dry-run] ' if dry_run else ''}{source_index} -> {VECTOR_INDEX_NAME}/{lang}: {copied} vectors")
+    return copied
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Show the vector index layout, or migrate separate indexes into one namespaced index."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("show", help="Print the partitions each language and tier maps to.")
+    migrate = subparsers.add_parser("migrate", help=f"Copy separate indexes into namespaces of {VECTOR_INDEX_NAME}.")
+    migrate.add_argument("--lang", choices=SUPPORTED_LANGUAGES, action="append",
+                         help="Language to migrate (repeatable). All languages by default.")
+    migrate.add_argument("--batch-size", type=int, default=100, help="Vectors fetched and upserted per request.")
+    migrate.add_argument("--dry-run", action="store_true", help="Count the vectors without writing anything.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.command == "show":
+        print(f"Layout: {INDEX_LAYOUT}")
+        for lang in SUPPORTED_LANGUAGES:
+            for tier in TIERS:
+                print(f"{lang} {tier}: {partitions_for_query(lang, tier)}")
+            print(f"{lang} writes to: {write_partition(lang)}")
+        return 0
+
+    # Source indexes always come from the separate layout, whatever INDEX_LAYOUT says now
+    for lang in args.lang or SUPPORTED_LANGUAGES:
+        for source_index in dict.fromkeys(name for name in _separate_indexes(lang).values() if name):
+            migrate_index(source_index, lang, batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"Set INDEX_LAYOUT=namespaced and VECTOR_INDEX_NAME={VECTOR_INDEX_NAME} to serve from the migrated index.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Offline ingestion entry point, independent of the FastAPI app.
+
+Examples:
+    python -m chatbot.ingest --days 15
+    python -m chatbot.ingest --from-date 2024-01-01 --to-date 2024-03-31 --lang en,hi --concurrency 32
+    python -m chatbot.ingest --days 2 --dry-run
+    python -m chatbot.ingest --days 30 --sink local --sink-path data/backfill.jsonl
+    python -m chatbot.ingest --seed --from-date 2020-01-01
+"""
+import argparse, asyncio, datetime, sys
+from chatbot.sites import SUPPORTED_LANGUAGES
+from chatbot.ingestion import JsonlSink, INGEST_MAX_WORKERS, INGEST_EMBED_BATCH_SIZE, INGEST_SITE_RPS
+from chatbot.fetchArticles import store_all_languages_articles_custom_range
+from chatbot.url_registry import get_url_registry
+from chatbot.utils import validate_date_range
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m chatbot.ingest", description="Ingest BOOM articles into the vector store.")
+    parser.add_argument("--from-date", help="Start date, YYYY-MM-DD. Defaults to --days before --to-date.")
+    parser.add_argument("--to-date", help="End date, YYYY-MM-DD. Defaults to today.")
+    parser.add_argument("--days", type=int, default=15, help="Length of the range when --from-date is not given (default: 15).")
+    parser.add_argument("--lang", default=",".join(SUPPORTED_LANGUAGES),
+                        help=f"Comma-separated language codes (default: {','.join(SUPPORTED_LANGUAGES)}).")
+    parser.add_argument("--concurrency", type=int, default=INGEST_MAX_WORKERS, help="Size of the shared worker pool.")
+    parser.add_argument("--site-rps", type=float, default=INGEST_SITE_RPS, help="Maximum requests per second per site.")
+    parser.add_argument("--batch-size", type=int, default=INGEST_EMBED_BATCH_SIZE, help="Chunks embedded per embeddings call.")
+    parser.add_argument("--dry-run", action="store_true", help="Fetch and chunk only; nothing is embedded, written or recorded.")
+    parser.add_argument("--sink", choices=["pinecone", "local"], default="pinecone",
+                        help="Write to the configured vector backend (default, Pinecone unless VECTOR_BACKEND "
+                             "says otherwise) or to a local JSON Lines file.")
+    parser.add_argument("--sink-path", default="ingested_chunks.jsonl", help="Output file for --sink local.")
+    parser.add_argument("--seed", action="store_true",
+                        help="Only seed the local ingested-URL registry from the remote table for the feed URLs "
+                             "in the date range, then exit. Seeded languages are filtered without remote lookups.")
+    return parser.parse_args(argv)
+
+
+def resolve_date_range(args):
+    """
+    Work out the (from_date, to_date) strings from the parsed arguments.
+    """
+    to_date = args.to_date or datetime.date.today().strftime('%Y-%m-%d')
+    if args.from_date:
+        from_date = args.from_date
+    else:
+        end = datetime.datetime.strptime(to_date, '%Y-%m-%d').date()
+        from_date = (end - datetime.timedelta(days=args.days)).strftime('%Y-%m-%d')
+    return from_date, to_date
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    from_date, to_date = resolve_date_range(args)
+    if not validate_date_range(from_date, to_date):
+        print("Invalid date range. Ensure 'from_date' <= 'to_date' and format is YYYY-MM-DD.")
+        return 2
+
+    langs = [lang.strip() for lang in args.lang.split(",") if lang.strip()]
+    invalid = [lang for lang in langs if lang not in SUPPORTED_LANGUAGES]
+    if invalid:
+        print(f"Unsupported language(s): {invalid}. Supported: {SUPPORTED_LANGUAGES}")
+        return 2
+
+    if args.seed:
+        registry = get_url_registry()
+        seeded = [registry.seed_from_feed(lang, from_date, to_date) for lang in langs]
+        return 0 if all(seeded) else 1
+
+    sink = JsonlSink(args.sink_path) if args.sink == "local" else None
+    print(f"Ingesting {langs} from {from_date} to {to_date} "
+          f"(workers={args.concurrency}, batch={args.batch_size}, sink={args.sink}{', dry run' if args.dry_run else ''})")
+
+    results = asyncio.run(store_all_languages_articles_custom_range(
+        from_date, to_date, langs,
+        max_workers=args.concurrency,
+        batch_size=args.batch_size,
+        sink=sink,
+        dry_run=args.dry_run,
+        site_rps=args.site_rps,
+    ))
+
+    failed = False
+    for lang, result in results.items():
+        if isinstance(result, str):
+            failed = True
+            print(f"{lang}: {result}")
+        else:
+            print(f"{lang}: {len(result)} articles in range")
+
+    if sink is None and not args.dry_run:
+        # The process exits right after this, so push registry writes now instead of leaving them to the background thread
+        synced = get_url_registry().sync_pending()
+        print(f"Synced {synced} URLs to the remote table")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
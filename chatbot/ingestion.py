@@ -0,0 +1,199 @@
+import asyncio, json, os, threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "16"))
+INGEST_EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "200"))
+INGEST_SITE_RPS = float(os.getenv("INGEST_SITE_RPS", "4"))
+INGEST_SITE_CONCURRENCY = int(os.getenv("INGEST_SITE_CONCURRENCY", "4"))
+
+##############################################[SHARED INGESTION RESOURCES]###########################################################
+
+
+class SiteRateLimiter:
+    """
+    Per-site rate limit for outbound ingestion requests.
+
+    Caps both the number of in-flight requests and the rate at which new requests
+    start, so several sites can share one worker pool without any of them being hammered.
+    """
+
+    def __init__(self, requests_per_second: float = INGEST_SITE_RPS, max_concurrency: int = INGEST_SITE_CONCURRENCY):
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+async def run_limited(executor, rate_limiter, func, *args, **kwargs):
+    """
+    Run a blocking call on the shared executor, inside the site's rate limit if one is given.
+    """
+    loop = asyncio.get_running_loop()
+    if rate_limiter is None:
+        return await loop.run_in_executor(executor, lambda: func(*args, **kwargs))
+    async with rate_limiter:
+        return await loop.run_in_executor(executor, lambda: func(*args, **kwargs))
+
+
+class EmbeddingBatcher:
+    """
+    Collects document chunks from any number of sites and embeds them together.
+
+    Chunks are queued per Pinecone index. Once `batch_size` chunks are pending, all of
+    them are embedded with a single embeddings call, written to their own index, and the
+    source URLs are recorded in the articles table.
+
+    The write step is pluggable: `sink(index_name, docs, vectors, namespace)` defaults to the backend
+    chosen with VECTOR_BACKEND (a Pinecone upsert unless configured otherwise). With `dry_run`
+    nothing is embedded, written or recorded; chunks are only counted.
+    """
+
+    def __init__(self, batch_size: int = INGEST_EMBED_BATCH_SIZE, executor: ThreadPoolExecutor = None, embeddings=None,
+                 sink=None, dry_run: bool = False, record_urls: bool = True):
+        self.batch_size = batch_size
+        self.executor = executor
+        self.dry_run = dry_run
+        if sink is None:
+            from chatbot.vector_store import write_embedded_documents
+            sink = write_embedded_documents
+        self.sink = sink
+        self.record_urls = record_urls and not dry_run
+        if embeddings is None and not dry_run:
+            # The shared cached model, so chunks embedded here are not re-embedded when retrieved
+            from chatbot.vector_store import get_embeddings
+            embeddings = get_embeddings()
+        self.embeddings = embeddings
+        self._pending = []  # (index_name, namespace, lang, docs, urls)
+        self._pending_chunks = 0
+        self._lock = asyncio.Lock()
+        self.total_chunks = 0
+        self.total_urls = 0
+
+    async def add(self, docs, index_name: str, urls: list, lang: str, namespace: str = None):
+        """
+        Queue chunks for an index (and namespace) and flush once the batch is full.
+        """
+        if not docs and not urls:
+            return
+        async with self._lock:
+            self._pending.append((index_name, namespace, lang, list(docs), list(urls)))
+            self._pending_chunks += len(docs)
+            if self._pending_chunks < self.batch_size:
+                return
+            pending, self._pending, self._pending_chunks = self._pending, [], 0
+        await self._flush(pending)
+
+    async def flush(self):
+        """
+        Embed and write whatever is still queued.
+        """
+        async with self._lock:
+            pending, self._pending, self._pending_chunks = self._pending, [], 0
+        await self._flush(pending)
+
+    async def _flush(self, pending):
+        if not pending:
+            return
+        if self.dry_run:
+            for index_name, namespace, lang, docs, urls in pending:
+                self.total_chunks += len(docs)
+                self.total_urls += len(urls)
+                print(f"[dry-run] Would add {len(docs)} chunks from {len(urls)} URLs to '{index_name}'")
+            return
+
+        texts = [doc.page_content for _, _, _, docs, _ in pending for doc in docs]
+        loop = asyncio.get_running_loop()
+        vectors = []
+        if texts:
+            print(f"Embedding {len(texts)} chunks from {len(pending)} pages in one batch...")
+            vectors = await loop.run_in_executor(self.executor, self.embeddings.embed_documents, texts)
+
+        offset = 0
+        for index_name, namespace, lang, docs, urls in pending:
+            doc_vectors = vectors[offset:offset + len(docs)]
+            offset += len(docs)
+            if docs:
+                await loop.run_in_executor(self.executor, self.sink, index_name, docs, doc_vectors, namespace)
+                self.total_chunks += len(docs)
+                print(f"Added {len(docs)} Articles chunks to '{index_name}'")
+            self.total_urls += len(urls)
+            if self.record_urls:
+                from chatbot.fetchArticles import add_urls_to_database
+                await add_urls_to_database(json.dumps(urls), lang)
+
+
+def _embedded_records(docs, vectors) -> list:
+    records = []
+    for doc, vector in zip(docs, vectors):
+        metadata = dict(doc.metadata)
+        metadata["text"] = doc.page_content
+        records.append({"id": str(uuid.uuid4()), "values": vector, "metadata": metadata})
+    return records
+
+
+class JsonlSink:
+    """
+    Writes embedded chunks to a local JSON Lines file instead of Pinecone, one record per
+    line in the Pinecone upsert layout plus the target index name.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, index_name: str, docs, vectors, namespace: str = None):
+        lines = [
+            json.dumps({"index_name": index_name, "namespace": namespace, **record}, ensure_ascii=False)
+            for record in _embedded_records(docs, vectors)
+        ]
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+_pinecone_client = None
+_pinecone_indexes = {}
+_pinecone_lock = threading.Lock()
+
+
+def get_pinecone_index(index_name: str):
+    """
+    Return the process-wide Pinecone client handle of an index. The client and each index
+    handle are created once, so their connection pools are reused across upserts.
+    """
+    global _pinecone_client
+    with _pinecone_lock:
+        if index_name not in _pinecone_indexes:
+            if _pinecone_client is None:
+                from pinecone import Pinecone as PineconeClient
+                _pinecone_client = PineconeClient(api_key=os.getenv("PINECONE_API_KEY"))
+            _pinecone_indexes[index_name] = _pinecone_client.Index(index_name)
+        return _pinecone_indexes[index_name]
+
+
+def upsert_embedded_documents(index_name: str, docs, vectors, batch_size: int = 100, namespace: str = None):
+    """
+    Upsert already-embedded documents to a Pinecone index.
+
+    Uses the same record layout as `PineconeVectorStore` (page content under the "text"
+    metadata key), so the chatbot retrievers read these records unchanged.
+    """
+    index = get_pinecone_index(index_name)
+    records = _embedded_records(docs, vectors)
+    for i in range(0, len(records), batch_size):
+        index.upsert(vectors=records[i:i + batch_size], namespace=namespace)
@@ -0,0 +1,135 @@
+import os, threading, unicodedata
+from functools import lru_cache
+from dotenv import load_dotenv
+from chatbot.sites import SUPPORTED_LANGUAGES
+
+load_dotenv()
+
+LANGID_CACHE_SIZE = int(os.getenv("LANGID_CACHE_SIZE", "4096"))
+# Share of a text's letters that must be in an Indic script for the script to decide the language
+SCRIPT_SHARE_THRESHOLD = 0.3
+DEFAULT_LANGUAGE = "en"
+# Devanagari is also used for Marathi and Nepali. Text is only taken for one of them when the
+# n-gram model is this sure and the text is long enough to tell; names and one-word queries stay Hindi.
+DEVANAGARI_LANGUAGES = ["hi", "mr", "ne"]
+DEVANAGARI_MIN_PROBABILITY = 0.6
+DEVANAGARI_MIN_WORDS = 3
+
+# Unicode blocks whose script identifies the language well enough for this bot. Devanagari
+# maps to Hindi, the only Devanagari site, unless `devanagari_language` finds Marathi or Nepali.
+_SCRIPT_RANGES = [
+    (0x0900, 0x097F, "hi"),  # Devanagari
+    (0x0980, 0x09FF, "bn"),  # Bengali
+    (0x0A00, 0x0A7F, "pa"),  # Gurmukhi
+    (0x0A80, 0x0AFF, "gu"),  # Gujarati
+    (0x0B00, 0x0B7F, "or"),  # Oriya
+    (0x0B80, 0x0BFF, "ta"),  # Tamil
+    (0x0C00, 0x0C7F, "te"),  # Telugu
+    (0x0C80, 0x0CFF, "kn"),  # Kannada
+    (0x0D00, 0x0D7F, "ml"),  # Malayalam
+]
+
+##############################################[LANGUAGE IDENTIFICATION]###########################################################
+
+
+def script_language(text: str) -> str:
+    """
+    Language implied by the script of a text's letters, or None when the letters are mostly
+    Latin (or in a script not listed in _SCRIPT_RANGES).
+    """
+    counts, letters = {}, 0
+    for char in text:
+        if not char.isalpha() and unicodedata.category(char) not in ("Mn", "Mc"):
+            continue
+        letters += 1
+        code = ord(char)
+        if code < 0x0900:
+            continue
+        for start, end, lang in _SCRIPT_RANGES:
+            if start <= code <= end:
+                counts[lang] = counts.get(lang, 0) + 1
+                break
+    if not counts:
+        return None
+    lang, count = max(counts.items(), key=lambda item: item[1])
+    return lang if count / letters >= SCRIPT_SHARE_THRESHOLD else None
+
+
+_model_lock = threading.Lock()
+_model = None
+_devanagari_model = None
+
+
+def _ngram_model():
+    """
+    langid.py's character n-gram model, loaded once. Deterministic and a few hundred
+    microseconds per short query.
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            from langid.langid import LanguageIdentifier, model
+            _model = LanguageIdentifier.from_modelstring(model, norm_probs=True)
+        return _model
+
+
+def devanagari_language(text: str) -> str:
+    """
+    Hindi, Marathi or Nepali for a text in Devanagari: the n-gram model restricted to the
+    three languages decides, and the text counts as Hindi unless the model is at least
+    DEVANAGARI_MIN_PROBABILITY sure of another language over DEVANAGARI_MIN_WORDS or more words.
+    """
+    global _devanagari_model
+    if len(text.split()) < DEVANAGARI_MIN_WORDS:
+        return "hi"
+    try:
+        with _model_lock:
+            if _devanagari_model is None:
+                from langid.langid import LanguageIdentifier, model
+                _devanagari_model = LanguageIdentifier.from_modelstring(model, norm_probs=True)
+                _devanagari_model.set_languages(DEVANAGARI_LANGUAGES)
+            lang, probability = _devanagari_model.classify(text)
+    except Exception as e:
+        print(f"Devanagari language identification failed, assuming hi: {e}")
+        return "hi"
+    return lang if probability >= DEVANAGARI_MIN_PROBABILITY else "hi"
+
+
+@lru_cache(maxsize=LANGID_CACHE_SIZE)
+def detect_language(text: str) -> str:
+    """
+    ISO 639-1 code of the language a text is written in.
+
+    Text in an Indic script is identified from its Unicode block without a model, except that
+    Devanagari is checked for Marathi and Nepali, which are translated rather than answered
+    from the Hindi site. Anything else goes through an n-gram model. Results are memoized, so
+    the several pipeline stages that look at the same query only identify it once.
+
+    Args:
+        text (str): Query or article text.
+
+    Returns:
+        str: Language code; DEFAULT_LANGUAGE for empty text or when identification fails.
+    """
+    text = (text or "").strip()
+    if not any(char.isalpha() for char in text):
+        return DEFAULT_LANGUAGE
+    lang = script_language(text)
+    if lang == "hi":
+        return devanagari_language(text)
+    if lang:
+        return lang
+    try:
+        return _ngram_model().classify(text)[0]
+    except Exception as e:
+        print(f"Language identification failed, assuming {DEFAULT_LANGUAGE}: {e}")
+        return DEFAULT_LANGUAGE
+
+
+def site_language(text: str = None, lang: str = None) -> str:
+    """
+    The supported site language to answer in: `lang` when the caller already knows it,
+    otherwise the detected language of `text`, falling back to English.
+    """
+    lang = lang or detect_language(text)
+    return lang if lang in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
@@ -0,0 +1,196 @@
+import datetime, heapq, os, re, threading
+from dotenv import load_dotenv
+from chatbot.sites import SUPPORTED_LANGUAGES
+from chatbot.catalog import article_type_from_url, article_id_from_item, get_article_catalog
+
+load_dotenv()
+
+LATEST_POLLER_ENABLED = os.getenv("LATEST_POLLER_ENABLED", "true").lower() == "true"
+LATEST_POLL_INTERVAL = float(os.getenv("LATEST_POLL_INTERVAL", "60"))
+# Feed pages (of LATEST_PAGE_SIZE items) read on every poll
+LATEST_POLL_PAGES = int(os.getenv("LATEST_POLL_PAGES", "3"))
+LATEST_PAGE_SIZE = 20
+# Newest articles kept per (language, type)
+LATEST_PER_TYPE = int(os.getenv("LATEST_PER_TYPE", "50"))
+# Days of catalog history used to seed the index on start-up, so rarer types are not empty
+LATEST_SEED_DAYS = int(os.getenv("LATEST_SEED_DAYS", "90"))
+
+ALL_TYPES = "all"
+_TRAILING_NUMBER = re.compile(r"(\d+)(?=\s*$)")
+
+##############################################[LATEST ARTICLES INDEX]###########################################################
+
+
+def _recency_key(url: str, article_id=None) -> int:
+    # Same ordering the feed code always used: the number at the end of the URL
+    match = _TRAILING_NUMBER.search(url)
+    if match:
+        return int(match.group(0))
+    try:
+        return int(article_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+class LatestArticlesIndex:
+    """
+    Newest article URLs per (language, article type), held in memory.
+
+    Each bucket is a bounded min-heap of (recency, url), so adding an article is O(log k)
+    and the oldest entry is dropped once LATEST_PER_TYPE is reached. Every article also goes
+    into the language's "all" bucket. Reads never touch the network.
+    """
+
+    def __init__(self, per_type: int = LATEST_PER_TYPE):
+        self.per_type = per_type
+        self._buckets = {}  # (lang, type) -> heap of (recency, url)
+        self._members = {}  # (lang, type) -> set of urls in the heap
+        self._ready = set()
+        self._lock = threading.Lock()
+
+    def add(self, lang: str, url: str, article_id=None):
+        if not url:
+            return
+        recency = _recency_key(url, article_id)
+        with self._lock:
+            for article_type in (article_type_from_url(url), ALL_TYPES):
+                self._push((lang, article_type), recency, url)
+
+    def add_items(self, lang: str, news_items: list):
+        """
+        Add news feed items (dicts with at least a "url") and mark the language as ready.
+        """
+        for item in news_items:
+            self.add(lang, item.get("url"), article_id_from_item(item))
+        with self._lock:
+            self._ready.add(lang)
+
+    def _push(self, key, recency: int, url: str):
+        heap = self._buckets.setdefault(key, [])
+        members = self._members.setdefault(key, set())
+        if url in members:
+            return
+        if len(heap) < self.per_type:
+            heapq.heappush(heap, (recency, url))
+            members.add(url)
+        elif recency > heap[0][0]:
+            _, dropped = heapq.heapreplace(heap, (recency, url))
+            members.discard(dropped)
+            members.add(url)
+
+    def is_ready(self, lang: str) -> bool:
+        with self._lock:
+            return lang in self._ready
+
+    def latest(self, lang: str = "en", article_type: str = ALL_TYPES, limit: int = 5) -> list:
+        """
+        Newest article URLs of a type, newest first.
+
+        Args:
+            lang (str): Language code.
+            article_type (str): First URL path segment ("fact-check", "decode", ...) or "all".
+            limit (int): Number of URLs to return.
+
+        Returns:
+            list: Article URLs.
+        """
+        article_type = (article_type or ALL_TYPES).strip("/").split("/", 1)[0]
+        with self._lock:
+            entries = list(self._buckets.get((lang, article_type), []))
+        return [url for _, url in heapq.nlargest(limit, entries)]
+
+    def seed_from_catalog(self, lang: str, days: int = LATEST_SEED_DAYS) -> int:
+        """
+        Add the catalog's articles of the last `days` days for a language.
+        """
+        to_date = datetime.date.today()
+        from_date = to_date - datetime.timedelta(days=days)
+        rows = get_article_catalog().articles(lang, from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d"))
+        for row in rows:
+            self.add(lang, row["url"], row["article_id"])
+        return len(rows)
+
+
+##############################################[LATEST ARTICLES POLLER]###########################################################
+
+
+class LatestArticlesPoller:
+    """
+    Background thread that reads the first pages of each language's feed every
+    LATEST_POLL_INTERVAL seconds and pushes the articles into the index.
+    """
+
+    def __init__(self, index: LatestArticlesIndex, langs: list = None, interval: float = LATEST_POLL_INTERVAL):
+        self.index = index
+        self.langs = langs or SUPPORTED_LANGUAGES
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="latest-articles-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        from chatbot.news_client import get_news_client
+
+        client = get_news_client()
+        for lang in self.langs:
+            try:
+                items = []
+                for page in range(LATEST_POLL_PAGES):
+                    news = client.fetch_news(lang, page * LATEST_PAGE_SIZE, LATEST_PAGE_SIZE, use_cache=False)
+                    items.extend(news)
+                    if len(news) < LATEST_PAGE_SIZE:
+                        break
+                self.index.add_items(lang, items)
+            except Exception as e:
+                print(f"Latest articles poll failed for {lang}: {e}")
+
+    def _run(self):
+        for lang in self.langs:
+            try:
+                self.index.seed_from_catalog(lang)
+            except Exception as e:
+                print(f"Could not seed latest articles for {lang} from the catalog: {e}")
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+
+_index = LatestArticlesIndex()
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_latest_index() -> LatestArticlesIndex:
+    """
+    Return the process-wide latest articles index.
+    """
+    return _index
+
+
+def start_latest_poller():
+    """
+    Start the background poller once per process, unless disabled with LATEST_POLLER_ENABLED=false.
+    """
+    global _poller
+    if not LATEST_POLLER_ENABLED:
+        print("Latest articles poller disabled")
+        return None
+    with _poller_lock:
+        if _poller is None:
+            _poller = LatestArticlesPoller(_index)
+        _poller.start()
+        return _poller
+
+
+def stop_latest_poller():
+    if _poller is not None:
+        _poller.stop()
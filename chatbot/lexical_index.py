@@ -0,0 +1,286 @@
+import hashlib, json, os, sqlite3, sys, threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from config import data_path
+from chatbot.preprocessing import tokenize
+from chatbot.vector_store import matches_filter
+
+load_dotenv()
+
+LEXICAL_INDEX_DIR = os.getenv("LEXICAL_INDEX_DIR", "lexical")
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+# Seconds the vector search gets before lexical results are returned on their own
+HYBRID_VECTOR_TIMEOUT = float(os.getenv("HYBRID_VECTOR_TIMEOUT", "3"))
+# Standard reciprocal rank fusion constant
+RRF_K = 60
+
+##############################################[BM25 INDEX]###########################################################
+
+
+def _query_terms(text: str) -> list:
+    terms = [token for token in tokenize(text) if len(token) > 1 and token not in ENGLISH_STOP_WORDS]
+    try:
+        # Stored chunks are usually lemmatized, so the lemmas are searched as well
+        from chatbot.preprocessing import preprocess_text
+        terms += [token for token in preprocess_text(text).split() if token not in ENGLISH_STOP_WORDS]
+    except Exception:
+        pass
+    return list(dict.fromkeys(terms))
+
+
+class LexicalIndex:
+    """
+    BM25 index over the chunks of one vector index, in a SQLite FTS5 table.
+
+    Chunk text is tokenized with the same Latin/Devanagari/Bengali tokenizer used for
+    preprocessing and stored space-separated under FTS5's "ascii" tokenizer, which keeps
+    non-ASCII characters inside tokens, so Hindi and Bengali words (with their vowel signs)
+    stay whole. Filterable metadata is stored next to each chunk.
+
+    FTS5 tables can't hold a unique constraint, so the `chunk_keys` table maps a hash of each
+    chunk's (source, text) to its row; re-indexing a chunk (re-ingestion, backfill or migration
+    re-runs) replaces the row instead of adding a duplicate.
+    """
+
+    def __init__(self, index_name: str, db_path: str = None):
+        self.index_name = index_name
+        if db_path is None:
+            os.makedirs(data_path(LEXICAL_INDEX_DIR), exist_ok=True)
+            db_path = data_path(os.path.join(LEXICAL_INDEX_DIR, f"{index_name}.db"))
+        self.db_path = db_path
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5("
+                "terms, text UNINDEXED, source UNINDEXED, metadata UNINDEXED, tokenize='ascii')"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS chunk_keys (key TEXT PRIMARY KEY, chunk_id INTEGER NOT NULL)")
+            self._key_existing_chunks()
+
+    def _key_existing_chunks(self):
+        """
+        Key the chunks of an index created before `chunk_keys` existed, keeping the latest copy
+        of each duplicated chunk.
+        """
+        if self._conn.execute("SELECT 1 FROM chunk_keys LIMIT 1").fetchone():
+            return
+        latest = {}
+        for chunk_id, source, text in self._conn.execute("SELECT rowid, source, text FROM chunks ORDER BY rowid"):
+            latest[_chunk_hash(source, text)] = chunk_id
+        if not latest:
+            return
+        keep = set(latest.values())
+        stale = [(chunk_id,) for (chunk_id,) in self._conn.execute("SELECT rowid FROM chunks") if chunk_id not in keep]
+        self._conn.executemany("DELETE FROM chunks WHERE rowid = ?", stale)
+        self._conn.executemany("INSERT INTO chunk_keys (key, chunk_id) VALUES (?, ?)", latest.items())
+        print(f"Keyed {len(latest)} chunks of the lexical index '{self.index_name}', dropped {len(stale)} duplicates")
+
+    def add_documents(self, docs) -> int:
+        """
+        Index document chunks, replacing chunks already indexed with the same source and text.
+
+        Returns:
+            int: Number of chunks indexed.
+        """
+        rows = [
+            (_chunk_hash(doc.metadata.get("source"), doc.page_content), " ".join(tokenize(doc.page_content)),
+             doc.page_content, doc.metadata.get("source"), json.dumps(doc.metadata, ensure_ascii=False))
+            for doc in docs if doc.page_content
+        ]
+        with self._lock, self._conn:
+            for key, terms, text, source, metadata in rows:
+                previous = self._conn.execute("SELECT chunk_id FROM chunk_keys WHERE key = ?", (key,)).fetchone()
+                if previous:
+                    self._conn.execute("DELETE FROM chunks WHERE rowid = ?", previous)
+                chunk_id = self._conn.execute(
+                    "INSERT INTO chunks (terms, text, source, metadata) VALUES (?, ?, ?, ?)", (terms, text, source, metadata)
+                ).lastrowid
+                self._conn.execute("INSERT OR REPLACE INTO chunk_keys (key, chunk_id) VALUES (?, ?)", (key, chunk_id))
+        return len(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def search(self, query: str, k: int = 5, filter: dict = None) -> list:
+        """
+        Top-k chunks for a query by BM25.
+
+        Args:
+            query (str): Query text.
+            k (int): Number of chunks.
+            filter (dict, optional): Pinecone-style metadata filter. Chunks that lack the filtered
+                fields (ingested before metadata was recorded) are kept, as in the vector search.
+
+        Returns:
+            list: Document objects, best first.
+        """
+        from langchain_core.documents import Document
+
+        terms = _query_terms(query)
+        if not terms:
+            return []
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        # Over-fetch when filtering, since the filter is applied after ranking
+        limit = k * 10 if filter else k
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT text, metadata FROM chunks WHERE chunks MATCH ? ORDER BY bm25(chunks) LIMIT ?", (match, limit)
+            ).fetchall()
+        fields = _filter_fields(filter) if filter else set()
+        docs = []
+        for text, metadata_json in rows:
+            metadata = json.loads(metadata_json)
+            metadata.pop("text", None)
+            if filter and fields & metadata.keys() and not matches_filter(metadata, filter):
+                continue
+            docs.append(Document(page_content=text, metadata=metadata))
+            if len(docs) == k:
+                break
+        return docs
+
+
+def _chunk_hash(source, text: str) -> str:
+    return hashlib.sha1(f"{source or ''}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _filter_fields(metadata_filter: dict) -> set:
+    fields = set()
+    for key, condition in metadata_filter.items():
+        if key in ("$and", "$or"):
+            for part in condition:
+                fields |= _filter_fields(part)
+        else:
+            fields.add(key)
+    return fields
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(index_name: str) -> LexicalIndex:
+    """
+    Return the process-wide lexical index of a vector index.
+    """
+    with _indexes_lock:
+        if index_name not in _indexes:
+            _indexes[index_name] = LexicalIndex(index_name)
+        return _indexes[index_name]
+
+
+def index_chunks(index_name: str, docs) -> int:
+    """
+    Ingestion hook: add chunks to the lexical index of `index_name`. Failures are logged and
+    never interrupt ingestion.
+    """
+    if not HYBRID_SEARCH_ENABLED or not index_name or not docs:
+        return 0
+    try:
+        return get_lexical_index(index_name).add_documents(docs)
+    except Exception as e:
+        print(f"Failed to add {len(docs)} chunks to the lexical index of '{index_name}': {e}")
+        return 0
+
+
+##############################################[HYBRID SEARCH]###########################################################
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vector-search")
+
+
+def _doc_key(doc) -> tuple:
+    return doc.metadata.get("source"), doc.page_content
+
+
+def reciprocal_rank_fusion(result_lists: list, k: int = RRF_K) -> list:
+    """
+    Merge ranked document lists: each document scores sum(1 / (k + rank)) over the lists it
+    appears in. Documents are identified by (source, text).
+
+    Returns:
+        list: Documents, best first.
+    """
+    scores, docs = {}, {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            docs.setdefault(key, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+def hybrid_search(vector_search, index_name: str, query: str, k: int = 5, metadata_filter: dict = None,
+                  timeout: float = HYBRID_VECTOR_TIMEOUT) -> list:
+    """
+    Dense and BM25 retrieval fused with reciprocal rank fusion.
+
+    Args:
+        vector_search (callable): `vector_search(query, k, metadata_filter)` returning Documents.
+        index_name (str): Vector index name; selects the lexical index.
+        query (str): Query text.
+        k (int): Number of chunks to return.
+        metadata_filter (dict, optional): Pinecone-style metadata filter applied to both searches.
+        timeout (float): Seconds to wait for the vector search when lexical results are available.
+
+    Returns:
+        list: Document objects, best first.
+    """
+    if not HYBRID_SEARCH_ENABLED or not index_name:
+        return vector_search(query, k, metadata_filter)
+    future = _executor.submit(vector_search, query, k, metadata_filter)
+    try:
+        lexical = get_lexical_index(index_name).search(query, k=k, filter=metadata_filter)
+    except Exception as e:
+        print(f"Lexical search failed for '{index_name}': {e}")
+        lexical = []
+    if not lexical:
+        return future.result()
+    try:
+        dense = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        print(f"Vector search on '{index_name}' exceeded {timeout}s, answering from the lexical index")
+        return lexical
+    except Exception as e:
+        print(f"Vector search on '{index_name}' failed, answering from the lexical index: {e}")
+        return lexical
+    return reciprocal_rank_fusion([dense, lexical])[:k]
+
+
+##############################################[BACKFILL]###########################################################
+
+
+def backfill_from_pinecone(index_name: str, batch_size: int = 100, namespace: str = None) -> int:
+    """
+    Index the chunks already stored in a Pinecone index or namespace (page content under
+    "text"), for indexes populated before the lexical index existed. Run once per partition.
+
+    Returns:
+        int: Number of chunks indexed.
+    """
+    from langchain_core.documents import Document
+    from pinecone import Pinecone as PineconeClient
+    from chatbot.vector_store import partition_name
+
+    index = PineconeClient(api_key=os.getenv("PINECONE_API_KEY")).Index(index_name)
+    partition = partition_name(index_name, namespace)
+    lexical = get_lexical_index(partition)
+    total = 0
+    for ids in index.list(limit=batch_size, namespace=namespace):
+        vectors = index.fetch(ids=list(ids), namespace=namespace).vectors
+        docs = []
+        for vector in vectors.values():
+            metadata = dict(vector.metadata or {})
+            text = metadata.pop("text", "")
+            docs.append(Document(page_content=text, metadata=metadata))
+        total += lexical.add_documents(docs)
+        print(f"Indexed {total} chunks of '{partition}'")
+    return total
+
+
+if __name__ == "__main__":
+    # python -m chatbot.lexical_index <pinecone index name>[.<namespace>] [...]
+    for name in sys.argv[1:]:
+        index_name, _, namespace = name.partition(".")
+        print(f"{name}: {backfill_from_pinecone(index_name, namespace=namespace or None)} chunks indexed")
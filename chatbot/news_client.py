@@ -0,0 +1,159 @@
+import os, threading, time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dotenv import load_dotenv
+import http_client
+from chatbot.sites import get_site
+
+load_dotenv()
+
+# Responses younger than this are served from cache without touching the API
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "60"))
+# Up to this age a cached response is still served while a refresh runs in the background
+NEWS_STALE_TTL = float(os.getenv("NEWS_STALE_TTL", "900"))
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "256"))
+
+##############################################[BOOM NEWS CLIENT]###########################################################
+
+
+class BoomNewsClient:
+    """
+    Client for the BOOM `/dev/h-api/news` feed of each language site.
+
+    Responses are cached per (lang, params) for NEWS_CACHE_TTL seconds. Concurrent identical
+    requests are coalesced into one upstream call (single-flight), and entries past their TTL
+    but within NEWS_STALE_TTL are returned immediately while one background refresh runs
+    (stale-while-revalidate). A burst of identical requests therefore costs at most one call.
+    """
+
+    def __init__(self, ttl: float = NEWS_CACHE_TTL, stale_ttl: float = NEWS_STALE_TTL,
+                 max_entries: int = NEWS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # key -> (fetched_at, news)
+        self._in_flight = {}  # key -> Future
+        self._lock = threading.Lock()
+
+    def fetch_news(self, lang: str = "en", start_index: int = None, count: int = None,
+                   from_date: str = None, to_date: str = None, use_cache: bool = True) -> list:
+        """
+        Return the `news` items of one feed page.
+
+        Args:
+            lang (str): Language code of the site.
+            start_index (int, optional): Offset into the feed. The API default when omitted.
+            count (int, optional): Page size. The API default when omitted.
+            from_date (str, optional): Start date in 'YYYY-MM-DD' format.
+            to_date (str, optional): End date in 'YYYY-MM-DD' format.
+            use_cache (bool): Set to False for bulk reads (e.g. catalog syncs) that should neither
+                be served from nor fill the cache.
+
+        Returns:
+            list: News item dicts (url, heading, description, story, date_news, ...).
+
+        Raises:
+            requests.exceptions.RequestException: If the API call fails and nothing usable is cached.
+        """
+        key = (lang, start_index, count, from_date, to_date)
+        if not use_cache:
+            return self._request(*key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                age = now - entry[0]
+                if age < self.ttl:
+                    self._cache.move_to_end(key)
+                    return list(entry[1])
+                if age < self.stale_ttl:
+                    self._cache.move_to_end(key)
+                    self._start_refresh(key)
+                    return list(entry[1])
+        return list(self._load(key))
+
+    def invalidate(self, lang: str = None):
+        """
+        Drop cached responses, for one language or all of them.
+        """
+        with self._lock:
+            for key in [key for key in self._cache if lang is None or key[0] == lang]:
+                del self._cache[key]
+
+    def _load(self, key) -> list:
+        """
+        Fetch `key` from the API, or wait for the call already in flight for it.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            news = self._request(*key)
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._cache[key] = (time.monotonic(), news)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._in_flight.pop(key, None)
+        future.set_result(news)
+        return news
+
+    def _start_refresh(self, key):
+        # Called with the lock held; a refresh already in flight is left alone
+        if key in self._in_flight:
+            return
+        threading.Thread(target=self._refresh, args=(key,), name="news-refresh", daemon=True).start()
+
+    def _refresh(self, key):
+        try:
+            self._load(key)
+        except Exception as e:
+            # Keep serving the stale entry until it expires
+            print(f"Background refresh of news feed {key} failed: {e}")
+
+    def _request(self, lang, start_index, count, from_date, to_date) -> list:
+        site = get_site(lang)
+        params = {}
+        if start_index is not None:
+            params["startIndex"] = start_index
+        if count is not None:
+            params["count"] = count
+        if from_date:
+            params["fromDate"] = from_date
+        if to_date:
+            params["toDate"] = to_date
+        headers = {
+            "accept": "*/*",
+            "s-id": site["s_id"]
+        }
+        api_url = f"{site['api_origin']}/dev/h-api/news"
+        print(f"Fetching articles from API: {api_url} {params}")
+        response = http_client.get(api_url, headers=headers, params=params)
+        response.raise_for_status()
+        return response.json().get("news") or []
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_news_client() -> BoomNewsClient:
+    """
+    Return the process-wide BOOM news client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BoomNewsClient()
+        return _client
@@ -0,0 +1,231 @@
+import datetime, os, re, sys, threading, time, unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LEMMA_CACHE_SIZE = int(os.getenv("LEMMA_CACHE_SIZE", "200000"))
+# Batches smaller than this are processed in-process; process start-up isn't worth it below that
+PREPROCESS_PARALLEL_MIN_DOCS = int(os.getenv("PREPROCESS_PARALLEL_MIN_DOCS", "500"))
+PREPROCESS_WORKERS = int(os.getenv("PREPROCESS_WORKERS", str(os.cpu_count() or 1)))
+
+_URLS = re.compile(r'https?://\S+|www\.\S+')
+_HTML_TAGS = re.compile(r'<.*?>')
+# Latin words, plus Devanagari (Hindi) and Bengali words without their digits and danda punctuation.
+# Zero-width (non-)joiners are kept inside Indic words since they change how conjuncts render.
+_TOKENS = re.compile(
+    r"[a-z]+"
+    r"|[\u0900-\u0963\u0971-\u097F\u200C\u200D]+"
+    r"|[\u0980-\u09E5\u09F0-\u09FF\u200C\u200D]+"
+)
+_LATIN = re.compile(r"[a-z]+")
+
+##############################################[NLTK RESOURCES]###########################################################
+
+_nltk_lock = threading.Lock()
+_lemmatizer = None
+_stop_words = None
+
+
+def _load_nltk():
+    """
+    Load the lemmatizer and stopword list once per process, downloading the corpora only if missing.
+    """
+    global _lemmatizer, _stop_words
+    if _lemmatizer is not None:
+        return
+    with _nltk_lock:
+        if _lemmatizer is not None:
+            return
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+
+        for resource, path in (("stopwords", "corpora/stopwords"), ("wordnet", "corpora/wordnet")):
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                nltk.download(resource)
+        stop_words = set(stopwords.words('english'))
+        lemmatizer = WordNetLemmatizer()
+        _stop_words = stop_words
+        _lemmatizer = lemmatizer
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(token: str) -> str:
+    """
+    Memoized WordNet lemma of an English token (e.g. "richest" -> "rich").
+    """
+    return _lemmatizer.lemmatize(token)
+
+
+##############################################[PREPROCESSING]###########################################################
+
+
+def tokenize(text: str) -> list:
+    """
+    Lowercase, strip URLs and HTML tags, and split into Latin, Devanagari and Bengali word tokens.
+    Numbers and punctuation are dropped, as before.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = _URLS.sub('', text)
+    text = _HTML_TAGS.sub('', text)
+    return _TOKENS.findall(text.lower())
+
+
+def preprocess_text(text: str) -> str:
+    """
+    Clean a text for storage: tokenize, drop English stopwords and lemmatize English words.
+
+    Hindi and Bengali tokens are kept as they are (NFC-normalised); stopword removal and
+    lemmatization only apply to Latin-script tokens.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: Space-joined processed tokens.
+    """
+    _load_nltk()
+    stop_words = _stop_words
+    processed = []
+    for token in tokenize(text):
+        if _LATIN.fullmatch(token):
+            if token in stop_words:
+                continue
+            token = lemmatize(token)
+        processed.append(token)
+    return ' '.join(processed)
+
+
+def preprocess_texts(texts: list, workers: int = None) -> list:
+    """
+    Preprocess many texts, spreading large batches (backfills) across a process pool.
+
+    Args:
+        texts (list): Raw texts.
+        workers (int, optional): Number of worker processes. Defaults to PREPROCESS_WORKERS.
+
+    Returns:
+        list: Processed texts in the same order.
+    """
+    workers = workers or PREPROCESS_WORKERS
+    if len(texts) < PREPROCESS_PARALLEL_MIN_DOCS or workers <= 1:
+        return [preprocess_text(text) for text in texts]
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(preprocess_text, texts, chunksize=chunksize))
+
+
+def preprocess_document_batch(docs: list, workers: int = None) -> list:
+    """
+    Preprocess LangChain Documents, adding the preprocessing metadata.
+
+    Args:
+        docs (list): Document objects.
+        workers (int, optional): Number of worker processes for large batches.
+
+    Returns:
+        list: New Document objects with processed content.
+    """
+    from langchain.schema import Document
+
+    processed = preprocess_texts([doc.page_content for doc in docs], workers=workers)
+    processed_date = datetime.datetime.now().isoformat()
+    preprocessed_docs = []
+    for doc, content in zip(docs, processed):
+        metadata = doc.metadata.copy()
+        metadata["preprocessed"] = True
+        metadata["processed_date"] = processed_date
+        metadata["original_length"] = len(doc.page_content)
+        metadata["processed_length"] = len(content)
+        preprocessed_docs.append(Document(page_content=content, metadata=metadata))
+    return preprocessed_docs
+
+
+def legacy_preprocess_text(text: str) -> str:
+    """
+    The per-call preprocessing used before this module existed, kept for benchmarking.
+    """
+    import nltk
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+
+    try:
+        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('corpora/stopwords')
+        nltk.data.find('corpora/wordnet')
+    except LookupError:
+        nltk.download('punkt')
+        nltk.download('stopwords')
+        nltk.download('wordnet')
+    lemmatizer = WordNetLemmatizer()
+    stop_words = set(stopwords.words('english'))
+
+    content = re.sub(r'https?://\S+|www\.\S+', '', text)
+    content = re.sub(r'<.*?>', '', content)
+    content = re.sub(r'[^a-zA-Z\s]', '', content)
+    content = ' '.join(content.split())
+    tokens = word_tokenize(content.lower())
+    return ' '.join(lemmatizer.lemmatize(token) for token in tokens if token not in stop_words)
+
+
+##############################################[BENCHMARK]###########################################################
+
+
+def benchmark(corpus_dir: str, workers: int = None):
+    """
+    Compare tokens/sec of the legacy and current preprocessing on a directory of .txt or .html files.
+    """
+    texts = []
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        if name.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                texts.append(f.read())
+        elif name.endswith((".html", ".htm")):
+            from chatbot.extraction import extract_article_text
+            with open(path, "rb") as f:
+                texts.append(extract_article_text(f.read()))
+    if not texts:
+        print(f"No .txt or .html files found in {corpus_dir}")
+        return
+
+    tokens = sum(len(text.split()) for text in texts)
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_preprocess_text(text)
+    legacy_time = time.perf_counter() - start
+
+    _load_nltk()
+    lemmatize.cache_clear()
+    start = time.perf_counter()
+    preprocess_texts(texts, workers=1)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preprocess_texts(texts, workers=1)
+    warm_time = time.perf_counter() - start
+
+    print(f"Documents:             {len(texts)} ({tokens} whitespace tokens)")
+    print(f"Legacy:                {tokens / legacy_time:,.0f} tokens/sec")
+    print(f"Current (cold cache):  {tokens / serial_time:,.0f} tokens/sec")
+    print(f"Current (warm cache):  {tokens / warm_time:,.0f} tokens/sec")
+    if workers and workers > 1:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(preprocess_text, texts, chunksize=max(1, len(texts) // (workers * 4))))
+        pool_time = time.perf_counter() - start
+        print(f"Current ({workers} processes): {tokens / pool_time:,.0f} tokens/sec")
+
+
+if __name__ == "__main__":
+    # python -m chatbot.preprocessing bench <corpus_dir> [workers]
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "bench":
+        benchmark(sys.argv[2], int(sys.argv[3]) if len(sys.argv) == 4 else None)
+    else:
+        print("Usage: python -m chatbot.preprocessing bench <corpus_dir> [workers]")
@@ -0,0 +1,165 @@
+import hashlib, os, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RERANKER_ENABLED = os.getenv("RERANKER_ENABLED", "false").lower() == "true"
+# Multilingual MiniLM cross-encoder, so Hindi and Bengali queries are scored as well as English ones
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+# Time allowed for scoring; past it the chunks keep their retrieval order
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "400"))
+# Chunks kept for synthesis after reranking
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "6"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
+# Characters of each chunk given to the model; MiniLM reads at most 512 tokens anyway
+RERANK_MAX_CHARS = 1200
+
+##############################################[CROSS-ENCODER RERANKER]###########################################################
+
+
+def _hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunk_id(doc) -> str:
+    """
+    Stable id of a retrieved chunk: a hash of its source URL and text.
+    """
+    return _hash(f"{doc.metadata.get('source', '')}\n{doc.page_content}")
+
+
+class CrossEncoderReranker:
+    """
+    Reorders retrieved chunks with a small cross-encoder running on CPU.
+
+    All (query, chunk) pairs of a request are scored in one batched forward pass. Scores are
+    cached by (query hash, chunk id), so a repeated query only scores chunks it has not seen.
+    Scoring runs on a worker thread with a latency budget: when the budget is exceeded the
+    chunks keep their retrieval order, and the scores still land in the cache when the pass
+    finishes. A pass still queued when its budget runs out is cancelled, and no new pass is
+    queued while the worker is busy, so slow scoring can't build up a backlog.
+    """
+
+    def __init__(self, model_name: str = RERANKER_MODEL, budget_ms: float = RERANK_BUDGET_MS,
+                 cache_size: int = RERANK_CACHE_SIZE):
+        self.model_name = model_name
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._cache = OrderedDict()  # (query hash, chunk id) -> score
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+        self._in_flight = 0  # scoring passes submitted and not finished
+        self._in_flight_lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device="cpu", max_length=512)
+        return self._model
+
+    def warm_up(self):
+        """
+        Load the model in the background so the first request doesn't pay for it.
+        """
+        self._executor.submit(self._get_model)
+
+    def _score(self, query: str, query_hash: str, docs: list):
+        pairs = [(query, doc.page_content[:RERANK_MAX_CHARS]) for doc in docs]
+        scores = self._get_model().predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        with self._cache_lock:
+            for doc, score in zip(docs, scores):
+                self._cache[(query_hash, chunk_id(doc))] = float(score)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _submit(self, query: str, query_hash: str, docs: list):
+        """
+        Queue a scoring pass, or return None if one is already queued or running.
+        """
+        with self._in_flight_lock:
+            if self._in_flight:
+                return None
+            self._in_flight += 1
+        future = self._executor.submit(self._score, query, query_hash, docs)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def rerank(self, query: str, docs: list, top_n: int = RERANK_TOP_N) -> list:
+        """
+        Order chunks by cross-encoder relevance to the query and keep the best `top_n`.
+
+        Args:
+            query (str): User query.
+            docs (list): Retrieved Documents, in retrieval order.
+            top_n (int): Number of chunks to keep.
+
+        Returns:
+            list: The `top_n` best Documents, or the first `top_n` in retrieval order if scoring
+            didn't finish in budget.
+        """
+        if len(docs) <= 1:
+            return docs
+        started = time.perf_counter()
+        query_hash = _hash(query)
+        with self._cache_lock:
+            scores = {chunk_id(doc): self._cache.get((query_hash, chunk_id(doc))) for doc in docs}
+        missing = [doc for doc in docs if scores[chunk_id(doc)] is None]
+        if missing:
+            future = self._submit(query, query_hash, missing)
+            if future is None:
+                print("Reranker busy, keeping retrieval order")
+                return docs[:top_n]
+            try:
+                future.result(timeout=self.budget_ms / 1000)
+            except FutureTimeoutError:
+                future.cancel()
+                print(f"Reranking {len(missing)} chunks exceeded {self.budget_ms:.0f} ms, keeping retrieval order")
+                return docs[:top_n]
+            except Exception as e:
+                print(f"Reranking failed, keeping retrieval order: {e}")
+                return docs[:top_n]
+            with self._cache_lock:
+                scores = {chunk_id(doc): self._cache.get((query_hash, chunk_id(doc))) for doc in docs}
+
+        # sorted() is stable, so equal scores keep their retrieval order
+        ranked = sorted(docs, key=lambda doc: float("-inf") if scores[chunk_id(doc)] is None else scores[chunk_id(doc)],
+                        reverse=True)
+        print(f"Reranked {len(docs)} chunks ({len(missing)} scored) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return ranked[:top_n]
+
+
+_reranker = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """
+    Return the process-wide reranker, or None when RERANKER_ENABLED is not set.
+    """
+    global _reranker
+    if not RERANKER_ENABLED:
+        return None
+    with _reranker_lock:
+        if _reranker is None:
+            _reranker = CrossEncoderReranker()
+        return _reranker
+
+
+def rerank(query: str, docs: list, top_n: int = RERANK_TOP_N) -> list:
+    """
+    Rerank retrieved chunks if the reranker is enabled; otherwise return them unchanged.
+    """
+    reranker = get_reranker()
+    if reranker is None:
+        return docs
+    return reranker.rerank(query, docs, top_n)
@@ -136,8 +136,10 @@ from pydantic import BaseModel
 from langchain_core.messages import HumanMessage, AIMessageChunk, AIMessage
 from chatbot.bot import Chatbot
 from chatbot.utils import extract_sources_and_result, prioritize_sources, clean_response
+from chatbot.reranker import get_reranker
 from chatbot.tools import fetch_questions_on_latest_articles_in_Boomlive, fetch_articles_based_on_articletype, fetch_articles_based_on_articletype_and_language,fetch_recent_articles
-from chatbot.vectorstore import StoreCustomRangeArticles, StoreDailyArticles, StoreMultilingualCustomRangeArticles, StoreMultilingualDailyArticles
+from chatbot.suggested_questions import get_suggested_questions
+from chatbot.vectorstore import StoreCustomRangeArticles, StoreDailyArticles, StoreMultilingualCustomRangeArticles, StoreMultilingualDailyArticles, StoreAllLanguagesArticles
 from fastapi.responses import StreamingResponse
 from datetime import datetime
 # Initialize router
@@ -160,12 +162,35 @@ async def api_overview():
             "GET /query": "Query the chatbot with a question (requires 'question' and 'thread_id' parameters).",
             "POST /store_articles": "Store articles for a custom date range (requires 'from_date' and 'to_date' in the body).",
             "POST /store_daily_articles": "Store articles for the current day.",
+            "GET /store-daily-articles-all": "Store English, Hindi and Bengali articles concurrently in one run.",
             "GET /generate_questions": "Fetch latest articles and generate questions from Boomlive.",
             "GET /fetch_articles": "Fetch articles of specific article type (requires 'articleType' parameter)."
         }
     }
 
 
+@chatbot_router.get("/store-daily-articles-all")
+async def store_daily_articles_all_languages(
+    langs: Optional[str] = Query(None, description="Comma-separated language codes, e.g. 'en,hi,bn'. Defaults to all"),
+    from_date: Optional[str] = Query(None, description="Start date in 'YYYY-MM-DD' format"),
+    to_date: Optional[str] = Query(None, description="End date in 'YYYY-MM-DD' format")
+):
+    """
+    Endpoint to store English, Hindi and Bengali articles concurrently in one run.
+    Without dates, the last 15 days are stored.
+    """
+    for value, name in ((from_date, "from_date"), (to_date, "to_date")):
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return {"status": "error", "message": f"Invalid {name} format. Use YYYY-MM-DD."}
+
+    lang_list = [lang.strip() for lang in langs.split(",") if lang.strip()] if langs else None
+    article_storer = StoreAllLanguagesArticles()
+    result = await article_storer.invoke(from_date=from_date, to_date=to_date, langs=lang_list)
+    return result
+
 @chatbot_router.get("/store-daily-articles/{lang}")
 async def store_daily_articles(lang: str):
     """
@@ -403,9 +428,13 @@ async def stream_query_bot(question: str, thread_id: str):
 
             
             elif sources:
-                unique_sources = list(set(sources))  
+                unique_sources = list(dict.fromkeys(sources))
 
-                prioritized_sources  = prioritize_sources(question,unique_sources,response_collected)
+                # Reranked sources are already in relevance order; otherwise fall back to the TF-IDF pass
+                if get_reranker() is not None:
+                    prioritized_sources = unique_sources
+                else:
+                    prioritized_sources  = prioritize_sources(question,unique_sources,response_collected)
                 print("%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%")
                 print("QUESTION", question)
                 print("%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%")
@@ -446,7 +475,7 @@ async def query_bot(
         response = workflow.invoke(input_data, config={"configurable": {"thread_id": thread_id}})
         result = response['messages'][-1].content
         result, raw_sources = extract_sources_and_result(result)
-        sources = prioritize_sources(question, raw_sources, result)
+        sources = list(dict.fromkeys(raw_sources)) if get_reranker() is not None else prioritize_sources(question, raw_sources, result)
         
         if not result:
             result = "No response generated. Please try again."
@@ -479,10 +508,11 @@ async def store_daily_articles():
 @chatbot_router.get("/generate_questions")
 async def generate_questions(language: str = Query("en", description="Language code for filtering articles")):
     try:
-        results = fetch_questions_on_latest_articles_in_Boomlive(language)
+        # Precomputed in the background per new fact-check article; see chatbot/suggested_questions.py
+        results = get_suggested_questions(language)
         return results
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return {"error": f"An error occurred: {str(e)}"}
     
 
 @chatbot_router.get("/fetch_articles")
@@ -510,14 +540,16 @@ async def fetch_articles(
     
 
 
-from chatbot.utils import query_pinecone
+from chatbot.utils import query_pinecone, query_pinecone_batch
+from chatbot.index_layout import validate_partition
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class QueryItem(BaseModel):
     query: str
     index_name: str  # Add index_name to allow dynamic querying
     top_k: Optional[int] = 5
+    namespace: Optional[str] = None  # Language namespace when INDEX_LAYOUT=namespaced
 
 
 @chatbot_router.post("/query_pinecone")
@@ -526,7 +558,12 @@ async def query_index(query_item: QueryItem):
     Query the Pinecone index with the given query text and specified index name.
     """
     try:
-        results = await query_pinecone(query_item.query, query_item.index_name, top_k=query_item.top_k)
+        validate_partition(query_item.index_name, query_item.namespace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        results = await query_pinecone(query_item.query, query_item.index_name, top_k=query_item.top_k,
+                                       namespace=query_item.namespace)
         
         # Format results for response
         formatted_results = [
@@ -543,6 +580,56 @@ async def query_index(query_item: QueryItem):
         raise HTTPException(status_code=500, detail=f"Error querying index: {str(e)}")
     
       
+# Queries accepted by one /query_pinecone/batch request
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "500"))
+
+
+class BatchQueryItem(BaseModel):
+    queries: List[str]
+    index_name: str
+    top_k: Optional[int] = 5
+    namespace: Optional[str] = None
+
+
+@chatbot_router.post("/query_pinecone/batch")
+async def query_index_batch(batch_item: BatchQueryItem):
+    """
+    Query an index with many queries in one request. The queries are embedded together and
+    searched concurrently; results come back in query order.
+    """
+    if not batch_item.queries:
+        raise HTTPException(status_code=400, detail="No queries given")
+    if len(batch_item.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUERIES} queries per request")
+    try:
+        validate_partition(batch_item.index_name, batch_item.namespace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        results = await query_pinecone_batch(batch_item.queries, batch_item.index_name, top_k=batch_item.top_k,
+                                             namespace=batch_item.namespace)
+        return {
+            "success": True,
+            "results": [
+                {
+                    "query": query,
+                    "matches": [
+                        {
+                            "source": doc.metadata.get("source", "Unknown"),
+                            "content": doc.page_content,
+                            "score": score,
+                            "metadata": doc.metadata
+                        }
+                        for doc, score in matches
+                    ]
+                }
+                for query, matches in zip(batch_item.queries, results)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error querying index: {str(e)}")
+
+
 class ProcessResponse(BaseModel):
     success: bool
     message: str
@@ -551,9 +638,10 @@ from pydantic import BaseModel
 class UrlItem(BaseModel):
     url: str
     lang: str
-    index_name: str
+    index_name: Optional[str] = None  # Defaults to the language's partition in the index layout
 
 from chatbot.utils import process_and_upload_single_url
+from chatbot.index_layout import resolve_write_partition
 from fastapi import  BackgroundTasks
 
 # Route for processing a single URL
@@ -563,6 +651,10 @@ async def process_url(url_item: UrlItem, background_tasks: BackgroundTasks):
     Process and upload a single URL to the Pinecone index.
     All parameters (URL, language, and index name) are passed in the request body.
     """
+    try:
+        resolve_write_partition(url_item.lang, url_item.index_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         # Add the task to background tasks
         background_tasks.add_task(
@@ -571,3 +663,44 @@ async def process_url(url_item: UrlItem, background_tasks: BackgroundTasks):
         return {"success": True, "message": f"URL processing started for: {url_item.url}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing URL: {str(e)}")
+
+
+import queue
+from chatbot.url_queue import get_url_queue, URL_QUEUE_MAX_URLS
+
+class UrlBatchItem(BaseModel):
+    urls: List[str]
+    lang: str
+    index_name: Optional[str] = None  # Defaults to the language's partition in the index layout
+    force: Optional[bool] = False  # Re-ingest URLs that were already ingested
+
+# Route for ingesting a list of URLs through the ingestion queue
+@chatbot_router.post("/process-urls")
+async def process_urls(batch_item: UrlBatchItem):
+    """
+    Queue a list of URLs for ingestion. Duplicates are skipped, pages are fetched concurrently,
+    and chunks are embedded and upserted in batches. Returns the job with a status per URL;
+    poll /process-urls/{job_id} for progress.
+    """
+    if not batch_item.urls:
+        raise HTTPException(status_code=400, detail="No URLs given")
+    if len(batch_item.urls) > URL_QUEUE_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {URL_QUEUE_MAX_URLS} URLs per request")
+    try:
+        job = get_url_queue().submit(batch_item.urls, batch_item.lang, batch_item.index_name, force=batch_item.force)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except queue.Full as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"success": True, "job": job}
+
+
+@chatbot_router.get("/process-urls/{job_id}")
+async def process_urls_status(job_id: str):
+    """
+    Status of a URL ingestion job and of each of its URLs.
+    """
+    job = get_url_queue().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return {"success": True, "job": job}
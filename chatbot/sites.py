@@ -0,0 +1,47 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+##############################################[BOOM SITES]###########################################################
+# One entry per BOOM language site. Everything that used to be hardcoded per language
+# (news API origin, s-id, public base url, Pinecone index) is looked up from here.
+
+SITES = {
+    "en": {
+        "name": "English",
+        "api_origin": "https://boomlive.in",
+        "base_url": "https://www.boomlive.in",
+        "s_id": os.getenv("ENGLISH_BOOMLIVE_API_KEY", "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o"),
+        "index_name": "boom-latest-articles",
+    },
+    "hi": {
+        "name": "Hindi",
+        "api_origin": "https://hindi.boomlive.in",
+        "base_url": "https://hindi.boomlive.in",
+        "s_id": os.getenv("HINDI_BOOMLIVE_API_KEY", "A2mzzjG2Xnru2M0YC1swJq6s0MUYXVwJ4EpJOub0c2Y8Xm96d26cNrEkAyrizEBD"),
+        "index_name": "hindi-boom-articles",
+    },
+    "bn": {
+        "name": "Bengali",
+        "api_origin": "https://bangla.boomlive.in",
+        "base_url": "https://bangla.boomlive.in",
+        "s_id": os.getenv("BANGLA_BOOMLIVE_API_KEY", "xgjDMdW01R2vQpLH7lsKMb0SB5pDCKhFj7YgnNymTKvWLSgOvIWhxJgBh7153Mbf"),
+        "index_name": "bangla-boom-articles",
+    },
+}
+
+SUPPORTED_LANGUAGES = list(SITES.keys())
+
+
+def get_site(lang: str = None) -> dict:
+    """
+    Return the site configuration for a language code, defaulting to English.
+
+    Args:
+        lang (str): Language code - "en", "hi" or "bn".
+
+    Returns:
+        dict: Site configuration (name, api_origin, base_url, s_id, index_name).
+    """
+    return SITES.get(lang or "en", SITES["en"])
@@ -0,0 +1,216 @@
+import datetime, os, random, sqlite3, threading
+from dotenv import load_dotenv
+from config import data_path
+from chatbot.sites import SUPPORTED_LANGUAGES, get_site
+from chatbot.catalog import article_id_from_item
+
+load_dotenv()
+
+SUGGESTED_QUESTIONS_DB = os.getenv("SUGGESTED_QUESTIONS_DB", "suggested_questions.db")
+SUGGESTED_QUESTIONS_ENABLED = os.getenv("SUGGESTED_QUESTIONS_ENABLED", "true").lower() == "true"
+SUGGESTED_QUESTIONS_INTERVAL = float(os.getenv("SUGGESTED_QUESTIONS_INTERVAL", "300"))
+# Questions are served for this many of the newest fact-check articles (two questions each)
+SUGGESTED_QUESTIONS_ARTICLES = 10
+SUGGESTED_QUESTIONS_LIMIT = 20
+
+##############################################[SUGGESTED QUESTIONS CACHE]###########################################################
+
+
+class SuggestedQuestionsCache:
+    """
+    Suggested questions for the chat UI, generated once per fact-check article.
+
+    Questions are stored in SQLite with the article they came from. A refresh looks at the
+    newest fact-check articles of a language, asks the LLM only about articles it has not
+    seen before, and rebuilds an in-memory snapshot that the endpoint returns as is.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or data_path(SUGGESTED_QUESTIONS_DB)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._refresh_locks = {lang: threading.Lock() for lang in SUPPORTED_LANGUAGES}
+        self._snapshots = {}  # lang -> list of questions
+        self._errors = {}  # lang -> error of the last failed refresh
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggested_questions ("
+                "lang TEXT, url TEXT, article_id TEXT, position INTEGER, question TEXT, created_at TEXT, "
+                "PRIMARY KEY (lang, url, position))"
+            )
+
+    def get(self, lang: str):
+        """
+        Cached questions for a language, or None if nothing has been generated yet.
+        """
+        return self._snapshots.get(lang)
+
+    def last_error(self, lang: str):
+        """
+        Error of the last refresh of a language if it failed, else None.
+        """
+        return self._errors.get(lang)
+
+    def refresh_in_background(self, lang: str):
+        """
+        Start a refresh of a language on its own thread, unless one is already running.
+        """
+        if self._refresh_locks.setdefault(lang, threading.Lock()).locked():
+            return
+
+        def run():
+            try:
+                self.refresh(lang)
+            except Exception as e:
+                print(f"Suggested questions refresh failed for {lang}: {e}")
+
+        threading.Thread(target=run, name=f"suggested-questions-{lang}", daemon=True).start()
+
+    def refresh(self, lang: str) -> int:
+        """
+        Generate questions for new fact-check articles of a language and rebuild its snapshot.
+
+        Returns:
+            int: Number of articles questions were generated for.
+        """
+        from chatbot.news_client import get_news_client
+        from chatbot.tools import generate_questions_batch
+
+        with self._refresh_locks.setdefault(lang, threading.Lock()):
+            base_url = get_site(lang)["base_url"]
+            try:
+                news = get_news_client().fetch_news(lang)
+            except Exception as e:
+                self._errors[lang] = f"Failed to fetch articles: {e}"
+                raise
+            self._errors.pop(lang, None)
+            articles = [
+                item for item in news
+                if item.get("url") and f"{base_url}/fact-check/" in item["url"]
+            ][:SUGGESTED_QUESTIONS_ARTICLES]
+
+            known = self._known_urls(lang, [article["url"] for article in articles])
+            generated = 0
+            for article in articles:
+                if article["url"] in known:
+                    continue
+                # One article per call, so each question can be stored against its source
+                questions = generate_questions_batch([article], lang)
+                if questions:
+                    self._store(lang, article, questions)
+                    generated += 1
+
+            self._rebuild_snapshot(lang, [article["url"] for article in articles])
+            if generated:
+                print(f"Generated suggested questions for {generated} new {lang} articles")
+            return generated
+
+    def _known_urls(self, lang: str, urls: list) -> set:
+        if not urls:
+            return set()
+        placeholders = ",".join("?" * len(urls))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT url FROM suggested_questions WHERE lang = ? AND url IN ({placeholders})", [lang, *urls]
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _store(self, lang: str, article: dict, questions: list):
+        now = datetime.datetime.now().isoformat()
+        article_id = article_id_from_item(article)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO suggested_questions (lang, url, article_id, position, question, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(lang, article["url"], article_id, i, question, now) for i, question in enumerate(questions)]
+            )
+
+    def _rebuild_snapshot(self, lang: str, urls: list):
+        if not urls:
+            return
+        placeholders = ",".join("?" * len(urls))
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT question FROM suggested_questions WHERE lang = ? AND url IN ({placeholders}) ORDER BY url, position",
+                [lang, *urls]
+            ).fetchall()
+            # Articles that dropped out of the window are not needed any more
+            self._conn.execute(
+                f"DELETE FROM suggested_questions WHERE lang = ? AND url NOT IN ({placeholders})", [lang, *urls]
+            )
+        questions = [row[0] for row in rows]
+        random.shuffle(questions)
+        self._snapshots[lang] = questions[:SUGGESTED_QUESTIONS_LIMIT]
+
+
+##############################################[SUGGESTED QUESTIONS POLLER]###########################################################
+
+_cache = None
+_cache_lock = threading.Lock()
+_stop = threading.Event()
+_thread = None
+
+
+def get_suggested_questions_cache() -> SuggestedQuestionsCache:
+    """
+    Return the process-wide suggested questions cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SuggestedQuestionsCache()
+        return _cache
+
+
+def get_suggested_questions(lang: str = "en") -> dict:
+    """
+    Suggested questions for a language, served from the cache without blocking. A cold cache
+    answers with no questions and starts generating them in the background.
+
+    Returns:
+        dict: {"questions": [...]}, or {"error": ...} for an unsupported language or if the last
+            refresh could not read the feed.
+    """
+    # Checked before touching the cache, which keeps a refresh lock per language it is asked for
+    if lang not in SUPPORTED_LANGUAGES:
+        return {"error": f"Unsupported language code '{lang}'. Supported codes are {', '.join(SUPPORTED_LANGUAGES)}."}
+    cache = get_suggested_questions_cache()
+    questions = cache.get(lang)
+    if questions is None:
+        error = cache.last_error(lang)
+        cache.refresh_in_background(lang)
+        if error:
+            return {"error": error}
+        questions = []
+    return {"questions": questions}
+
+
+def _run():
+    cache = get_suggested_questions_cache()
+    while not _stop.is_set():
+        for lang in SUPPORTED_LANGUAGES:
+            try:
+                cache.refresh(lang)
+            except Exception as e:
+                print(f"Suggested questions refresh failed for {lang}: {e}")
+        _stop.wait(SUGGESTED_QUESTIONS_INTERVAL)
+
+
+def start_suggested_questions_poller():
+    """
+    Start the background refresh once per process, unless disabled with SUGGESTED_QUESTIONS_ENABLED=false.
+    """
+    global _thread
+    if not SUGGESTED_QUESTIONS_ENABLED:
+        print("Suggested questions poller disabled")
+        return
+    with _cache_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(target=_run, name="suggested-questions", daemon=True)
+        _thread.start()
+
+
+def stop_suggested_questions_poller():
+    _stop.set()
@@ -0,0 +1,88 @@
+import json, os, re
+from dotenv import load_dotenv
+from chatbot.catalog import get_article_catalog
+from chatbot.claims import assign_claim_id, claim_text
+
+load_dotenv()
+
+INGEST_SUMMARIES = os.getenv("INGEST_SUMMARIES", "true").lower() == "true"
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-4.1-mini")
+# Only the start of long articles is sent; the claim and verdict come first on BOOM pages
+SUMMARY_MAX_INPUT_CHARS = int(os.getenv("SUMMARY_MAX_INPUT_CHARS", "6000"))
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_llm = None
+
+##############################################[ARTICLE SUMMARIES]###########################################################
+
+
+def _get_llm():
+    global _llm
+    if _llm is None:
+        from langchain_openai import ChatOpenAI
+        _llm = ChatOpenAI(model_name=SUMMARY_MODEL, temperature=0)
+    return _llm
+
+
+def summarize_article(text: str, lang: str = "en") -> dict:
+    """
+    Ask the LLM for a title, a short summary and the key claims of an article.
+
+    Args:
+        text (str): Article text.
+        lang (str): Language code; the summary is written in the article's language.
+
+    Returns:
+        dict: {"title": str, "summary": str, "key_claims": list}, or None if the response can't be used.
+    """
+    from langchain_core.messages import HumanMessage
+
+    prompt = (
+        "Read the news article below and return a JSON object with exactly these keys:\n"
+        '"title": the article headline,\n'
+        '"summary": a 2-3 sentence summary including the verdict if it is a fact check,\n'
+        '"key_claims": a list of at most 3 short strings, the claims the article examines or makes.\n'
+        f"Write the values in the language with code '{lang}'. Return only the JSON object.\n\n"
+        f"Article:\n{text[:SUMMARY_MAX_INPUT_CHARS]}"
+    )
+    response = _get_llm().invoke([HumanMessage(content=prompt)])
+    try:
+        data = json.loads(_CODE_FENCE.sub("", response.content.strip()))
+    except ValueError:
+        print("Summary response was not valid JSON")
+        return None
+    if not isinstance(data, dict) or not data.get("summary"):
+        return None
+    claims = data.get("key_claims") or []
+    return {
+        "title": str(data.get("title") or "").strip(),
+        "summary": str(data["summary"]).strip(),
+        "key_claims": [str(claim).strip() for claim in claims if str(claim).strip()][:3] if isinstance(claims, list) else [],
+    }
+
+
+def summarize_and_store(url: str, text: str, lang: str = "en") -> bool:
+    """
+    Summarize an article and store the result in the article catalog, then give the article
+    its claim id (matched on the summary when there is one). Failures are logged and never
+    interrupt ingestion.
+
+    Returns:
+        bool: True if a summary was stored.
+    """
+    if not text:
+        return False
+    result = None
+    if INGEST_SUMMARIES:
+        try:
+            result = summarize_article(text, lang)
+            if result is not None:
+                get_article_catalog().set_summary(url, lang, result["title"], result["summary"], result["key_claims"])
+        except Exception as e:
+            print(f"Failed to summarize {url}: {e}")
+            result = None
+    if result is not None:
+        assign_claim_id(url, lang, claim_text(result["title"], result["summary"], result["key_claims"]))
+    else:
+        assign_claim_id(url, lang, text)
+    return result is not None
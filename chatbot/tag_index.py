@@ -0,0 +1,190 @@
+import os, threading
+from collections import OrderedDict
+from urllib.parse import unquote_plus
+from dotenv import load_dotenv
+from rapidfuzz import fuzz, process
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from chatbot.catalog import get_article_catalog
+from chatbot.preprocessing import tokenize
+
+load_dotenv()
+
+# Minimum rapidfuzz WRatio (0-100) for a known tag to count as the one the user meant
+TAG_FUZZY_CUTOFF = float(os.getenv("TAG_FUZZY_CUTOFF", "88"))
+TAG_SEARCH_CACHE_SIZE = int(os.getenv("TAG_SEARCH_CACHE_SIZE", "1024"))
+
+##############################################[TAG INDEX]###########################################################
+
+
+def normalize_tag(tag: str) -> str:
+    """
+    Canonical form of a tag or tag query: URL-decoded, lowercased, single spaces.
+    """
+    return " ".join(unquote_plus(tag or "").lower().split())
+
+
+def _terms(text: str) -> set:
+    return {token for token in tokenize(text or "") if len(token) > 1 and token not in ENGLISH_STOP_WORDS}
+
+
+class _LanguageIndex:
+    """
+    Inverted index of one language, built in one pass over the catalog and never mutated.
+    """
+
+    def __init__(self, articles: list):
+        self.articles = {}  # url -> article dict
+        self.tags = {}  # normalized tag -> set of urls
+        self.terms = {}  # title / claim term -> set of urls
+        for article in articles:
+            url = article["url"]
+            self.articles[url] = article
+            for tag in article["tags"]:
+                self.tags.setdefault(normalize_tag(tag), set()).add(url)
+                for term in _terms(tag):
+                    self.terms.setdefault(term, set()).add(url)
+            for text in [article["title"], *article["key_claims"]]:
+                for term in _terms(text):
+                    self.terms.setdefault(term, set()).add(url)
+        self.tag_names = list(self.tags)
+
+
+class TagIndex:
+    """
+    Local replacement for scraping BOOM's search page on tag queries.
+
+    Maps tags (the site's people, places and topics), title terms and stored key claims to
+    articles, per language, from the article catalog. A query first matches known tags,
+    exactly or fuzzily with rapidfuzz, then title terms; results are ranked by match score
+    and recency. Search results are memoized until the index is rebuilt.
+
+    Indexes are built off the request path, by the catalog poller thread at startup and
+    after every poll (see `refresh`); searches only read the current index.
+    """
+
+    def __init__(self):
+        self._indexes = {}  # lang -> _LanguageIndex
+        self._versions = {}  # lang -> catalog last_modified the index was built from
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, lang: str) -> int:
+        """
+        (Re)build the index of a language from the catalog.
+
+        Returns:
+            int: Number of indexed articles.
+        """
+        catalog = get_article_catalog()
+        version = catalog.last_modified(lang)
+        index = _LanguageIndex(catalog.searchable_articles(lang))
+        with self._lock:
+            self._indexes[lang] = index
+            self._versions[lang] = version
+            for key in [key for key in self._cache if key[0] == lang]:
+                del self._cache[key]
+        print(f"Tag index built for {lang}: {len(index.articles)} articles, {len(index.tags)} tags")
+        return len(index.articles)
+
+    def is_ready(self, lang: str) -> bool:
+        """
+        Whether the index of a language has any articles; when it doesn't, callers fall back to the site search.
+        """
+        index = self._indexes.get(lang)
+        return index is not None and bool(index.articles)
+
+    def search(self, query: str, lang: str = "en", article_type: str = "all", limit: int = 10) -> list:
+        """
+        Articles for a tag query, best match first.
+
+        Args:
+            query (str): Tag or short topic, e.g. "Rahul Gandhi" or "rahul%20gandhi".
+            lang (str): Language code.
+            article_type (str): First URL path segment to prefer ("fact-check", ...) or "all".
+            limit (int): Maximum number of articles.
+
+        Returns:
+            list: (title, url, summary) tuples, the same shape `extract_articles` returns.
+        """
+        key = (lang, normalize_tag(query), article_type or "all", limit)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return list(self._cache[key])
+            index = self._indexes.get(lang)
+        if index is None:
+            return []
+
+        results = self._search(index, key[1], key[2], limit)
+        with self._lock:
+            if self._indexes.get(lang) is index:
+                self._cache[key] = results
+                while len(self._cache) > TAG_SEARCH_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return list(results)
+
+    def _search(self, index: _LanguageIndex, query: str, article_type: str, limit: int) -> list:
+        scores = {}
+        if query in index.tags:
+            for url in index.tags[query]:
+                scores[url] = 100.0
+        elif index.tag_names:
+            for tag, score, _ in process.extract(query, index.tag_names, scorer=fuzz.WRatio,
+                                                 score_cutoff=TAG_FUZZY_CUTOFF, limit=5):
+                for url in index.tags[tag]:
+                    scores[url] = max(scores.get(url, 0.0), score)
+
+        query_terms = _terms(query)
+        if query_terms:
+            matched = {}
+            for term in query_terms:
+                for url in index.terms.get(term, ()):
+                    matched[url] = matched.get(url, 0) + 1
+            # Articles matching every term; a partial match only counts when nothing matches fully
+            best = max(matched.values(), default=0)
+            needed = len(query_terms) if best == len(query_terms) else max(1, (len(query_terms) + 1) // 2)
+            for url, count in matched.items():
+                if count >= needed:
+                    scores[url] = scores.get(url, 0.0) + 50.0 * count / len(query_terms)
+
+        def rank(url):
+            article = index.articles[url]
+            preferred = article_type == "all" or article["type"] == article_type.strip("/").split("/", 1)[0]
+            article_id = article["article_id"] or ""
+            return (preferred, scores[url], article["published"] or "", int(article_id) if article_id.isdigit() else 0)
+
+        results = []
+        for url in sorted(scores, key=rank, reverse=True)[:limit]:
+            article = index.articles[url]
+            summary = article["summary"] or article["description"] or "No summary available"
+            results.append((article["title"] or url, url, summary))
+        return results
+
+    def refresh(self, langs: list) -> int:
+        """
+        Rebuild the index of every language whose catalog changed since it was built. Called
+        from the catalog poller thread; the current index keeps serving while a new one is built.
+
+        Returns:
+            int: Number of languages rebuilt.
+        """
+        rebuilt = 0
+        for lang in langs:
+            try:
+                if lang in self._indexes and get_article_catalog().last_modified(lang) == self._versions.get(lang):
+                    continue
+                self.build(lang)
+                rebuilt += 1
+            except Exception as e:
+                print(f"Tag index rebuild failed for {lang}: {e}")
+        return rebuilt
+
+
+_index = TagIndex()
+
+
+def get_tag_index() -> TagIndex:
+    """
+    Return the process-wide tag index.
+    """
+    return _index
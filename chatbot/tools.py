@@ -1,5 +1,10 @@
 import re
 import requests
+import http_client
+from chatbot.sites import get_site
+from chatbot.news_client import get_news_client
+from chatbot.catalog import get_article_catalog
+from chatbot.latest_index import get_latest_index, LATEST_PAGE_SIZE
 from langchain_community.chat_models import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
@@ -76,47 +81,18 @@ def fetch_questions_on_latest_articles_in_Boomlive(language="en"):
     urls = []
     print(f"Language: {language}")
 
-    base_urls = {
-        "en": "https://www.boomlive.in",
-        "hi": "https://hindi.boomlive.in",
-        "bn": "https://bangla.boomlive.in"
-    }
-       # Define language-specific SIDs
-    sids = {
-        "en": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o",
-        "hi": "A2mzzjG2Xnru2M0YC1swJq6s0MUYXVwJ4EpJOub0c2Y8Xm96d26cNrEkAyrizEBD",
-        "bn": "xgjDMdW01R2vQpLH7lsKMb0SB5pDCKhFj7YgnNymTKvWLSgOvIWhxJgBh7153Mbf"
-    }
-
-
-      # Select the appropriate base URL and SID
-    base_url = base_urls.get(language, base_urls["en"])
-    sid = sids.get(language, sids["en"])
-    
-    api_url = 'https://boomlive.in/dev/h-api/news'
-    headers = {
-        "accept": "*/*",
-        "s-id": sid
-    }
-
-     # Add language parameter to API call if not English
-    if language != "en":
-        api_url = f"{base_url}/dev/h-api/news"
-    print(f"Fetching articles from API: {api_url}")
+    base_url = get_site(language)["base_url"]
 
     try:
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        if response.status_code == 200:
-            # Break if no articles are found
-            if not data.get("news"):
-                return {"questions": []}
-            # Filter URLs containing 'fact-check' in the URL path
-            for news_item in data.get("news", []):
-                url_path = news_item.get("url")
-                if url_path and f"{base_url}/fact-check/" in url_path:
-                    urls.append(url_path)
+        # Served from the shared feed cache; bursts of identical requests make one upstream call
+        articles = get_news_client().fetch_news(language)
+        if not articles:
+            return {"questions": []}
+        # Filter URLs containing 'fact-check' in the URL path
+        for news_item in articles:
+            url_path = news_item.get("url")
+            if url_path and f"{base_url}/fact-check/" in url_path:
+                urls.append(url_path)
     except requests.exceptions.RequestException as e:
         print(f"Failed to fetch articles: {e}")
         return {"error": f"Failed to fetch articles: {e}"}
@@ -127,7 +103,6 @@ def fetch_questions_on_latest_articles_in_Boomlive(language="en"):
         return {"questions": []}
 
     # Fetch corresponding articles
-    articles = data.get("news", [])
     filtered_articles = [article for article in articles if article.get("url") in urls]
 
     # Limit articles to 10 (as each article generates 2 questions)
@@ -143,24 +118,24 @@ def fetch_questions_on_latest_articles_in_Boomlive(language="en"):
 
 def fetch_articles_based_on_articletype(articleType):
     urls=[]
-    api_url = 'https://boomlive.in/dev/h-api/news'
-    headers = {
-        "accept": "*/*",
-        "s-id": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o"
-    }
+    # Served from the in-memory index kept current by the background poller
+    latest_index = get_latest_index()
+    if latest_index.is_ready("en"):
+        urls = latest_index.latest("en", articleType, LATEST_PAGE_SIZE)
+        if not urls:
+            print(f"No {articleType} articles found.")
+            return [{"urls": []}]
+        return {"urls": urls}
+
     try:
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        if response.status_code == 200:
-            # Break if no articles are found
-            if not data.get("news"):
-                return {"questions": []}
-            # Filter URLs containing 'fact-check' in the URL path
-            for news_item in data.get("news", []):
-                url_path = news_item.get("url")
-                if url_path and f"https://www.boomlive.in/{articleType}" in url_path:
-                    urls.append(url_path)
+        articles = get_news_client().fetch_news("en")
+        if not articles:
+            return {"questions": []}
+        # Filter URLs containing 'fact-check' in the URL path
+        for news_item in articles:
+            url_path = news_item.get("url")
+            if url_path and f"https://www.boomlive.in/{articleType}" in url_path:
+                urls.append(url_path)
     except requests.exceptions.RequestException as e:
         print(f"Failed to fetch articles: {e}")
         return {"error": f"Failed to fetch articles: {e}"}
@@ -186,51 +161,18 @@ def fetch_articles_based_on_articletype_and_language(articleType, language="en")
         dict: Dictionary containing URLs of articles or error message
     """
     urls = []
-    
-    # Define base URL based on language
-    base_urls = {
-        "en": "https://www.boomlive.in",
-        "hi": "https://hindi.boomlive.in",
-        "bn": "https://bangla.boomlive.in"
-    }
-    
-    # Define language-specific SIDs
-    sids = {
-        "en": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o",
-        "hi": "A2mzzjG2Xnru2M0YC1swJq6s0MUYXVwJ4EpJOub0c2Y8Xm96d26cNrEkAyrizEBD",
-        "bn": "xgjDMdW01R2vQpLH7lsKMb0SB5pDCKhFj7YgnNymTKvWLSgOvIWhxJgBh7153Mbf"
-    }
-    
-    # Select the appropriate base URL and SID
-    base_url = base_urls.get(language, base_urls["en"])
-    sid = sids.get(language, sids["en"])
-    
-    # API URL remains the same, but we'll handle language-specific content later
-    api_url = 'https://boomlive.in/dev/h-api/news'
-    headers = {
-        "accept": "*/*",
-        "s-id": sid
-    }
-    
-    # Add language parameter to API call if not English
-    if language != "en":
-        api_url = f"{api_url}?lang={language}"
+    base_url = get_site(language)["base_url"]
     
     try:
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        if response.status_code == 200:
-            # Break if no articles are found
-            if not data.get("news"):
-                return {"urls": []}
-                
-            # Filter URLs containing articleType in the URL path
-            for news_item in data.get("news", []):
-                url_path = news_item.get("url")
-                if url_path and f"{base_url}/{articleType}" in url_path:
-                    urls.append(url_path)
+        articles = get_news_client().fetch_news(language)
+        if not articles:
+            return {"urls": []}
+            
+        # Filter URLs containing articleType in the URL path
+        for news_item in articles:
+            url_path = news_item.get("url")
+            if url_path and f"{base_url}/{articleType}" in url_path:
+                urls.append(url_path)
     except requests.exceptions.RequestException as e:
         print(f"Failed to fetch articles: {e}")
         return {"error": f"Failed to fetch articles: {e}"}
@@ -267,32 +209,25 @@ def fetch_recent_articles(article_type: str, language: str = "en", days: int = 4
     from_date = (today - timedelta(days=days)).strftime('%Y-%m-%d')
     to_date = today.strftime('%Y-%m-%d')
 
-    # Language-specific domains and SIDs
-    base_urls = {
-        "en": "https://www.boomlive.in",
-        "hi": "https://hindi.boomlive.in",
-        "bn": "https://bangla.boomlive.in"
-    }
-    sids = {
-        "en": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o",
-        "hi": "A2mzzjG2Xnru2M0YC1swJq6s0MUYXVwJ4EpJOub0c2Y8Xm96d26cNrEkAyrizEBD",
-        "bn": "xgjDMdW01R2vQpLH7lsKMb0SB5pDCKhFj7YgnNymTKvWLSgOvIWhxJgBh7153Mbf"
-    }
+    # Answer from the local catalog when it covers the whole range
+    catalog_urls = get_article_catalog().urls_in_range(language, from_date, to_date, article_type)
+    if catalog_urls is not None:
+        return {"urls": catalog_urls}
 
-    base_url = base_urls.get(language, base_urls["en"])
-    sid = sids.get(language, sids["en"])
+    site = get_site(language)
+    base_url = site["base_url"]
     api_url = f"{base_url}/dev/h-api/news"
 
     headers = {
         "accept": "*/*",
-        "s-id": sid
+        "s-id": site["s_id"]
     }
 
     # Fetch in batches
     while True:
         paged_url = f"{api_url}?startIndex={start_index}&count={count}&fromDate={from_date}&toDate={to_date}"
         try:
-            response = requests.get(paged_url, headers=headers)
+            response = http_client.get(paged_url, headers=headers)
             response.raise_for_status()
             data = response.json()
 
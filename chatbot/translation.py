@@ -0,0 +1,229 @@
+import argparse, asyncio, datetime, hashlib, os, sqlite3, sys, threading, unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+from config import data_path
+
+load_dotenv()
+
+TRANSLATION_CACHE_DB = os.getenv("TRANSLATION_CACHE_DB", "translations.db")
+# Seconds a query waits for a translation before going ahead untranslated
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", "2"))
+TRANSLATION_MEMORY_CACHE_SIZE = int(os.getenv("TRANSLATION_MEMORY_CACHE_SIZE", "2048"))
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "50"))
+TRANSLATION_WORKERS = 4
+# Google Translate rejects longer inputs
+TRANSLATION_MAX_CHARS = 5000
+
+##############################################[TRANSLATION SERVICE]###########################################################
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cache form of a text: NFKC-normalized, lowercased, single spaces. Forwarded copies of a
+    viral message that differ only in spacing, case or Unicode composition share one entry.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+
+def _cache_key(text: str, target: str) -> str:
+    return hashlib.blake2b(f"{target}\n{normalize_text(text)}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TranslationService:
+    """
+    Machine translation behind a two-level cache.
+
+    Translations are cached in memory (LRU) and in a SQLite table keyed by the normalized
+    source text and target language, so a message seen before, in this process or an
+    earlier one, is translated without a network call. Misses are sent to Google Translate
+    on a worker pool with one translator object per thread. `translate` waits at most
+    TRANSLATION_TIMEOUT seconds and otherwise returns the text unchanged; the translation
+    still lands in the cache when it arrives. While every worker is busy, `translate` returns
+    the text unchanged right away instead of queueing requests behind a slow backend.
+    """
+
+    def __init__(self, db_path: str = None, timeout: float = TRANSLATION_TIMEOUT,
+                 memory_size: int = TRANSLATION_MEMORY_CACHE_SIZE):
+        self.db_path = db_path or data_path(TRANSLATION_CACHE_DB)
+        self.timeout = timeout
+        self.memory_size = memory_size
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, target TEXT, source_text TEXT, translated TEXT, created_at TEXT)"
+            )
+        self._memory = OrderedDict()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS, thread_name_prefix="translation")
+        self._in_flight = 0  # translations submitted and not finished
+        self._in_flight_lock = threading.Lock()
+
+    ##########[CACHE]##########
+
+    def cached(self, texts: list, target: str = "en") -> dict:
+        """
+        Cached translations of `texts`.
+
+        Returns:
+            dict: text -> translation, for the texts that are cached.
+        """
+        found, missing = {}, {}
+        with self._lock:
+            for text in texts:
+                key = _cache_key(text, target)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+                else:
+                    missing.setdefault(key, []).append(text)
+            keys = list(missing)
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                for key, translated in self._conn.execute(
+                    f"SELECT key, translated FROM translations WHERE key IN ({placeholders})", batch
+                ):
+                    self._remember(key, translated)
+                    for text in missing[key]:
+                        found[text] = translated
+        return found
+
+    def _remember(self, key: str, translated: str):
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _store(self, pairs: list, target: str):
+        now = datetime.datetime.now().isoformat()
+        rows = [(_cache_key(text, target), target, text, translated, now) for text, translated in pairs if translated]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", rows)
+            for key, _, _, translated, _ in rows:
+                self._remember(key, translated)
+
+    ##########[TRANSLATION]##########
+
+    def _translator(self, source: str, target: str):
+        # deep_translator objects keep per-request state, so each worker thread gets its own
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        if (source, target) not in translators:
+            from deep_translator import GoogleTranslator
+            translators[(source, target)] = GoogleTranslator(source=source, target=target)
+        return translators[(source, target)]
+
+    def _translate_uncached(self, texts: list, source: str, target: str) -> dict:
+        translator = self._translator(source, target)
+        translated = translator.translate_batch([text[:TRANSLATION_MAX_CHARS] for text in texts])
+        pairs = list(zip(texts, translated))
+        self._store(pairs, target)
+        return {text: result for text, result in pairs if result}
+
+    def _submit(self, texts: list, source: str, target: str, queue: bool = False):
+        """
+        Submit a translation, or return None if every worker is busy and `queue` is false.
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= TRANSLATION_WORKERS and not queue:
+                return None
+            self._in_flight += 1
+        future = self._executor.submit(self._translate_uncached, texts, source, target)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def translate(self, text: str, target: str = "en", source: str = "auto", timeout: float = None) -> str:
+        """
+        Translate one text, from the cache when possible.
+
+        Args:
+            text (str): Text to translate.
+            target (str): Target language code.
+            source (str): Source language code, or "auto".
+            timeout (float, optional): Seconds to wait for a network translation; TRANSLATION_TIMEOUT by default.
+
+        Returns:
+            str: The translation, or `text` unchanged if it didn't arrive in time or failed.
+        """
+        if not text or not text.strip():
+            return text
+        cached = self.cached([text], target)
+        if text in cached:
+            return cached[text]
+        future = self._submit([text], source, target)
+        if future is None:
+            print("Translation workers are busy, using the original text")
+            return text
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout).get(text, text)
+        except FutureTimeoutError:
+            # A translation already running still lands in the cache; one still queued is dropped
+            future.cancel()
+            print(f"Translation exceeded {self.timeout if timeout is None else timeout}s, using the original text")
+        except Exception as e:
+            print(f"Translation failed, using the original text: {e}")
+        return text
+
+    async def atranslate(self, text: str, target: str = "en", source: str = "auto", timeout: float = None) -> str:
+        """
+        `translate` for async callers; the event loop is not blocked while waiting.
+        """
+        return await asyncio.to_thread(self.translate, text, target, source, timeout)
+
+    def translate_batch(self, texts: list, target: str = "en", source: str = "auto") -> list:
+        """
+        Translate many texts for bulk jobs. Repeated and cached texts are not sent; the rest
+        go out in batches of TRANSLATION_BATCH_SIZE. No timeout applies.
+
+        Returns:
+            list: Translations in input order; a text whose translation failed is returned unchanged.
+        """
+        unique = list(dict.fromkeys(text for text in texts if text and text.strip()))
+        results = self.cached(unique, target)
+        # Texts with the same normalized form need only one request
+        pending = list({_cache_key(text, target): text for text in unique if text not in results}.values())
+        batches = [pending[i:i + TRANSLATION_BATCH_SIZE] for i in range(0, len(pending), TRANSLATION_BATCH_SIZE)]
+        for batch, future in [(batch, self._submit(batch, source, target, queue=True)) for batch in batches]:
+            try:
+                results.update(future.result())
+            except Exception as e:
+                print(f"Translating a batch of {len(batch)} texts failed: {e}")
+        results.update(self.cached([text for text in unique if text not in results], target))
+        return [results.get(text, text) for text in texts]
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_translation_service() -> TranslationService:
+    """
+    Return the process-wide translation service.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TranslationService()
+        return _service
+
+
+if __name__ == "__main__":
+    # Warm the cache for a bulk job: one message per line
+    parser = argparse.ArgumentParser(description="Translate a file of messages (one per line) into the cache.")
+    parser.add_argument("path", help="Text file with one message per line.")
+    parser.add_argument("--target", default="en", help="Target language code.")
+    args = parser.parse_args()
+    with open(args.path, encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip()]
+    translations = get_translation_service().translate_batch(messages, target=args.target)
+    print(f"{sum(1 for message, translated in zip(messages, translations) if translated != message)} "
+          f"of {len(messages)} messages translated")
+    sys.exit(0)
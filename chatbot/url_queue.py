@@ -0,0 +1,215 @@
+import asyncio, datetime, os, queue, threading, uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from chatbot.index_layout import resolve_write_partition
+from chatbot.ingestion import SiteRateLimiter, EmbeddingBatcher, INGEST_MAX_WORKERS, INGEST_EMBED_BATCH_SIZE
+from chatbot.url_registry import get_url_registry
+
+load_dotenv()
+
+# URLs that may wait in the queue; submissions beyond it are refused
+URL_QUEUE_MAX_URLS = int(os.getenv("URL_QUEUE_MAX_URLS", "2000"))
+# Jobs processed at once; each fetches its pages concurrently under the site rate limit
+URL_QUEUE_WORKERS = int(os.getenv("URL_QUEUE_WORKERS", "2"))
+# URLs fetched, embedded and upserted together
+URL_QUEUE_BATCH_SIZE = int(os.getenv("URL_QUEUE_BATCH_SIZE", "25"))
+# Finished jobs whose status can still be looked up
+URL_QUEUE_JOB_HISTORY = int(os.getenv("URL_QUEUE_JOB_HISTORY", "500"))
+
+##############################################[URL INGESTION QUEUE]###########################################################
+
+
+class UrlIngestionQueue:
+    """
+    Bounded in-process queue for ingesting lists of article URLs.
+
+    A submission is deduplicated (within itself, against URLs already ingested and against
+    URLs queued by other jobs) and becomes a job. Jobs are processed on a background thread
+    with its own event loop, URL_QUEUE_WORKERS at a time: pages are fetched concurrently on
+    a shared pool under each site's rate limit, the chunks of a batch of URLs are embedded
+    with one embeddings call and upserted in bulk, and ingested URLs are recorded in the
+    URL registry. Every URL of a job has its own status.
+    """
+
+    def __init__(self, max_urls: int = URL_QUEUE_MAX_URLS, workers: int = URL_QUEUE_WORKERS,
+                 batch_size: int = URL_QUEUE_BATCH_SIZE):
+        self.max_urls = max_urls
+        self.workers = workers
+        self.batch_size = batch_size
+        self._loop = None
+        self._pending = None  # asyncio.Queue of (job id, urls), owned by the worker thread's loop
+        self._ready = threading.Event()
+        self._jobs = OrderedDict()  # job id -> job dict
+        self._in_flight = set()  # URLs queued or being ingested
+        self._queued_urls = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS, thread_name_prefix="url-queue")
+
+    def submit(self, urls: list, lang: str, index_name: str = None, force: bool = False) -> dict:
+        """
+        Queue URLs for ingestion.
+
+        Args:
+            urls (list): Article URLs.
+            lang (str): Language code of the articles.
+            index_name (str, optional): Index to write to; the language's partition by default.
+            force (bool): Re-ingest URLs already recorded as ingested.
+
+        Returns:
+            dict: The job, see `status`.
+
+        Raises:
+            ValueError: If the language or index is not part of the index layout.
+            queue.Full: If the queue can't take the new URLs.
+        """
+        partition = resolve_write_partition(lang, index_name)
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        ingested = set() if force else get_url_registry().known(urls)
+        job_id = uuid.uuid4().hex
+        statuses = OrderedDict()
+        with self._lock:
+            for url in urls:
+                if url in ingested:
+                    statuses[url] = {"status": "duplicate", "detail": "already ingested"}
+                elif url in self._in_flight:
+                    statuses[url] = {"status": "duplicate", "detail": "queued by another job"}
+                else:
+                    statuses[url] = {"status": "queued"}
+            new_urls = [url for url, status in statuses.items() if status["status"] == "queued"]
+            if self._queued_urls + len(new_urls) > self.max_urls:
+                raise queue.Full(f"Ingestion queue is full ({self._queued_urls} URLs waiting)")
+            self._in_flight.update(new_urls)
+            self._queued_urls += len(new_urls)
+            job = {
+                "job_id": job_id,
+                "lang": lang,
+                "index_name": partition.index_name,
+                "namespace": partition.namespace,
+                "status": "queued" if new_urls else "done",
+                "created_at": datetime.datetime.now().isoformat(),
+                "finished_at": None if new_urls else datetime.datetime.now().isoformat(),
+                "urls": statuses,
+            }
+            self._jobs[job_id] = job
+            self._trim_history()
+        if new_urls:
+            self._ensure_worker()
+            self._loop.call_soon_threadsafe(self._pending.put_nowait, (job_id, new_urls))
+        print(f"Ingestion job {job_id}: {len(new_urls)} URLs queued, {len(urls) - len(new_urls)} duplicates skipped")
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> dict:
+        """
+        Current state of a job, or None if it is unknown (or too old to be kept).
+
+        The job's "status" is "queued", "running" or "done"; each URL is "queued", "fetching",
+        "embedding", "done" (with its chunk count), "failed" (with a detail) or "duplicate".
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            counts = {}
+            for url_status in job["urls"].values():
+                counts[url_status["status"]] = counts.get(url_status["status"], 0) + 1
+            return {**job, "urls": {url: dict(url_status) for url, url_status in job["urls"].items()}, "counts": counts}
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] == "done"]
+        for job_id in finished[:max(0, len(self._jobs) - URL_QUEUE_JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    def _set_status(self, job_id: str, urls, status: str, **details):
+        with self._lock:
+            job = self._jobs[job_id]
+            for url in urls:
+                job["urls"][url] = {"status": status, **details}
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="url-queue", daemon=True)
+                self._thread.start()
+        # The loop and its queue exist only once the thread is running
+        self._ready.wait()
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._pending = asyncio.Queue()
+        self._rate_limiters = {}  # lang -> SiteRateLimiter, bound to this loop
+        self._ready.set()
+        await asyncio.gather(*[self._worker() for _ in range(self.workers)])
+
+    async def _worker(self):
+        while True:
+            job_id, urls = await self._pending.get()
+            try:
+                await self._process(job_id, urls)
+            except Exception as e:
+                print(f"Ingestion job {job_id} failed: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight.difference_update(urls)
+                    self._queued_urls -= len(urls)
+                    job = self._jobs.get(job_id)
+                    if job is not None:
+                        for url in urls:
+                            if job["urls"][url]["status"] not in ("done", "failed"):
+                                job["urls"][url] = {"status": "failed", "detail": "ingestion interrupted"}
+                        job["status"] = "done"
+                        job["finished_at"] = datetime.datetime.now().isoformat()
+
+    async def _process(self, job_id: str, urls: list):
+        from chatbot.fetchArticles import fetch_docs_custom_range
+
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            lang, index_name, namespace = job["lang"], job["index_name"], job["namespace"]
+        rate_limiter = self._rate_limiters.setdefault(lang, SiteRateLimiter())
+        # Sized so a batch of URLs is embedded with one call, whatever its chunk count
+        batcher = EmbeddingBatcher(batch_size=max(INGEST_EMBED_BATCH_SIZE, 10 ** 6), executor=self._executor)
+
+        for i in range(0, len(urls), self.batch_size):
+            batch = urls[i:i + self.batch_size]
+            self._set_status(job_id, batch, "fetching")
+            try:
+                docs = await fetch_docs_custom_range(batch, executor=self._executor, rate_limiter=rate_limiter, lang=lang)
+            except Exception as e:
+                self._set_status(job_id, batch, "failed", detail=f"fetch failed: {e}")
+                continue
+            chunks = {}
+            for doc in docs:
+                chunks[doc.metadata.get("source")] = chunks.get(doc.metadata.get("source"), 0) + 1
+            fetched = [url for url in batch if chunks.get(url)]
+            self._set_status(job_id, [url for url in batch if not chunks.get(url)], "failed",
+                             detail="page could not be fetched or has no article text")
+            if not fetched:
+                continue
+            self._set_status(job_id, fetched, "embedding")
+            try:
+                await batcher.add(docs, index_name, fetched, lang, namespace=namespace)
+                await batcher.flush()
+            except Exception as e:
+                self._set_status(job_id, fetched, "failed", detail=f"embedding or upsert failed: {e}")
+                continue
+            for url in fetched:
+                self._set_status(job_id, [url], "done", chunks=chunks[url])
+
+
+_url_queue = None
+_url_queue_lock = threading.Lock()
+
+
+def get_url_queue() -> UrlIngestionQueue:
+    """
+    Return the process-wide URL ingestion queue.
+    """
+    global _url_queue
+    with _url_queue_lock:
+        if _url_queue is None:
+            _url_queue = UrlIngestionQueue()
+        return _url_queue
@@ -0,0 +1,300 @@
+import json, os, queue, sqlite3, threading, time, datetime
+import requests
+import http_client
+from dotenv import load_dotenv
+from config import data_path
+
+load_dotenv()
+
+FILTER_BOOMLIVE_ARTICLES = os.getenv("FILTER_BOOMLIVE_ARTICLES", "https://toolbox.boomlive.in/api_project/not_in_table.php")
+STORE_BOOMLIVE__ARTICLES = os.getenv("STORE_BOOMLIVE_ARTICLES", "https://toolbox.boomlive.in/api_project/add_in_table.php")
+TOOLBOX_AUTHORIZATION = os.getenv("TOOLBOX_AUTHORIZATION", "adityaboom_requesting2024#")
+TOOLBOX_VERIFY_SSL = os.getenv("TOOLBOX_VERIFY_SSL", "true").lower() == "true"
+INGESTED_URLS_DB = os.getenv("INGESTED_URLS_DB", "ingested_urls.db")
+URL_SYNC_BATCH_SIZE = int(os.getenv("URL_SYNC_BATCH_SIZE", "200"))
+URL_SYNC_INTERVAL = float(os.getenv("URL_SYNC_INTERVAL", "5"))
+# Longest wait between retries while the remote table keeps failing
+URL_SYNC_MAX_BACKOFF = float(os.getenv("URL_SYNC_MAX_BACKOFF", "300"))
+# Feed items requested per page while seeding
+SEED_PAGE_SIZE = 100
+
+TOOLBOX_HEADERS = {
+    "accept": "*/*",
+    "Authorization": TOOLBOX_AUTHORIZATION,
+    "Content-Type": "application/json"
+}
+
+##############################################[INGESTED URL REGISTRY]###########################################################
+
+
+class IngestedUrlRegistry:
+    """
+    Local, persistent set of article URLs that are already in the vector store.
+
+    Filtering happens in-process against a SQLite table. The remote toolbox table is only
+    consulted for languages that have not been seeded yet, and whatever it reports as
+    already stored is copied locally, so each URL is looked up remotely at most once.
+    New URLs are pushed back to the toolbox in batched POSTs from a background thread.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or data_path(INGESTED_URLS_DB)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingested_urls ("
+                "url TEXT PRIMARY KEY, lang TEXT, ingested_at TEXT, synced INTEGER DEFAULT 0)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ingested_urls_synced ON ingested_urls (synced)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seeded_languages (lang TEXT PRIMARY KEY, seeded_at TEXT)")
+        self._sync_queue = queue.Queue()
+        self._sync_thread = None
+
+    def known(self, urls: list) -> set:
+        """
+        Return the subset of `urls` already recorded as ingested.
+        """
+        found = set()
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                batch = urls[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"SELECT url FROM ingested_urls WHERE url IN ({placeholders})", batch)
+                found.update(row[0] for row in rows)
+        return found
+
+    def is_seeded(self, lang: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seeded_languages WHERE lang = ?", (lang,)).fetchone()
+        return row is not None
+
+    def mark_seeded(self, lang: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO seeded_languages (lang, seeded_at) VALUES (?, ?)",
+                (lang, datetime.datetime.now().isoformat())
+            )
+
+    def filter_new(self, urls: list, lang: str) -> list:
+        """
+        Return the URLs that still need to be ingested, preserving their order.
+
+        Args:
+            urls (list): Candidate article URLs.
+            lang (str): Language code of the site the URLs belong to.
+
+        Returns:
+            list: URLs not yet ingested.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        known = self.known(urls)
+        unknown = [url for url in urls if url not in known]
+        if not unknown or self.is_seeded(lang):
+            return unknown
+
+        # Not seeded yet: ask the remote table once and remember what it already has
+        remote_new = remote_filter_urls(unknown, lang)
+        if remote_new is None:
+            # Same as before: skip the page rather than risk double-ingesting it
+            return []
+        remote_new_set = set(remote_new)
+        already_stored = [url for url in unknown if url not in remote_new_set]
+        self._record(already_stored, lang, synced=1)
+        return [url for url in unknown if url in remote_new_set]
+
+    def mark_ingested(self, urls: list, lang: str):
+        """
+        Record URLs as ingested locally and queue them for the remote table.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        if not urls:
+            return
+        self._record(urls, lang, synced=0)
+        self._sync_queue.put((lang, urls))
+        self._ensure_sync_thread()
+
+    def seed_from_remote(self, urls: list, lang: str):
+        """
+        Seed the local set from the remote table for a list of known article URLs
+        (e.g. everything in the news feed for a date range), then mark the language as seeded.
+        """
+        for i in range(0, len(urls), 100):
+            batch = urls[i:i + 100]
+            known = self.known(batch)
+            unknown = [url for url in batch if url not in known]
+            if not unknown:
+                continue
+            remote_new = remote_filter_urls(unknown, lang)
+            if remote_new is None:
+                print(f"Seeding {lang} stopped: remote filter unavailable")
+                return False
+            remote_new_set = set(remote_new)
+            self._record([url for url in unknown if url not in remote_new_set], lang, synced=1)
+        self.mark_seeded(lang)
+        print(f"Seeded ingested URL set for {lang}")
+        return True
+
+    def seed_from_feed(self, lang: str, from_date: str, to_date: str) -> bool:
+        """
+        Seed the local set with every article the news feed lists for a date range.
+
+        Returns:
+            bool: True if the language is now marked as seeded.
+        """
+        from chatbot.news_client import get_news_client
+
+        client = get_news_client()
+        urls, start_index = [], 0
+        while True:
+            try:
+                news = client.fetch_news(lang, start_index, SEED_PAGE_SIZE, from_date, to_date, use_cache=False)
+            except requests.RequestException as e:
+                print(f"Seeding {lang} stopped: news feed unavailable ({e})")
+                return False
+            urls += [item["url"] for item in news if item.get("url")]
+            if len(news) < SEED_PAGE_SIZE:
+                break
+            start_index += SEED_PAGE_SIZE
+        print(f"Seeding {lang} from {len(urls)} feed URLs between {from_date} and {to_date}...")
+        return self.seed_from_remote(list(dict.fromkeys(urls)), lang)
+
+    def sync_pending(self) -> int:
+        """
+        Push every unsynced URL to the remote table now. Used at the end of offline runs,
+        where the process may exit before the background thread flushes.
+
+        Returns:
+            int: Number of URLs synced.
+        """
+        pending = {}
+        for lang, url in self._pending_sync():
+            pending.setdefault(lang, []).append(url)
+        synced = 0
+        for lang, urls in pending.items():
+            for i in range(0, len(urls), URL_SYNC_BATCH_SIZE):
+                batch = urls[i:i + URL_SYNC_BATCH_SIZE]
+                if remote_add_urls(batch, lang):
+                    self._mark_synced(batch)
+                    synced += len(batch)
+        return synced
+
+    def _record(self, urls: list, lang: str, synced: int):
+        if not urls:
+            return
+        now = datetime.datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO ingested_urls (url, lang, ingested_at, synced) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET synced = MAX(synced, excluded.synced)",
+                [(url, lang, now, synced) for url in urls]
+            )
+
+    def _mark_synced(self, urls: list):
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE ingested_urls SET synced = 1 WHERE url = ?", [(url,) for url in urls])
+
+    def _pending_sync(self) -> list:
+        with self._lock:
+            return self._conn.execute("SELECT lang, url FROM ingested_urls WHERE synced = 0").fetchall()
+
+    def _ensure_sync_thread(self):
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="url-registry-sync", daemon=True)
+            self._sync_thread.start()
+
+    def _sync_loop(self):
+        # Anything left unsynced by a previous process goes out first
+        pending = {}
+        for lang, url in self._pending_sync():
+            pending.setdefault(lang, []).append(url)
+
+        backoff = URL_SYNC_INTERVAL
+        while True:
+            try:
+                lang, urls = self._sync_queue.get(timeout=URL_SYNC_INTERVAL)
+                pending.setdefault(lang, []).extend(urls)
+                if sum(len(batch) for batch in pending.values()) < URL_SYNC_BATCH_SIZE:
+                    continue
+            except queue.Empty:
+                pass
+
+            failed = {}
+            for lang in list(pending.keys()):
+                urls = list(dict.fromkeys(pending.pop(lang)))
+                for i in range(0, len(urls), URL_SYNC_BATCH_SIZE):
+                    batch = urls[i:i + URL_SYNC_BATCH_SIZE]
+                    if remote_add_urls(batch, lang):
+                        self._mark_synced(batch)
+                    else:
+                        failed.setdefault(lang, []).extend(batch)
+            if failed:
+                # Retried with the next sync, waiting longer after each consecutive failure
+                for lang, urls in failed.items():
+                    pending[lang] = urls + pending.get(lang, [])
+                time.sleep(backoff)
+                backoff = min(backoff * 2, URL_SYNC_MAX_BACKOFF)
+            else:
+                backoff = URL_SYNC_INTERVAL
+
+
+def remote_filter_urls(urls: list, lang: str):
+    """
+    Ask the toolbox table which of `urls` it does not have yet.
+
+    Returns:
+        list | None: URLs missing from the remote table, or None if the call failed.
+    """
+    try:
+        response = http_client.get(
+            FILTER_BOOMLIVE_ARTICLES,
+            params={"urls": json.dumps(urls), "lang": lang},
+            headers=TOOLBOX_HEADERS,
+            verify=TOOLBOX_VERIFY_SSL,
+            timeout=30
+        )
+        if response.status_code == 200:
+            return response.json().get("urls", [])
+        print(f"Remote URL filter returned status {response.status_code}")
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error filtering URLs: {e}")
+    return None
+
+
+def remote_add_urls(urls: list, lang: str) -> bool:
+    """
+    Add a batch of URLs to the toolbox table in one POST.
+    """
+    try:
+        response = http_client.post(
+            STORE_BOOMLIVE__ARTICLES,
+            params={"lang": lang},
+            data=json.dumps({"urls": urls, "lang": lang}),
+            headers=TOOLBOX_HEADERS,
+            verify=TOOLBOX_VERIFY_SSL,
+            timeout=30
+        )
+        if response.status_code == 200:
+            print(f"Synced {len(urls)} URLs to the remote table ({lang})")
+            return True
+        print(f"Remote URL sync returned status {response.status_code}")
+    except requests.RequestException as e:
+        print(f"Error syncing URLs: {e}")
+    return False
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_url_registry() -> IngestedUrlRegistry:
+    """
+    Return the process-wide ingested URL registry.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = IngestedUrlRegistry()
+        return _registry
@@ -6,7 +6,17 @@ from collections import Counter
 
 
 import requests
+import http_client
 from bs4 import BeautifulSoup
+from chatbot.extraction import extract_article_blocks, extract_article_text
+from chatbot.boilerplate import get_boilerplate_filter
+from chatbot.news_client import get_news_client
+from chatbot.catalog import get_article_catalog
+from chatbot.latest_index import get_latest_index
+from chatbot.summaries import summarize_and_store
+from chatbot.vector_store import get_vector_store, get_embeddings, batch_similarity_search, write_embedded_documents, partition_name
+from chatbot.index_layout import write_partition, resolve_write_partition
+from chatbot.ingestion import EmbeddingBatcher, INGEST_EMBED_BATCH_SIZE
 import re
 from urllib.parse import urlparse
 import json
@@ -64,7 +74,7 @@ def extract_description_as_keywords(url):
         
         # Make the request with a small delay to avoid rate limiting
         time.sleep(randint(1, 3) / 10)  # Random delay between 0.1-0.3 seconds
-        response = requests.get(url, headers=headers, cookies=cookies, timeout=15)
+        response = http_client.get(url, headers=headers, cookies=cookies, timeout=15)
         response.raise_for_status()
         
         # Parse HTML
@@ -464,15 +474,12 @@ def fetch_source_content(url):
         str: Extracted content (or snippet) for similarity calculation.
     """
     try:
-        response = requests.get(url, timeout=5)  # Fetch the page
+        response = http_client.get(url, timeout=5)  # Fetch the page
         if response.status_code != 200:
             return ""  # Return empty string if fetch fails
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Extract the main content (customize based on website structure)
-        paragraphs = soup.find_all("p")  # Get all paragraph tags
-        content = " ".join([p.get_text() for p in paragraphs[:5]])  # Get first 5 paragraphs
+        # Extract the first 5 paragraphs of the article body
+        content = " ".join(extract_article_blocks(response.content, tags=("p",))[:5])
 
         return content.strip()
     
@@ -526,12 +533,10 @@ def prioritize_sources(user_query: str, sources: list, response_text: str=None)
 
 def fetch_page_text(url):
     try:
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Extract main text – this may require some custom logic depending on the page structure.
-            paragraphs = soup.find_all('p')
-            text = "\n".join(p.get_text() for p in paragraphs)
+            # Extract the article body paragraphs
+            text = extract_article_text(response.content, separator="\n", tags=("p",))
             return text.strip()
     except Exception as e:
         print(f"Error fetching {url}: {e}")
@@ -545,7 +550,7 @@ BASE_URL = "https://www.boomlive.in"
 def extract_articles(tag_url):
     """Fetch and extract article titles, URLs, and summaries from BoomLive search results."""
     try:
-        response = requests.get(tag_url, timeout=10)
+        response = http_client.get(tag_url, timeout=10)
         if response.status_code != 200:
             print("Failed to retrieve page, status code:", response.status_code)
             return []
@@ -754,33 +759,30 @@ def fetch_latest_article_urls(query, article_type):
 
     # print(f"Matched keywords for filtering: {matched_keywords}")
 
-    urls = []
-    api_url = 'https://boomlive.in/dev/h-api/news'
-    headers = {
-        "accept": "*/*",
-        "s-id": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o"
-    }
+    # Served from the in-memory index kept current by the background poller; no network I/O
+    latest_index = get_latest_index()
+    if latest_index.is_ready("en"):
+        top_5_urls = latest_index.latest("en", article_type, 5)
+        print(f"Top 5 filtered URLs: {top_5_urls}")
+        return top_5_urls
 
-    print(f"Fetching articles from API: {api_url}")
+    urls = []
 
     try:
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()  # Raise an error for bad status codes
-        
-        if response.status_code == 200:
-            data = response.json()
+        # Shared, cached feed client: concurrent "latest articles" requests make one upstream call
+        news = get_news_client().fetch_news("en")
 
-            # Break if no articles are found
-            if not data.get("news"):
-                return []
+        # Break if no articles are found
+        if not news:
+            return []
 
-            for news_item in data.get("news", []):
-                url_path = news_item.get("url")
-                
-                if article_type == "all":
-                    urls.append(url_path)  # Include all URLs
-                elif url_path and f"https://www.boomlive.in/{article_type}" in url_path:
-                    urls.append(url_path)
+        for news_item in news:
+            url_path = news_item.get("url")
+            
+            if article_type == "all":
+                urls.append(url_path)  # Include all URLs
+            elif url_path and f"https://www.boomlive.in/{article_type}" in url_path:
+                urls.append(url_path)
 
     except requests.exceptions.RequestException as e:
         print(f"Failed to fetch articles: {e}")
@@ -850,6 +852,12 @@ def fetch_custom_range_articles_urls(from_date: str = None, to_date: str = None)
         print("Invalid date range. Ensure 'from_date' <= 'to_date' and format is YYYY-MM-DD.")
         return []
 
+    # Answer from the local catalog when it covers the whole range
+    catalog_urls = get_article_catalog().urls_in_range("en", from_date, to_date)
+    if catalog_urls is not None:
+        print(f"Found {len(catalog_urls)} article URLs from {from_date} to {to_date} in the catalog")
+        return catalog_urls
+
     print(f"Fetching article URLs from {from_date} to {to_date}....")
 
     # Loop to fetch article URLs in batches
@@ -866,7 +874,7 @@ def fetch_custom_range_articles_urls(from_date: str = None, to_date: str = None)
         print(f"Requesting API URL: {api_url}")
 
         # Make the API request
-        response = requests.get(api_url, headers=headers)
+        response = http_client.get(api_url, headers=headers)
         
         # Check if the request was successful
         if response.status_code == 200:
@@ -891,13 +899,11 @@ def fetch_custom_range_articles_urls(from_date: str = None, to_date: str = None)
 ################################################VECTOR STORE DATABASE################################################################
 
 
-import datetime, json
+import datetime, json, asyncio
 import requests
 from bs4 import BeautifulSoup
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
-from langchain_pinecone import Pinecone
-from langchain_openai import OpenAIEmbeddings
 
 import datetime
 
@@ -975,30 +981,44 @@ async def store_articles_custom_range(from_date: str = None, to_date: str = None
         return []
 
     print(f"Fetching data from {from_date} to {to_date}....")
-    index_name = "boom-latest-articles"
-
-    while True:
-        perpageurl = []
-        print("Now start index is ", start_index)
-
-        # Construct API URL with the custom range
-        api_url = f'https://boomlive.in/dev/h-api/news?startIndex={start_index}&count={count}&fromDate={from_date}&toDate={to_date}'
-        headers = {
-            "accept": "*/*",
-            "s-id": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o"
-        }
-        print(f"Current API URL: {api_url}")
-
-        response = requests.get(api_url, headers=headers)
+    index_name, namespace, _ = write_partition("en")
+    # Chunk metadata takes the published date from the catalog, so days it doesn't cover yet are
+    # paged one at a time and stored in the catalog before their chunks are built
+    catalog = get_article_catalog()
+    windows = await asyncio.to_thread(catalog.feed_windows, "en", from_date, to_date)
+
+    for window_from, window_to, day in windows:
+        start_index = 0
+        while True:
+            perpageurl = []
+            print("Now start index is ", start_index)
+
+            # Construct API URL with the custom range
+            api_url = f'https://boomlive.in/dev/h-api/news?startIndex={start_index}&count={count}&fromDate={window_from}&toDate={window_to}'
+            headers = {
+                "accept": "*/*",
+                "s-id": "1w3OEaLmf4lfyBxDl9ZrLPjVbSfKxQ4wQ6MynGpyv1ptdtQ0FcIXfjURSMRPwk1o"
+            }
+            print(f"Current API URL: {api_url}")
+
+            response = http_client.get(api_url, headers=headers)
+
+            if response.status_code != 200:
+                print(f"Failed to fetch articles. Status code: {response.status_code}")
+                break
 
-        if response.status_code == 200:
             data = response.json()
+            news = data.get("news") or []
+            if day:
+                await asyncio.to_thread(catalog.upsert_items, news, "en", day)
 
             # Break if no articles are found
-            if not data.get("news"):
+            if not news:
+                if day:
+                    await asyncio.to_thread(catalog.mark_synced, "en", day)
                 break
 
-            for news_item in data.get("news", []):
+            for news_item in news:
                 url_path = news_item.get("url")
                 if url_path:
                     article_urls.append(url_path)
@@ -1011,11 +1031,8 @@ async def store_articles_custom_range(from_date: str = None, to_date: str = None
             docsperindex = await fetch_docs_custom_range(filtered_urls)
             print(f"Processed {len(filtered_urls)} articles and {len(docsperindex)} chunks to add to Pinecone.")
 
-            await store_docs_in_pinecone(docsperindex, index_name, filtered_urls)
+            await store_docs_in_pinecone(docsperindex, index_name, filtered_urls, namespace)
             start_index += count
-        else:
-            print(f"Failed to fetch articles. Status code: {response.status_code}")
-            break
 
     return article_urls
 
@@ -1041,103 +1058,74 @@ def validate_date_range(from_date: str, to_date: str) -> bool:
 #################################################################################################################
 
 async def filter_urls_custom_range(urls):
-    api_url = f"https://toolbox.boomlive.in/api_project/not_in_table.php?urls={urls}"
-    headers = {
-        "accept": "*/*",
-        "Authorization": "adityaboom_requesting2024#",
-        "Content-Type": "application/json"
-    }
-    try:
-        response = requests.get(api_url, headers=headers, verify=False)
-        if response.status_code == 200:
-            response_data = response.json()
-            return response_data.get("urls", [])
-    except requests.RequestException as e:
-        print(f"Error filtering URLs: {e}")
-    return []
+    """
+    Return the English article URLs that have not been ingested yet, using the local registry.
+    """
+    from chatbot.url_registry import get_url_registry
+
+    url_list = json.loads(urls) if isinstance(urls, str) else list(urls)
+    return await asyncio.to_thread(get_url_registry().filter_new, url_list, "en")
 
 
 
 
 async def fetch_docs_custom_range(urls):
-    data = []
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    """
+    Fetch and chunk English article pages through the shared multilingual path, so English
+    articles get their summaries, key claims and claim ids like the other sites.
 
-    for url in urls:
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            # Parse only HTML content
-            if 'text/html' not in response.headers.get('Content-Type', ''):
-                print(f"Skipped non-HTML content at {url}")
-                continue
-
-            # Extract text using BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
-
-            document = Document(page_content=text, metadata={"source": url})
-            data.append(document)
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to fetch {url}: {e}")
-            continue
-
-    docs = text_splitter.split_documents(data)
-    return docs
-
-
-async def store_docs_in_pinecone(docs, index_name, urls):
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-    print(f"Storing {len(docs)} document chunks to Pinecone index '{index_name}'...")
-    pine_vs = Pinecone.from_documents(documents = docs, embedding = embeddings, index_name=index_name)
-    print(f"Added {len(docs)} Articles chunks in the pinecone")
-    await add_urls_to_database(json.dumps(urls))
+    Returns:
+        list: Chunked Document objects.
+    """
+    from chatbot.fetchArticles import fetch_docs_custom_range as fetch_site_docs
+
+    return await fetch_site_docs(urls, lang="en")
+
+
+async def store_docs_in_pinecone(docs, index_name, urls, namespace=None):
+    """
+    Embed English article chunks with the shared cached model and write them through the
+    configured vector backend (and the partition's BM25 index), then record the URLs.
+
+    Returns:
+        int: Number of chunks written.
+    """
+    # Sized so the page's chunks are embedded with one call
+    batcher = EmbeddingBatcher(batch_size=max(INGEST_EMBED_BATCH_SIZE, len(docs)))
+    print(f"Storing {len(docs)} document chunks to index '{index_name}'...")
+    await batcher.add(docs, index_name, urls, "en", namespace=namespace)
+    await batcher.flush()
     print(f"Successfully stored documents. Associated URLs: {urls}")
-    return pine_vs
+    return batcher.total_chunks
 
 
 
 async def add_urls_to_database(urls):
     """
-    Adds new URLs to the database by sending them to an external API endpoint.
+    Records new English URLs in the local registry and queues them for the external table.
 
     Args:
-        urls (list): List of new URLs to be added to the database.
+        urls (str): JSON-encoded list of new URLs to be added to the database.
 
     Returns:
         str: A message indicating the result of the request.
     """
-    api_url = f"https://toolbox.boomlive.in/api_project/add_in_table.php?urls={urls}"
-    headers = {
-        "accept": "*/*",
-        "Authorization": "adityaboom_requesting2024#",
-        "Content-Type": "application/json"
-    }
-    
-    try:
-        # Send the POST request with the URLs in the payload
-        response = requests.get(api_url, headers=headers, verify=False)
+    from chatbot.url_registry import get_url_registry
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            response_data = response.json()
-            # You can log or process the response data as required
-            # noofurls = len(urls)
-            # print(urls, noofurls)
-            print(f"Successfully added {len(urls)}URLs to the database." )
-            return f"Successfully added URLs to the database."
-        else:
-            if(len(urls) == 0):
-                return f"There are no urls to add"
-            return f"There are no urls to add"
-    except requests.RequestException as e:
+    url_list = json.loads(urls) if isinstance(urls, str) else list(urls)
+    if not url_list:
+        return "There are no urls to add"
+    try:
+        get_url_registry().mark_ingested(url_list, "en")
+        print(f"Successfully added {len(url_list)} URLs to the database.")
+        return "Successfully added URLs to the database."
+    except Exception as e:
         return f"An error occurred while adding URLs: {e}"
-    
 
 
 
-async def query_pinecone(query_text, index_name, top_k=5):
+
+async def query_pinecone(query_text, index_name, top_k=5, namespace=None):
     """
     Query the Pinecone index with preprocessing.
     
@@ -1145,6 +1133,7 @@ async def query_pinecone(query_text, index_name, top_k=5):
         query_text (str): The raw query text
         index_name (str): Name of the Pinecone index to use
         top_k (int): Number of results to return
+        namespace (str, optional): Namespace inside the index, e.g. a language code with INDEX_LAYOUT=namespaced
         
     Returns:
         list: List of document results from Pinecone
@@ -1154,39 +1143,58 @@ async def query_pinecone(query_text, index_name, top_k=5):
     # Preprocess the query
     processed_query =query_text #preprocess_query(query_text)
     
-    # Generate embeddings using the same model as for documents
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-    
-    # Connect to Pinecone
-    pine = Pinecone.from_existing_index(index_name=index_name, embedding=embeddings)
+    # Connect to the index through the configured backend (see VECTOR_BACKEND)
+    vector_store = get_vector_store(index_name, namespace=namespace)
     
     # Query the index
-    results = pine.similarity_search(processed_query, k=top_k)
+    results = await asyncio.to_thread(vector_store.similarity_search, processed_query, k=top_k)
     
     return results
 
 
 
+async def query_pinecone_batch(queries, index_name, top_k=5, namespace=None):
+    """
+    Query an index with many queries at once: one embeddings call for all of them, and the
+    index searches run concurrently.
+
+    Args:
+        queries (list): The raw query texts
+        index_name (str): Name of the Pinecone index to use
+        top_k (int): Number of results per query
+        namespace (str, optional): Namespace inside the index
+
+    Returns:
+        list: One list of (document, score) results per query, in query order
+    """
+    vector_store = get_vector_store(index_name, namespace=namespace)
+    return await asyncio.to_thread(batch_similarity_search, vector_store, list(queries), top_k)
+
+
 ##################################################################################################
-from chatbot.fetchArticles import add_multilingual_urls_to_database
 
 
-async def process_and_upload_single_url(url,lang, index_name ):
+async def process_and_upload_single_url(url, lang, index_name=None):
     """
     Process a single URL: fetch content, convert to document, preprocess, and upload to Pinecone.
     
     Args:
         url (str): The URL of the article to process and upload
-        index_name (str): Name of the Pinecone index to use (default: "india-spend")
+        lang (str): Language code of the article; selects the namespace with INDEX_LAYOUT=namespaced
+        index_name (str, optional): Index to write to. Defaults to the language's write partition (see index_layout)
         
     Returns:
         bool: True if successful, False otherwise
     """
+    # fetchArticles imports this module, so it can only be imported once both are loaded
+    from chatbot.fetchArticles import add_multilingual_urls_to_database
+
     try:
         print(f"Processing URL: {url}")
+        index_name, namespace, _ = resolve_write_partition(lang, index_name)
         
         # 1. Fetch content from the URL
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
         
         # Check if it's HTML content
@@ -1194,12 +1202,13 @@ async def process_and_upload_single_url(url,lang, index_name ):
             print(f"Skipped non-HTML content at {url}")
             return False
             
-        # 2. Extract text using BeautifulSoup
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
+        # 2. Extract the article body text, without blocks repeated across the site
+        [(_, blocks)] = get_boilerplate_filter().filter_pages([(url, extract_article_blocks(response.content))], lang)
+        text = " ".join(blocks)
+        await asyncio.to_thread(summarize_and_store, url, text, lang)
         
         # 3. Create document
-        document = Document(page_content=text, metadata={"source": url})
+        document = Document(page_content=text, metadata=get_article_catalog().vector_metadata([url], lang)[url])
         
         # 4. Split into chunks
         text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
@@ -1208,15 +1217,10 @@ async def process_and_upload_single_url(url,lang, index_name ):
         # 5. Preprocess document chunks
         preprocessed_docs = await preprocess_documents(doc_chunks)
         
-        # 6. Upload to Pinecone
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        print(f"Storing {len(preprocessed_docs)} document chunks to Pinecone index '{index_name}'...")
-        
-        pine_vs = Pinecone.from_documents(
-            documents=preprocessed_docs, 
-            embedding=embeddings, 
-            index_name=index_name
-        )
+        # 6. Upload to the vector index (and its BM25 index) through the configured backend
+        print(f"Storing {len(preprocessed_docs)} document chunks to index '{partition_name(index_name, namespace)}'...")
+        vectors = await asyncio.to_thread(get_embeddings().embed_documents, [doc.page_content for doc in preprocessed_docs])
+        await asyncio.to_thread(write_embedded_documents, index_name, preprocessed_docs, vectors, namespace)
         
         # 7. Add URL to database
         await add_multilingual_urls_to_database(json.dumps([url]), lang)
@@ -1229,82 +1233,28 @@ async def process_and_upload_single_url(url,lang, index_name ):
         return False
 
 
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+from chatbot.preprocessing import preprocess_document_batch
 
 async def preprocess_documents(docs):
     """
     Comprehensive preprocessing of documents before storing them in Pinecone.
     
     Steps include:
-    - Text cleaning (whitespace normalization, special character removal)
-    - Stopword removal
-    - Lemmatization (converting words to their base form)
+    - Text cleaning (URL and HTML removal, whitespace normalization)
+    - Stopword removal (English tokens)
+    - Lemmatization with a memoized lemma table (English tokens)
+    - Hindi and Bengali words are kept
     - Additional metadata
     
+    Large batches are spread across a process pool (see chatbot/preprocessing.py).
+    
     Args:
         docs (list): List of Document objects to preprocess
         
     Returns:
         list: List of preprocessed Document objects
     """
-    # Download required NLTK packages if not already downloaded
-    try:
-        nltk.data.find('tokenizers/punkt')
-        nltk.data.find('corpora/stopwords')
-        nltk.data.find('corpora/wordnet')
-    except LookupError:
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        nltk.download('wordnet')
-    
-    # Initialize lemmatizer and stopwords
-    lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words('english'))
-    
-    preprocessed_docs = []
-    
-    for doc in docs:
-        # Extract content from the document
-        content = doc.page_content
-        metadata = doc.metadata.copy()  # Create a copy to avoid modifying the original
-        
-        # 1. Basic cleaning
-        # Remove URLs
-        content = re.sub(r'https?://\S+|www\.\S+', '', content)
-        # Remove HTML tags
-        content = re.sub(r'<.*?>', '', content)
-        # Remove special characters and numbers (keep spaces and word characters)
-        content = re.sub(r'[^a-zA-Z\s]', '', content)
-        # Normalize whitespace
-        content = ' '.join(content.split())
-        
-        # 2. Tokenize the text
-        tokens = word_tokenize(content.lower())
-        
-        # 3. Remove stopwords and lemmatize
-        filtered_tokens = []
-        for token in tokens:
-            if token not in stop_words:
-                # Lemmatize the token (e.g., "richest" -> "rich")
-                lemmatized = lemmatizer.lemmatize(token)
-                filtered_tokens.append(lemmatized)
-        
-        # 4. Reconstruct the text
-        processed_content = ' '.join(filtered_tokens)
-        
-        # 5. Add preprocessing metadata
-        metadata["preprocessed"] = True
-        metadata["processed_date"] = datetime.datetime.now().isoformat()
-        metadata["original_length"] = len(content)
-        metadata["processed_length"] = len(processed_content)
-        
-        # Create a new document with the preprocessed content
-        preprocessed_doc = Document(page_content=processed_content, metadata=metadata)
-        preprocessed_docs.append(preprocessed_doc)
+    preprocessed_docs = await asyncio.to_thread(preprocess_document_batch, docs)
     
     print(f"Preprocessed {len(preprocessed_docs)} document chunks (removed stopwords, applied lemmatization)")
     return preprocessed_docs
\ No newline at end of file
@@ -0,0 +1,697 @@
+import datetime, fcntl, hashlib, json, os, threading, uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from config import data_path
+
+load_dotenv()
+
+# "pinecone" (hosted only), "local" (on-disk index only) or "tiered" (local hot tier in front of Pinecone)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+LOCAL_VECTOR_DIR = os.getenv("LOCAL_VECTOR_DIR", "vectors")
+# Days of articles the local hot tier keeps when VECTOR_BACKEND=tiered
+HOT_TIER_DAYS = int(os.getenv("HOT_TIER_DAYS", "30"))
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "5000"))
+# Chunks fetched per chunk kept, and the most chunks of one article kept, before synthesis
+RETRIEVAL_OVERFETCH = int(os.getenv("RETRIEVAL_OVERFETCH", "4"))
+MAX_CHUNKS_PER_SOURCE = int(os.getenv("MAX_CHUNKS_PER_SOURCE", "2"))
+# MMR trade-off: 1.0 ranks by relevance only, lower values favour chunks unlike those already picked
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+# Index searches a batch query runs at once
+BATCH_SEARCH_CONCURRENCY = int(os.getenv("BATCH_SEARCH_CONCURRENCY", "16"))
+
+##############################################[METADATA FILTERS]###########################################################
+
+_COMPARISONS = {
+    "$eq": lambda value, operand: value == operand,
+    "$ne": lambda value, operand: value != operand,
+    "$in": lambda value, operand: value in operand,
+    "$nin": lambda value, operand: value not in operand,
+    "$gt": lambda value, operand: value is not None and value > operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+    "$exists": lambda value, operand: (value is not None) == bool(operand),
+}
+
+
+def matches_filter(metadata: dict, metadata_filter: dict) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter ($eq, $ne, $in, $nin, $gt(e), $lt(e), $exists,
+    $and, $or, and bare values meaning $eq) against one record's metadata.
+    """
+    for key, condition in metadata_filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, part) for part in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, part) for part in condition):
+                return False
+        else:
+            value = metadata.get(key)
+            operators = condition if isinstance(condition, dict) else {"$eq": condition}
+            for operator, operand in operators.items():
+                if value is None and operator not in ("$ne", "$nin", "$exists"):
+                    return False
+                if not _COMPARISONS[operator](value, operand):
+                    return False
+    return True
+
+
+##############################################[LOCAL VECTOR STORE]###########################################################
+
+
+def partition_name(index_name: str, namespace: str = None) -> str:
+    """
+    Name of one partition of an index: "<index>" or "<index>.<namespace>". Pinecone index
+    names can't contain dots, so the name is unambiguous. Used for the local directory and
+    the BM25 index of the partition.
+    """
+    return f"{index_name}.{namespace}" if namespace else index_name
+
+
+class LocalVectorStore:
+    """
+    Flat (exact) cosine-similarity index on local disk, with the query API of `PineconeVectorStore`.
+
+    Vectors are appended, L2-normalized, to a raw float32 file that is memory-mapped for search,
+    and each row's id and metadata (page content under "text", as in Pinecone) go to a JSON Lines
+    file next to it. Metadata filters are applied before scoring, so top-k only ranks eligible
+    rows. Rows written by another process (e.g. the ingest CLI) are picked up on the next search.
+
+    Processes sharing a directory coordinate through a lock file: searches hold it shared while
+    they load new rows, writes hold it exclusively. `prune` rewrites the files and bumps the
+    generation in info.json, and every other process reloads the index when it sees a new one.
+    """
+
+    def __init__(self, index_name: str, embedding=None, directory: str = None, namespace: str = None):
+        for name in (index_name, namespace):
+            # Both become path components of the index directory
+            if name and (name in (".", "..") or os.sep in name or (os.altsep and os.altsep in name)):
+                raise ValueError(f"Invalid index or namespace name '{name}'")
+        self.index_name = index_name
+        self.namespace = namespace
+        self.partition = partition_name(index_name, namespace)
+        self.embedding = embedding
+        self.directory = directory or data_path(os.path.join(LOCAL_VECTOR_DIR, index_name, namespace or ""))
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._records_path = os.path.join(self.directory, "records.jsonl")
+        self._info_path = os.path.join(self.directory, "info.json")
+        self._lock = threading.RLock()
+        self._lock_file = open(os.path.join(self.directory, "lock"), "a")
+        with self._locked():
+            self._reset()
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False):
+        """
+        Hold the thread lock and the directory's lock file (shared, or exclusive for writes).
+        """
+        with self._lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reset(self):
+        self._dim = None
+        self._generation = 0
+        self._info_stat = None
+        self._records = []  # (id, metadata) per row
+        self._records_offset = 0
+        self._vectors = None
+        self._load_info()
+
+    def _stat_info(self):
+        # info.json is replaced, never edited, so a new inode means a new version
+        info = os.stat(self._info_path)
+        return info.st_ino, info.st_mtime_ns
+
+    def _load_info(self):
+        if os.path.exists(self._info_path):
+            self._info_stat = self._stat_info()
+            with open(self._info_path, encoding="utf-8") as f:
+                info = json.load(f)
+            self._dim = info["dim"]
+            self._generation = info.get("generation", 0)
+
+    def _write_info(self):
+        with open(self._info_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"dim": self._dim, "index_name": self.index_name, "generation": self._generation}, f)
+        os.replace(self._info_path + ".tmp", self._info_path)
+        self._info_stat = self._stat_info()
+
+    ##########[READS]##########
+
+    def _refresh(self):
+        """
+        Load rows appended since the last read, or the whole index again if another process
+        pruned it. Called with `_locked` held.
+        """
+        if os.path.exists(self._info_path) and self._stat_info() != self._info_stat:
+            generation = self._generation
+            self._load_info()
+            if self._generation != generation:
+                self._reset()
+        if os.path.exists(self._records_path) and os.path.getsize(self._records_path) > self._records_offset:
+            with open(self._records_path, "rb") as f:
+                f.seek(self._records_offset)
+                data = f.read()
+            # A line still being written by another process is read next time
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                record = json.loads(line)
+                self._records.append((record["id"], record["metadata"]))
+            self._records_offset += len(complete)
+            if self._dim is None:
+                self._load_info()
+        if self._dim is None or not os.path.exists(self._vectors_path):
+            return
+        rows = min(len(self._records), os.path.getsize(self._vectors_path) // (4 * self._dim))
+        if self._vectors is None or self._vectors.shape[0] != rows:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim)) if rows else None
+
+    def __len__(self) -> int:
+        with self._locked():
+            self._refresh()
+            return 0 if self._vectors is None else self._vectors.shape[0]
+
+    def similarity_search_by_vector_with_score(self, vector, k: int = 4, filter: dict = None) -> list:
+        """
+        Top-k rows for a query vector.
+
+        Returns:
+            list: (Document, cosine similarity) tuples, best first.
+        """
+        return [(doc, score) for doc, score, _ in self._search_by_vector(vector, k=k, filter=filter)]
+
+    def _search_by_vector(self, vector, k: int = 4, filter: dict = None) -> list:
+        """
+        Top-k rows for a query vector, as (Document, cosine similarity, stored vector) tuples.
+        """
+        from langchain_core.documents import Document
+
+        with self._locked():
+            self._refresh()
+            if self._vectors is None:
+                return []
+            vectors, records = self._vectors, self._records[:self._vectors.shape[0]]
+        if filter:
+            rows = np.fromiter((i for i, (_, metadata) in enumerate(records) if matches_filter(metadata, filter)), dtype=np.int64)
+            if rows.size == 0:
+                return []
+        else:
+            rows = None
+
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = (vectors[rows] if rows is not None else vectors) @ query
+        k = min(k, scores.shape[0])
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        results = []
+        for i in best:
+            row = int(rows[i]) if rows is not None else int(i)
+            metadata = dict(records[row][1])
+            text = metadata.pop("text", "")
+            results.append((Document(page_content=text, metadata=metadata), float(scores[i]), np.array(vectors[row])))
+        return results
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: dict = None) -> list:
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search(self, query: str, k: int = 4, filter: dict = None) -> list:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def as_retriever(self, search_kwargs: dict = None):
+        from langchain_core.retrievers import BaseRetriever
+
+        store, kwargs = self, dict(search_kwargs or {})
+
+        class _Retriever(BaseRetriever):
+            def _get_relevant_documents(self, query, *, run_manager=None):
+                return store.similarity_search(query, **kwargs)
+
+        return _Retriever()
+
+    ##########[WRITES]##########
+
+    def add_embedded(self, docs, vectors) -> list:
+        """
+        Append documents whose embeddings are already computed.
+
+        Returns:
+            list: Ids of the new rows.
+        """
+        if not docs:
+            return []
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+        ids = [str(uuid.uuid4()) for _ in docs]
+        lines = [
+            json.dumps({"id": row_id, "metadata": {**doc.metadata, "text": doc.page_content}}, ensure_ascii=False)
+            for row_id, doc in zip(ids, docs)
+        ]
+        with self._locked(exclusive=True):
+            self._refresh()
+            if self._dim is None:
+                self._dim = matrix.shape[1]
+                self._write_info()
+            elif matrix.shape[1] != self._dim:
+                raise ValueError(f"Vector dimension {matrix.shape[1]} does not match index dimension {self._dim}")
+            # Vectors first: a row only becomes visible once its record line exists
+            with open(self._vectors_path, "ab") as f:
+                f.write(matrix.tobytes())
+            with open(self._records_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        return ids
+
+    def add_documents(self, docs) -> list:
+        """
+        Embed and append documents.
+        """
+        return self.add_embedded(docs, self.embedding.embed_documents([doc.page_content for doc in docs]))
+
+    def prune(self, keep) -> int:
+        """
+        Rewrite the index with only the rows for which `keep(metadata)` is true. Other
+        processes reload the index on their next search.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        with self._locked(exclusive=True):
+            self._refresh()
+            if self._vectors is None:
+                return 0
+            rows = [i for i, (_, metadata) in enumerate(self._records[:self._vectors.shape[0]]) if keep(metadata)]
+            removed = self._vectors.shape[0] - len(rows)
+            if not removed:
+                return 0
+            kept_vectors = np.array(self._vectors[rows]) if rows else np.zeros((0, self._dim), dtype=np.float32)
+            kept_records = [self._records[i] for i in rows]
+            self._vectors = None
+            with open(self._vectors_path + ".tmp", "wb") as f:
+                f.write(kept_vectors.tobytes())
+            with open(self._records_path + ".tmp", "w", encoding="utf-8") as f:
+                f.writelines(json.dumps({"id": row_id, "metadata": metadata}, ensure_ascii=False) + "\n"
+                             for row_id, metadata in kept_records)
+            os.replace(self._vectors_path + ".tmp", self._vectors_path)
+            os.replace(self._records_path + ".tmp", self._records_path)
+            self._generation += 1
+            self._write_info()
+            self._reset()
+            self._refresh()
+        print(f"Pruned {removed} rows from local index '{self.index_name}'")
+        return removed
+
+
+##############################################[TIERED VECTOR STORE]###########################################################
+
+
+def _published_cutoff(days: int) -> int:
+    return int((datetime.date.today() - datetime.timedelta(days=days)).strftime("%Y%m%d"))
+
+
+def _filter_lower_bound(metadata_filter: dict):
+    """
+    The lowest "published" value a filter allows, or None if it doesn't bound it.
+    """
+    if not metadata_filter:
+        return None
+    bounds = []
+    for key, condition in metadata_filter.items():
+        if key == "$and":
+            bounds += [bound for part in condition for bound in [_filter_lower_bound(part)] if bound is not None]
+        elif key == "published" and isinstance(condition, dict):
+            bounds += [condition[op] for op in ("$gte", "$gt", "$eq") if op in condition]
+    return max(bounds) if bounds else None
+
+
+class TieredVectorStore:
+    """
+    A local hot tier holding the last HOT_TIER_DAYS of articles in front of the hosted index.
+
+    Queries whose published-date filter lies inside the hot window are answered locally with no
+    network round trip when the hot tier has at least k matches. Other queries search both tiers and merge the results by score; both
+    tiers hold vectors from the same embedding model, so cosine scores are comparable.
+    """
+
+    def __init__(self, hot: LocalVectorStore, cold, hot_days: int = HOT_TIER_DAYS):
+        self.hot = hot
+        self.cold = cold
+        self.hot_days = hot_days
+        self.index_name = hot.index_name
+        self.namespace = hot.namespace
+        self.partition = hot.partition
+        self._pruned_on = None
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: dict = None) -> list:
+        return self.similarity_search_by_vector_with_score(self.hot.embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search_by_vector_with_score(self, vector, k: int = 4, filter: dict = None) -> list:
+        return [(doc, score) for doc, score, _ in self._search_by_vector(vector, k=k, filter=filter)]
+
+    def _search_by_vector(self, vector, k: int = 4, filter: dict = None) -> list:
+        hot = self.hot._search_by_vector(vector, k=k, filter=filter)
+        lower_bound = _filter_lower_bound(filter)
+        # A replica whose hot tier is still filling up may hold fewer matches than Pinecone
+        if lower_bound is not None and lower_bound >= _published_cutoff(self.hot_days) and len(hot) >= k:
+            return hot
+        cold = _pinecone_search_by_vector(self.cold, vector, k=k, filter=filter)
+        merged, seen = [], set()
+        for doc, score, stored in sorted(hot + cold, key=lambda match: match[1], reverse=True):
+            key = (doc.metadata.get("source"), doc.page_content)
+            if key not in seen:
+                seen.add(key)
+                merged.append((doc, score, stored))
+        return merged[:k]
+
+    def similarity_search(self, query: str, k: int = 4, filter: dict = None) -> list:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def as_retriever(self, search_kwargs: dict = None):
+        return LocalVectorStore.as_retriever(self, search_kwargs)
+
+    def add_embedded(self, docs, vectors):
+        self._prune_daily()
+        return self.hot.add_embedded(docs, vectors)
+
+    def add_documents(self, docs) -> list:
+        vectors = self.hot.embedding.embed_documents([doc.page_content for doc in docs])
+        write_embedded_documents(self.index_name, docs, vectors, self.namespace)
+        return []
+
+    def _prune_daily(self):
+        today = datetime.date.today()
+        if self._pruned_on == today:
+            return
+        self._pruned_on = today
+        cutoff = _published_cutoff(self.hot_days)
+        # Rows without a published date are kept; they can't be placed in or out of the window
+        self.hot.prune(lambda metadata: metadata.get("published", cutoff) >= cutoff)
+
+
+##############################################[CACHED EMBEDDINGS]###########################################################
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedding model wrapper with an in-memory LRU cache keyed by a hash of the text.
+
+    Chunks embedded at ingestion and chunks re-ranked at query time share the cache, as do
+    repeated queries, so each distinct text is sent to the embedding API once per process.
+    """
+
+    def __init__(self, embeddings, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _get(self, key):
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is None:
+                return None
+            self._cache.move_to_end(key)
+        return vector.tolist()
+
+    def _put(self, key, vector):
+        # float32 arrays take a tenth of the memory of lists of Python floats
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def embed_documents(self, texts: list) -> list:
+        keys = [self._key(text) for text in texts]
+        vectors = [self._get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self._put(keys[i], vector)
+        return vectors
+
+    def embed_query(self, text: str) -> list:
+        key = self._key("query:" + text)
+        vector = self._get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._put(key, vector)
+        return vector
+
+    def embed_queries(self, texts: list) -> list:
+        """
+        Embed many queries with one API call for the uncached ones. OpenAI embeddings are
+        the same for queries and documents, so the batch goes through `embed_documents`.
+        """
+        keys = [self._key("query:" + text) for text in texts]
+        vectors = [self._get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self._put(keys[i], vector)
+        return vectors
+
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """
+    Return the process-wide (cached) embedding model used for every index.
+    """
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
+            _embeddings = CachedEmbeddings(OpenAIEmbeddings(model=EMBEDDING_MODEL))
+        return _embeddings
+
+
+##############################################[SOURCE DIVERSITY]###########################################################
+
+
+def _chunk_key(doc) -> tuple:
+    return doc.metadata.get("source"), doc.page_content
+
+
+def select_diverse(query: str, docs: list, k: int, max_per_source: int = MAX_CHUNKS_PER_SOURCE,
+                   lambda_mult: float = MMR_LAMBDA, embedding=None, vectors: dict = None) -> list:
+    """
+    Pick `k` chunks from an over-fetched candidate list by maximal marginal relevance, with at
+    most `max_per_source` chunks of any one article. Identical chunks are dropped.
+
+    Args:
+        query (str): Query text.
+        docs (list): Candidate Documents, best first.
+        k (int): Number of chunks to keep.
+        max_per_source (int): Most chunks kept from one source URL.
+        lambda_mult (float): Relevance weight; 1 - lambda_mult weighs dissimilarity to the picked chunks.
+        embedding (Embeddings, optional): Defaults to the shared cached embedding model.
+        vectors (dict, optional): Stored vectors returned by the index search, keyed by
+            (source, page_content). Only candidates missing from it, such as BM25-only hits, are embedded.
+
+    Returns:
+        list: Selected Documents, in selection order.
+    """
+    unique, seen = [], set()
+    for doc in docs:
+        key = _chunk_key(doc)
+        if key not in seen:
+            seen.add(key)
+            unique.append(doc)
+    if len(unique) <= 1:
+        return unique[:k]
+
+    embedding = embedding or get_embeddings()
+    stored = [(vectors or {}).get(_chunk_key(doc)) for doc in unique]
+    missing = [i for i, vector in enumerate(stored) if vector is None]
+    if missing:
+        for i, vector in zip(missing, embedding.embed_documents([unique[i].page_content for i in missing])):
+            stored[i] = vector
+    vectors = np.asarray(stored, dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    query_vector = np.asarray(embedding.embed_query(query), dtype=np.float32)
+    relevance = vectors @ (query_vector / max(np.linalg.norm(query_vector), 1e-12))
+
+    selected, per_source = [], {}
+    redundancy = np.full(len(unique), -1.0, dtype=np.float32)  # highest similarity to a selected chunk
+    available = np.ones(len(unique), dtype=bool)
+    while len(selected) < k and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * np.maximum(redundancy, 0.0)
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        available[best] = False
+        source = unique[best].metadata.get("source")
+        if per_source.get(source, 0) >= max_per_source:
+            continue
+        per_source[source] = per_source.get(source, 0) + 1
+        selected.append(unique[best])
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+    return selected
+
+
+##############################################[VECTOR STORE FACTORY]###########################################################
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(index_name: str, embedding=None, backend: str = None, namespace: str = None):
+    """
+    Return the process-wide vector store for an index, for the backend chosen with VECTOR_BACKEND.
+
+    Args:
+        index_name (str): Pinecone index name; also names the local index directory.
+        embedding (Embeddings, optional): Embedding model. The shared cached text-embedding-3-small by default.
+        backend (str, optional): Overrides VECTOR_BACKEND ("pinecone", "local" or "tiered").
+        namespace (str, optional): Namespace inside the index; the default namespace when omitted.
+
+    Returns:
+        PineconeVectorStore, LocalVectorStore or TieredVectorStore.
+    """
+    backend = (backend or VECTOR_BACKEND).lower()
+    key = (index_name, namespace, backend)
+    with _stores_lock:
+        if key not in _stores:
+            embedding = embedding or get_embeddings()
+            if backend == "local":
+                store = LocalVectorStore(index_name, embedding, namespace=namespace)
+            elif backend == "tiered":
+                store = TieredVectorStore(LocalVectorStore(index_name, embedding, namespace=namespace),
+                                          _pinecone_store(index_name, embedding, namespace))
+            elif backend == "pinecone":
+                store = _pinecone_store(index_name, embedding, namespace)
+            else:
+                raise ValueError(f"Unknown VECTOR_BACKEND '{backend}'; expected pinecone, local or tiered")
+            _stores[key] = store
+        return _stores[key]
+
+
+_search_executor = ThreadPoolExecutor(max_workers=BATCH_SEARCH_CONCURRENCY, thread_name_prefix="batch-search")
+
+
+def batch_similarity_search(vector_store, queries: list, k: int = 4, filter: dict = None) -> list:
+    """
+    Search one index for many queries: the queries are embedded together and the index
+    searches run concurrently on a shared pool.
+
+    Args:
+        vector_store: A store returned by `get_vector_store`.
+        queries (list): Query texts.
+        k (int): Results per query.
+        filter (dict, optional): Pinecone-style metadata filter applied to every query.
+
+    Returns:
+        list: One list of (Document, score) tuples per query, in query order.
+    """
+    if not queries:
+        return []
+    embedding = vector_store.hot.embedding if isinstance(vector_store, TieredVectorStore) else vector_store.embedding
+    if isinstance(embedding, CachedEmbeddings):
+        vectors = embedding.embed_queries(queries)
+    else:
+        vectors = embedding.embed_documents(queries)
+    futures = [
+        _search_executor.submit(vector_store.similarity_search_by_vector_with_score, vector, k=k, filter=filter)
+        for vector in vectors
+    ]
+    return [future.result() for future in futures]
+
+
+def similarity_search_with_vectors(vector_store, query: str, k: int = 4, filter: dict = None) -> list:
+    """
+    Top-k chunks for a query together with the vectors stored for them, so callers that
+    compare chunks with each other (MMR) don't embed the chunks again.
+
+    Args:
+        vector_store: A store returned by `get_vector_store`.
+        query (str): Query text.
+        k (int): Number of results.
+        filter (dict, optional): Pinecone-style metadata filter.
+
+    Returns:
+        list: (Document, stored vector) tuples, best first.
+    """
+    embedding = vector_store.hot.embedding if isinstance(vector_store, TieredVectorStore) else vector_store.embedding
+    vector = embedding.embed_query(query)
+    if isinstance(vector_store, (LocalVectorStore, TieredVectorStore)):
+        matches = vector_store._search_by_vector(vector, k=k, filter=filter)
+    else:
+        matches = _pinecone_search_by_vector(vector_store, vector, k=k, filter=filter)
+    return [(doc, stored) for doc, _, stored in matches]
+
+
+def _pinecone_search_by_vector(store, vector, k: int = 4, filter: dict = None) -> list:
+    """
+    Query the store's Pinecone index with `include_values`, as (Document, score, stored vector) tuples.
+    """
+    from langchain_core.documents import Document
+    from chatbot.ingestion import get_pinecone_index
+
+    response = get_pinecone_index(store.index_name).query(
+        vector=[float(value) for value in vector], top_k=k, filter=filter, namespace=store.namespace,
+        include_values=True, include_metadata=True,
+    )
+    results = []
+    for match in response.matches:
+        metadata = dict(match.metadata or {})
+        text = metadata.pop("text", "")
+        results.append((Document(page_content=text, metadata=metadata), float(match.score),
+                        np.asarray(match.values, dtype=np.float32)))
+    return results
+
+
+def _pinecone_store(index_name: str, embedding, namespace: str = None):
+    from langchain_pinecone import PineconeVectorStore
+
+    store = PineconeVectorStore(index_name=index_name, embedding=embedding, namespace=namespace)
+    # Same attributes as the local stores, so callers can find the partition's lexical counterpart
+    store.index_name = index_name
+    store.embedding = embedding
+    store.namespace = namespace
+    store.partition = partition_name(index_name, namespace)
+    return store
+
+
+def write_embedded_documents(index_name: str, docs, vectors, namespace: str = None):
+    """
+    Ingestion sink: write embedded chunks to the configured backend and to the index's BM25
+    index. With the tiered backend chunks go to Pinecone and, when recent enough, to the local
+    hot tier as well.
+    """
+    from chatbot.ingestion import upsert_embedded_documents
+    from chatbot.lexical_index import index_chunks
+
+    if VECTOR_BACKEND in ("pinecone", "tiered"):
+        upsert_embedded_documents(index_name, docs, vectors, namespace=namespace)
+    if VECTOR_BACKEND == "local":
+        get_vector_store(index_name, namespace=namespace).add_embedded(docs, vectors)
+    elif VECTOR_BACKEND == "tiered":
+        cutoff = _published_cutoff(HOT_TIER_DAYS)
+        recent = [(doc, vector) for doc, vector in zip(docs, vectors) if doc.metadata.get("published", cutoff) >= cutoff]
+        if recent:
+            get_vector_store(index_name, namespace=namespace).add_embedded([doc for doc, _ in recent],
+                                                                           [vector for _, vector in recent])
+    index_chunks(partition_name(index_name, namespace), docs)
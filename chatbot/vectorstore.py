@@ -1,7 +1,8 @@
 from typing import Optional, Dict, Any, List
 from langchain.schema.runnable import Runnable
 from chatbot.utils import store_articles_custom_range, store_daily_articles
-from chatbot.fetchArticles import store_multilingual_daily_articles, store_multilingual_articles_custom_range
+from chatbot.fetchArticles import store_multilingual_daily_articles, store_multilingual_articles_custom_range, store_all_languages_daily_articles, store_all_languages_articles_custom_range
+from chatbot.sites import SUPPORTED_LANGUAGES
 
 
 
@@ -136,6 +137,67 @@ class StoreMultilingualCustomRangeArticles(Runnable):
         }
         return language_map.get(lang_code, "Unknown")
 
+class StoreAllLanguagesArticles(Runnable):
+    """
+    A class to fetch and store articles for several language sites in a single run.
+    The sites are processed concurrently with a shared worker pool.
+    """
+    async def invoke(self,
+                    from_date: Optional[str] = None,
+                    to_date: Optional[str] = None,
+                    langs: Optional[List[str]] = None,
+                    *args, **kwargs) -> Dict[str, Any]:
+        """
+        Fetch and store articles for all requested languages asynchronously.
+
+        Args:
+            from_date (str, optional): Start date in 'YYYY-MM-DD' format. When neither date is
+                given, the last 15 days are stored.
+            to_date (str, optional): End date in 'YYYY-MM-DD' format.
+            langs (list, optional): Language codes to store. Defaults to every supported site.
+
+        Returns:
+            dict: A dictionary containing the status and per-language details of the operation.
+                The status is "partial" when some sites failed and "error" when all of them did.
+        """
+        try:
+            langs = langs or SUPPORTED_LANGUAGES
+            unsupported = [lang for lang in langs if lang not in SUPPORTED_LANGUAGES]
+            if unsupported:
+                return {
+                    "status": "error",
+                    "message": f"Unsupported language codes: {unsupported}. Supported codes are {', '.join(SUPPORTED_LANGUAGES)}."
+                }
+
+            if from_date or to_date:
+                details = await store_all_languages_articles_custom_range(from_date, to_date, langs)
+            else:
+                details = await store_all_languages_daily_articles(langs)
+
+            # Sites that failed map to an error string instead of their list of URLs
+            failed = [lang for lang in langs if isinstance(details.get(lang), str)]
+            if not failed:
+                status, message = "success", f"Articles in {', '.join(langs)} have been successfully stored."
+            elif len(failed) < len(langs):
+                stored = [lang for lang in langs if lang not in failed]
+                status, message = "partial", f"Articles in {', '.join(stored)} were stored; {', '.join(failed)} failed."
+            else:
+                status, message = "error", f"Failed to store articles in {', '.join(failed)}."
+            return {
+                "status": status,
+                "message": message,
+                "language_codes": langs,
+                "details": details,
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": "Failed to store multilingual articles.",
+                "language_codes": langs,
+                "error": str(e),
+            }
+
+
 class StoreDailyArticles(Runnable):
     """
     A class to fetch and store articles for the current day.
@@ -0,0 +1,15 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Directory for local state: SQLite databases, caches and local indexes.
+DATA_DIR = os.getenv("BOOM_DATA_DIR", "data")
+
+
+def data_path(name: str) -> str:
+    """
+    Return the path of a file inside DATA_DIR, creating the directory if needed.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, name)
@@ -1,16 +1,16 @@
 import requests
+import http_client
 import json
 import os
-from bs4 import BeautifulSoup
+from chatbot.extraction import extract_article_text
 from langchain.schema import Document
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_community.chat_models import ChatOpenAI
 from langchain.chains import create_retrieval_chain
 from dotenv import load_dotenv
-from langdetect import detect, LangDetectException
+from chatbot.language_id import detect_language
 import iso639
-import pycountry
 from dotenv import load_dotenv
 
 
@@ -22,30 +22,16 @@ load_dotenv()
 def get_language_code(text):
     """
     Detects language and returns ISO 639-1 two-letter language code.
-    Falls back to character-based detection for certain scripts.
+    Indic scripts are recognised from their Unicode range, other text by an n-gram model
+    (see chatbot.language_id); results are shared with the chatbot's detection cache.
     
     Args:
         text (str): Text to detect language from
         
     Returns:
-        str: Two-letter ISO 639-1 language code
+        str: Two-letter ISO 639-1 language code, 'en' if it can't be detected
     """
-    try:
-        # Try with langdetect first
-        detected_code = detect(text)
-        
-        # Validate the detected code against pycountry
-        try:
-            language = pycountry.languages.get(alpha_2=detected_code)
-            return detected_code
-        except (AttributeError, KeyError):
-            # If pycountry doesn't recognize it, fall back to default language
-            pass
-            
-        return detected_code
-    except LangDetectException:
-        # If langdetect fails, default to English
-        return 'en'
+    return detect_language(text)
     
 
 def FactCheck(query):
@@ -61,7 +47,7 @@ def FactCheck(query):
     'languageCode':lang_code
     }
     url ='https://factchecktools.googleapis.com/v1alpha1/claims:search'
-    response = requests.get(url,params=payload)
+    response = http_client.get(url,params=payload)
     print(response.text)
 
     if response.status_code == 200:
@@ -95,7 +81,7 @@ def ProvideQuestionsForArticle(url):
 
     try:
         # Fetch the webpage
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
 
         # Verify the content type
@@ -103,9 +89,8 @@ def ProvideQuestionsForArticle(url):
             print(f"Skipped non-HTML content at {url}")
             return {}
 
-        # Extract text content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
+        # Extract the article body text
+        text = extract_article_text(response.content)
 
         if text:
             # Create a LangChain Document object
@@ -145,7 +130,7 @@ def ProvideAnswerForArticle(url, input_query):
 
     try:
         # Fetch the webpage
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
 
         # Verify the content type
@@ -153,9 +138,8 @@ def ProvideAnswerForArticle(url, input_query):
             print(f"Skipped non-HTML content at {url}")
             return {}
 
-        # Extract text content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        text = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
+        # Extract the article body text
+        text = extract_article_text(response.content)
 
         if text:
             # Create a LangChain Document object
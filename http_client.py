@@ -0,0 +1,155 @@
+import asyncio, os, threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+# Number of hosts kept in the pool, and connections kept per host
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "20"))
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "32"))
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+##############################################[SYNC CLIENT]###########################################################
+
+
+class _PooledSession(requests.Session):
+    """
+    requests.Session that applies DEFAULT_TIMEOUT to calls made without an explicit timeout.
+    """
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().request(method, url, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    session = _PooledSession()
+    # Only idempotent methods are retried; POSTs fail fast and are left to the caller
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide pooled session: keep-alive connections per host, default
+    timeouts and retries with backoff on connection errors and 429/5xx responses.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url, **kwargs) -> requests.Response:
+    """
+    Drop-in replacement for `requests.get` that goes through the pooled session.
+    Raises the usual `requests.exceptions` errors.
+    """
+    return get_session().get(url, **kwargs)
+
+
+def head(url, **kwargs) -> requests.Response:
+    """
+    Drop-in replacement for `requests.head` that goes through the pooled session.
+    """
+    return get_session().head(url, **kwargs)
+
+
+def post(url, **kwargs) -> requests.Response:
+    """
+    Drop-in replacement for `requests.post` that goes through the pooled session.
+    """
+    return get_session().post(url, **kwargs)
+
+
+##############################################[ASYNC CLIENT]###########################################################
+
+_async_clients = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_async_client():
+    """
+    Return the pooled httpx.AsyncClient for the running event loop, creating it on first use.
+
+    HTTP/2 is used when the `h2` package is installed. httpx clients are bound to the loop
+    they were created on, so one client is kept per loop.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        # Pool limits and HTTP/2 are transport settings once a custom transport is given
+        transport = httpx.AsyncHTTPTransport(
+            retries=HTTP_RETRIES,
+            http2=_http2_available(),
+            limits=httpx.Limits(max_connections=HTTP_POOL_HOSTS * HTTP_POOL_PER_HOST,
+                                max_keepalive_connections=HTTP_POOL_PER_HOST),
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            follow_redirects=True,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def async_get(url, **kwargs):
+    """
+    GET through the pooled async client, retrying 429/5xx responses with backoff
+    (connection errors are retried by the transport).
+
+    Returns:
+        httpx.Response: The last response received.
+    """
+    client = get_async_client()
+    for attempt in range(HTTP_RETRIES + 1):
+        response = await client.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == HTTP_RETRIES:
+            return response
+        await response.aclose()
+        await asyncio.sleep(HTTP_RETRY_BACKOFF * (2 ** attempt))
+    return response
+
+
+async def close_async_client():
+    """
+    Close the async client of the running loop. Called on application shutdown.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -35,11 +35,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+import http_client
 
 # Import routers from the modules
 from factcheck.routes import factcheck_router
 from chatbot.routes import chatbot_router
 from media_processing.routes import media_processing_router
+from chatbot.catalog import start_catalog_poller, stop_catalog_poller
+from chatbot.latest_index import start_latest_poller, stop_latest_poller
+from chatbot.suggested_questions import start_suggested_questions_poller, stop_suggested_questions_poller
+from chatbot.reranker import get_reranker
 
 # Load environment variables
 load_dotenv()
@@ -83,6 +88,24 @@ app.include_router(
     tags=["Media Processing"]
 )
 
+@app.on_event("startup")
+async def start_background_sync():
+    """Keep the article catalog, latest articles index and suggested questions in sync with the news feed"""
+    start_catalog_poller()
+    start_latest_poller()
+    start_suggested_questions_poller()
+    reranker = get_reranker()
+    if reranker is not None:
+        reranker.warm_up()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled outbound HTTP connections"""
+    stop_catalog_poller()
+    stop_latest_poller()
+    stop_suggested_questions_poller()
+    await http_client.close_async_client()
+
 @app.get("/")
 async def root():
     """Welcome endpoint"""
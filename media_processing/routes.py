@@ -9,7 +9,7 @@ from media_processing.twitter_processor import TwitterMediaProcessor
 from bs4 import BeautifulSoup
 import os
 import shutil
-import requests
+import http_client
 
 app = FastAPI()
 # Initialize the Twitter processor
@@ -80,7 +80,7 @@ async def scrape_url(url: str = Form(...)):
         raise HTTPException(status_code=400, detail="No URL provided")
     
     try:
-        response = requests.get(url)
+        response = await http_client.async_get(url)
         if response.status_code != 200:
             raise HTTPException(status_code=500, detail=f"Failed to retrieve page. Status: {response.status_code}")
         
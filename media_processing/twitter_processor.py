@@ -1,4 +1,4 @@
-import requests
+import http_client
 import os
 import tempfile
 from urllib.parse import urlparse
@@ -27,7 +27,7 @@ class TwitterMediaProcessor:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(twitter_url, headers=headers)
+            response = http_client.get(twitter_url, headers=headers)
             if response.status_code != 200:
                 return None, f"Failed to fetch Twitter page: {response.status_code}"
             
@@ -89,7 +89,7 @@ class TwitterMediaProcessor:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            head_response = requests.head(url, headers=headers, timeout=10)
+            head_response = http_client.head(url, headers=headers, timeout=10)
             content_type = head_response.headers.get('content-type', '').lower()
             
             if content_type.startswith('image/'):
@@ -116,7 +116,7 @@ class TwitterMediaProcessor:
                 'Referer': 'https://twitter.com/'
             }
             
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
+            response = http_client.get(url, headers=headers, stream=True, timeout=30)
             response.raise_for_status()
             
             # Determine file extension
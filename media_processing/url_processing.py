@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 from flask import Flask, request, jsonify
 
@@ -6,7 +6,7 @@ from flask import Flask, request, jsonify
 def scrape_url(url):
     try:
         # Fetch the webpage content
-        response = requests.get(url)
+        response = http_client.get(url)
         
         if response.status_code != 200:
             return jsonify({"error": f"Failed to retrieve the page. Status code: {response.status_code}"}), 500
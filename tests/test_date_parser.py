@@ -0,0 +1,83 @@
+from datetime import date
+
+import pytest
+
+from chatbot.date_parser import clamp_range, parse_date_range
+
+TODAY = date(2025, 3, 19)  # a Wednesday
+
+EXAMPLES = [
+    ("latest fact checks from 2024-01-05 to 2024-01-20", (date(2024, 1, 5), date(2024, 1, 20))),
+    ("from 2023-12-01 to 2023-12-31", (date(2023, 12, 1), date(2023, 12, 31))),
+    ("articles published on 15/08/2024", (date(2024, 8, 15), date(2024, 8, 15))),
+    ("fact checks in January 2024", (date(2024, 1, 1), date(2024, 1, 31))),
+    ("what did boom debunk in september 2023?", (date(2023, 9, 1), date(2023, 9, 30))),
+    ("news from Jan 2024 to March 2024", (date(2024, 1, 1), date(2024, 3, 31))),
+    ("stories between 3rd February and 10th February 2025", (date(2025, 2, 3), date(2025, 2, 10))),
+    ("January to March 2024 elections", (date(2024, 1, 1), date(2024, 3, 31))),
+    ("November to February", (date(2024, 11, 1), date(2025, 2, 28))),
+    ("articles from March 5, 2024", (date(2024, 3, 5), date(2024, 3, 5))),
+    ("from 1 to 5 march", (date(2025, 3, 1), date(2025, 3, 5))),
+    ("fact checks from 10th to 20th of december", (date(2024, 12, 10), date(2024, 12, 20))),
+    ("news from march 1-5, 2024", (date(2024, 3, 1), date(2024, 3, 5))),
+    ("fake news in December", (date(2024, 12, 1), date(2024, 12, 31))),
+    ("claims debunked in march", (date(2025, 3, 1), date(2025, 3, 19))),
+    ("what happened in 2023", (date(2023, 1, 1), date(2023, 12, 31))),
+    ("fact checks today", (date(2025, 3, 19), date(2025, 3, 19))),
+    ("yesterday's fact checks", (date(2025, 3, 18), date(2025, 3, 18))),
+    ("show me last week's fact checks", (date(2025, 3, 10), date(2025, 3, 16))),
+    ("this week", (date(2025, 3, 17), date(2025, 3, 19))),
+    ("what was fact checked last month", (date(2025, 2, 1), date(2025, 2, 28))),
+    ("this month", (date(2025, 3, 1), date(2025, 3, 19))),
+    ("last year", (date(2024, 1, 1), date(2024, 12, 31))),
+    ("this year", (date(2025, 1, 1), date(2025, 3, 19))),
+    ("fact checks from the last 10 days", (date(2025, 3, 9), date(2025, 3, 19))),
+    ("past 2 weeks", (date(2025, 3, 5), date(2025, 3, 19))),
+    ("पिछले महीने के फैक्ट चेक", (date(2025, 2, 1), date(2025, 2, 28))),
+    ("पिछले हफ्ते क्या फर्जी खबरें थीं", (date(2025, 3, 10), date(2025, 3, 16))),
+    ("आज की खबरें", (date(2025, 3, 19), date(2025, 3, 19))),
+    ("आज तक पर दिखाया गया वीडियो", None),
+    ("कल क्या हुआ था", (date(2025, 3, 18), date(2025, 3, 18))),
+    ("कल बारिश होगी क्या", None),
+    ("क्या यह कलकत्ता का वीडियो है", None),
+    ("जनवरी 2024 में फैक्ट चेक", (date(2024, 1, 1), date(2024, 1, 31))),
+    ("जनवरी से मार्च 2024 तक", (date(2024, 1, 1), date(2024, 3, 31))),
+    ("1 से 5 मार्च की खबरें", (date(2025, 3, 1), date(2025, 3, 5))),
+    ("15 अगस्त 2024 की खबरें", (date(2024, 8, 15), date(2024, 8, 15))),
+    ("पिछले ७ दिनों में", (date(2025, 3, 12), date(2025, 3, 19))),
+    ("इस साल के फैक्ट चेक", (date(2025, 1, 1), date(2025, 3, 19))),
+    ("গত মাসের ফ্যাক্ট চেক", (date(2025, 2, 1), date(2025, 2, 28))),
+    ("গত সপ্তাহে কী ভুয়ো খবর ছিল", (date(2025, 3, 10), date(2025, 3, 16))),
+    ("জানুয়ারি ২০২৪ এর খবর", (date(2024, 1, 1), date(2024, 1, 31))),
+    ("১ থেকে ৫ মার্চ পর্যন্ত খবর", (date(2025, 3, 1), date(2025, 3, 5))),
+    ("গত ৭ দিনের খবর", (date(2025, 3, 12), date(2025, 3, 19))),
+    ("২০২৩ সালের ফ্যাক্ট চেক", (date(2023, 1, 1), date(2023, 12, 31))),
+    ("you may want to check this claim", None),
+    ("is this video of a protest real?", None),
+]
+
+# Queries whose dates describe the claim rather than ask for a range (parsed with ranges_only)
+RANGE_ONLY_EXAMPLES = [
+    ("is this 2019 video of pulwama real?", None),
+    ("viral photo from 15 august", None),
+    ("आज की खबरें", None),
+    ("fact checks from the last 10 days", (date(2025, 3, 9), date(2025, 3, 19))),
+    ("news from Jan 2024 to March 2024", (date(2024, 1, 1), date(2024, 3, 31))),
+    ("from 1 to 5 march", (date(2025, 3, 1), date(2025, 3, 5))),
+    ("show me last week's fact checks", (date(2025, 3, 10), date(2025, 3, 16))),
+]
+
+
+@pytest.mark.parametrize("query, expected", EXAMPLES)
+def test_parse_date_range(query, expected):
+    assert parse_date_range(query, today=TODAY) == expected
+
+
+@pytest.mark.parametrize("query, expected", RANGE_ONLY_EXAMPLES)
+def test_parse_date_range_ranges_only(query, expected):
+    assert parse_date_range(query, today=TODAY, ranges_only=True) == expected
+
+
+def test_clamp_range_keeps_most_recent_days():
+    assert clamp_range(date(2025, 1, 1), date(2025, 3, 19), max_days=31) == (date(2025, 2, 17), date(2025, 3, 19))
+    assert clamp_range(date(2025, 3, 1), date(2025, 3, 19)) == (date(2025, 3, 1), date(2025, 3, 19))